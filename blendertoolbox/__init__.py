@@ -4,6 +4,8 @@ __author__ = 'Hsueh-Ti Derek Liu'
 __credits__ = 'Hsueh-Ti Derek Liu'
 
 from . blenderInit import blenderInit
+from . boundaryLoops import boundaryLoops
+from . cameraProjection import worldToPixel, pixelsPerUnit, projectedRadius
 from . colorMap import colorMap
 from . copyToVertexSubset import copyToVertexSubset
 from . copyArrowToVertex import copyArrowToVertex
@@ -11,12 +13,16 @@ from . colorObj import colorObj
 from . createArrow import createArrow
 from . createScaledVectorFieldMesh import createScaledVectorFieldMesh
 from . createVectorFieldMesh import createVectorFieldMesh
+from . drawCurves import drawCurves
+from . downsamplePoints import downsamplePoints, voxelDownsample, poissonDiskDownsample, blueNoiseSubsample
 from . drawPoints import drawPoints
 from . drawLines import drawLines
+from . drawPolylines import drawPolylines
 from . drawEdgeSubset import drawEdgeSubset
 from . drawBoundaryLoop import drawBoundaryLoop
 from . drawOutline import drawOutline
 from . drawSphere import drawSphere
+from . drawSpheres import drawSpheres
 from . discreteColor import discreteColor
 from . edgeNormals import edgeNormals
 from . genPolylineMesh import genPolylineMesh
@@ -24,12 +30,25 @@ from . getEdgeWire import getEdgeWire
 from . import_scene_from_blend import import_scene_from_blend
 from . invisibleGround import invisibleGround
 from . initColorNode import initColorNode
+from . instanceOnPoints import instanceOnPoints
+from . loadVectorField import loadVectorField
 from . lookAt import lookAt
+from . numpyMesh import numpyMesh
 from . loadShader import loadShader
 from . readImagePlane import readImagePlane
 from . readMesh import readMesh
 from . readNumpyMesh import readNumpyMesh
+from . decimateMesh import decimateMesh, quadricDecimate
+from . meshNormals import setShading, vertexNormals, faceNormals
+from . extractIsolines import extractIsolines
+from . weldMesh import weldMesh, weldVertices
+from . mergeByMaterial import mergeByMaterial
+from . materialCache import cachedMaterial
+from . twoSidedMaterial import twoSidedMaterial
+from . nodeGroups import nodeGroup, groupMaterial
 from . readNumpyPoints import readNumpyPoints
+from . readNumpyPointCloud import readNumpyPointCloud
+from . pointCloudOctree import writePointCloudOctree, readPointCloudOctree
 from . readOBJ import readOBJ
 from . readPLY import readPLY
 from . readSTL import readSTL
@@ -39,6 +58,7 @@ from . render_mesh_default import render_mesh_default
 from . render_point_cloud_default import render_point_cloud_default
 from . recalculateNormals import recalculateNormals
 from . selectOBJ import selectOBJ
+from . setAttribute import setAttribute
 from . set_background import set_background
 from . setCamera import setCamera
 from . setCamera_from_UI import setCamera_from_UI
@@ -79,6 +99,9 @@ from . setMeshColors import setMeshColors
 from . setMeshScalars import setMeshScalars
 from . setPointColors import setPointColors
 from . setPointScalars import setPointScalars
+from . simplifyLines import simplifyLines, chainSegments, simplifyPolylines
+from . strokesToRibbons import strokesToRibbons
+from . sphereUnionMesh import sphereUnionMesh
 from . subdivision import subdivision
 from . shadowThreshold import shadowThreshold
 from . vertexScalarToUV import vertexScalarToUV
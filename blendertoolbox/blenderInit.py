@@ -14,7 +14,7 @@
 
 import bpy
 
-def blenderInit(resolution_x, resolution_y, numSamples = 128, exposure = 1.5, use_GPU = True, resolution_percentage = 100):
+def blenderInit(resolution_x, resolution_y, numSamples = 128, exposure = 1.5, use_GPU = True, resolution_percentage = 100, draftFaces = None):
 	# clear all
 	bpy.ops.wm.read_homefile()
 	bpy.ops.object.select_all(action = 'SELECT')
@@ -29,6 +29,9 @@ def blenderInit(resolution_x, resolution_y, numSamples = 128, exposure = 1.5, us
 	bpy.context.scene.cycles.max_bounces = 6
 	bpy.context.scene.cycles.film_exposure = exposure
 	bpy.context.scene.render.resolution_percentage = resolution_percentage
+	# draft renders: readMesh loads decimated versions of about draftFaces faces (cached next to the mesh files)
+	if draftFaces:
+		bpy.context.scene['draftFaces'] = draftFaces
 
 	# Denoising
 	# Note: currently I stop denoising as it will also denoise the alpha shadow channel. TODO: implement blurring shadow in the composite node
@@ -0,0 +1,48 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from . meshArrays import vertexArray, faceArray
+from . simplifyLines import chainSegments
+
+def boundaryLoops(mesh, matrix = None):
+    """
+    this function finds the boundary edges of a mesh (edges used by a single face) and chains them into ordered loops in numpy
+
+    Inputs
+    mesh: bpy.object of the mesh
+    matrix: (optional) 4x4 matrix applied to the vertices, e.g. mesh.matrix_world. None returns local coordinates
+
+    Outputs
+    P: |P|x3 array of loop points (all loops concatenated, closed loops repeat their first point at the end)
+    offsets: |L|+1 array, loop l owns points P[offsets[l]:offsets[l+1]]
+    lengths: |L| array of loop lengths
+    """
+    V = vertexArray(mesh, matrix)
+    corners, faceSizes = faceArray(mesh)
+    corners = corners.astype(np.int64)
+
+    # every corner and the next corner of its face form a half edge
+    faceStart = np.repeat(np.cumsum(faceSizes) - faceSizes, faceSizes)
+    nextCorner = np.arange(corners.shape[0]) + 1
+    nextCorner[np.cumsum(faceSizes) - 1] = faceStart[np.cumsum(faceSizes) - 1]
+    halfE = np.stack((corners, corners[nextCorner]), axis = 1)
+    keys = halfE.min(axis = 1) * V.shape[0] + halfE.max(axis = 1)
+    _, first, counts = np.unique(keys, return_index = True, return_counts = True)
+    bE = halfE[first[counts == 1]]
+
+    P, offsets = chainSegments(V, bE)
+    segLength = np.linalg.norm(P[1:] - P[:-1], axis = 1)
+    cumulative = np.concatenate(([0], np.cumsum(segLength)))
+    lengths = cumulative[offsets[1:] - 1] - cumulative[offsets[:-1]]
+    return P, offsets, lengths
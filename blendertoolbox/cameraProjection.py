@@ -0,0 +1,79 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+
+def cameraIntrinsics(cam, scene = None):
+    """
+    returns (resolution_x, resolution_y, focal length in pixels) of a camera, taking the render resolution percentage and the sensor fit into account. For orthographic cameras the "focal length" is the number of pixels per world unit.
+    """
+    if scene is None:
+        scene = bpy.context.scene
+    render = scene.render
+    resX = render.resolution_x * render.resolution_percentage / 100.0
+    resY = render.resolution_y * render.resolution_percentage / 100.0
+    if cam.data.sensor_fit == 'VERTICAL':
+        sensor, res = cam.data.sensor_height, resY
+    elif cam.data.sensor_fit == 'HORIZONTAL':
+        sensor, res = cam.data.sensor_width, resX
+    else: # AUTO fits the sensor width to the larger image dimension
+        sensor, res = cam.data.sensor_width, max(resX, resY)
+    if cam.data.type == 'ORTHO':
+        focal = max(resX, resY) / cam.data.ortho_scale
+    else:
+        focal = cam.data.lens / sensor * res
+    return resX, resY, focal
+
+def worldToPixel(cam, P, scene = None):
+    """
+    this function projects world space points to the image of a camera
+
+    Inputs
+    cam: bpy.object of the camera
+    P: |P|x3 array of world space points
+    scene: (optional) scene whose render resolution is used (default: the current scene)
+
+    Outputs
+    uv: |P|x2 array of pixel coordinates (origin at the bottom left corner)
+    depth: |P| array of distances in front of the camera (negative behind it)
+    """
+    resX, resY, focal = cameraIntrinsics(cam, scene)
+    M = np.array(cam.matrix_world.inverted(), dtype = float)
+    Pc = np.asarray(P, dtype = float).reshape(-1, 3) @ M[:3,:3].T + M[:3,3]
+    depth = -Pc[:,2] # cameras look down their local -z axis
+    if cam.data.type == 'ORTHO':
+        xy = Pc[:,:2] * focal
+    else:
+        xy = Pc[:,:2] * (focal / np.where(np.abs(depth) > 1e-12, depth, 1e-12))[:,None]
+    shift = np.array([cam.data.shift_x, cam.data.shift_y]) * max(resX, resY)
+    uv = xy + shift + 0.5 * np.array([resX, resY])
+    return uv, depth
+
+def pixelsPerUnit(cam, P, scene = None):
+    """
+    returns, for every world space point, how many pixels a world space length of 1 covers at its depth (0 for points behind the camera)
+    """
+    resX, resY, focal = cameraIntrinsics(cam, scene)
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    if cam.data.type == 'ORTHO':
+        return np.full(P.shape[0], focal)
+    _, depth = worldToPixel(cam, P, scene)
+    return np.where(depth > 1e-12, focal / np.maximum(depth, 1e-12), 0.0)
+
+def projectedRadius(cam, centers, radii, scene = None):
+    """
+    returns the approximate radius in pixels of spheres (or any instances with a bounding radius) seen by a camera, 0 for the ones behind it
+    """
+    centers = np.asarray(centers, dtype = float).reshape(-1, 3)
+    return np.asarray(radii, dtype = float) * pixelsPerUnit(cam, centers, scene)
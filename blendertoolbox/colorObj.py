@@ -1,10 +1,28 @@
 class colorObj(object):
+    # immutable and hashable, so that equal colors can share a material (see cachedMaterial)
+    __slots__ = ('RGBA', 'H', 'S', 'V', 'B', 'C')
+
     def __init__(self, RGBA, \
     H = 0.5, S = 1.0, V = 1.0,\
     B = 0.0, C = 0.0):
-        self.H = H # hue
-        self.S = S # saturation
-        self.V = V # value
-        self.RGBA = RGBA
-        self.B = B # birghtness
-        self.C = C # contrast
\ No newline at end of file
+        object.__setattr__(self, 'H', H) # hue
+        object.__setattr__(self, 'S', S) # saturation
+        object.__setattr__(self, 'V', V) # value
+        object.__setattr__(self, 'RGBA', tuple(float(c) for c in RGBA))
+        object.__setattr__(self, 'B', B) # birghtness
+        object.__setattr__(self, 'C', C) # contrast
+
+    def __setattr__(self, name, value):
+        raise AttributeError('colorObj is immutable, create a new colorObj instead of changing "' + name + '"')
+
+    def key(self):
+        return (self.RGBA, self.H, self.S, self.V, self.B, self.C)
+
+    def __eq__(self, other):
+        return isinstance(other, colorObj) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return 'colorObj(%s, H = %g, S = %g, V = %g, B = %g, C = %g)' % self.key()
@@ -12,32 +12,43 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
-import math
 import numpy as np
+from . meshArrays import vertexArray, vertexNormalArray
+from . numpyMesh import numpyMesh
+from . setAttribute import setAttribute
+from . instanceOnPoints import instanceOnPoints
 
 def copyArrowToVertex(mesh, tmpArrow, VIdx, VNs = None):
-    bpy.ops.object.select_all(action = 'DESELECT')
-    tmpArrow.select_set(True)
-    bpy.context.view_layer.objects.active = tmpArrow
-    for ii in range(len(VIdx)):
-        print("copy progress " + str(ii) + "/" + str(len(VIdx)))
-        v = VIdx[ii]
-        pos = mesh.matrix_world @ mesh.data.vertices[v].co
-        bpy.ops.object.duplicate({"object" : tmpArrow}, linked=True)
-        objCopy = bpy.context.object
-        objCopy.location = pos
+    """
+    this function places a copy of tmpArrow on a subset of mesh vertices, pointing along the vertex normals (or VNs). Positions and orientations are computed in numpy and all arrows are instances of one point mesh.
 
-        # if not prescribed normals, then draw along vertex normal
-        if VNs is None: 
-            VN = mesh.matrix_world @ mesh.data.vertices[v].normal
-            VN = VN.normalized()
-        else:
-            VN = VNs[ii,:]
-            VN = VN / np.linalg.norm(VN)
-        phi = math.atan2(VN[1], VN[0]) 
-        theta = math.acos(VN[2]) 
-        objCopy.rotation_euler[1] = theta 
-        objCopy.rotation_euler[2] = phi 
+    Inputs
+    mesh: bpy.object of the mesh
+    tmpArrow: bpy.object of the arrow (pointing along +z), its scale is kept by every copy
+    VIdx: list of vertex indices
+    VNs: (optional) |VIdx|x3 array of arrow directions. If None, the world space vertex normals are used
 
-    
-        
\ No newline at end of file
+    Outputs
+    arrows_obj: the blender object holding all the arrows
+    """
+    VIdx = np.asarray(VIdx, dtype = np.int64).ravel()
+    nP = VIdx.shape[0]
+    P = vertexArray(mesh, mesh.matrix_world)[VIdx]
+    if VNs is None:
+        VN = vertexNormalArray(mesh, mesh.matrix_world)[VIdx]
+    else:
+        VN = np.asarray(VNs, dtype = float).reshape(-1, 3)
+        VN = VN / np.linalg.norm(VN, axis = 1)[:,None]
+
+    # euler angles that rotate +z onto the normal
+    rotation = np.zeros((nP, 3))
+    rotation[:,0] = tmpArrow.rotation_euler[0]
+    rotation[:,1] = np.arccos(np.clip(VN[:,2], -1.0, 1.0))
+    rotation[:,2] = np.arctan2(VN[:,1], VN[:,0])
+
+    arrows_obj = bpy.data.objects.new('arrows', numpyMesh(P, [], name = 'arrows'))
+    bpy.context.scene.collection.objects.link(arrows_obj)
+    setAttribute(arrows_obj.data, 'rotation', rotation, type = 'FLOAT_VECTOR', domain = 'POINT')
+    setAttribute(arrows_obj.data, 'scale', np.tile(np.array(tmpArrow.scale), (nP, 1)), type = 'FLOAT_VECTOR', domain = 'POINT')
+    instanceOnPoints(arrows_obj, tmpArrow, scale = 'scale', rotation = 'rotation')
+    return arrows_obj
@@ -12,18 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
+import numpy as np
+from . meshArrays import vertexArray
+from . numpyMesh import numpyMesh
+from . setAttribute import setAttribute
+from . instanceOnPoints import instanceOnPoints
 
 def copyToVertexSubset(mesh, templateObj, VIdx):
-    bpy.ops.object.select_all(action = 'DESELECT')
-    templateObj.select_set(True)
-    bpy.context.view_layer.objects.active = templateObj
-    for ii in VIdx:
-        Vloc = mesh.matrix_world @ mesh.data.vertices[int(ii)].co
+    """
+    this function places an instance of templateObj on a subset of mesh vertices. All copies live in one object (a point mesh with a geometry nodes modifier) instead of one linked duplicate per vertex.
 
-        bpy.ops.object.duplicate( linked=True)  # annoying I can't specify object i want to apply this to in here
-        bpy.context.selected_objects.clear()
-        templateObj.select_set(True)
+    Inputs
+    mesh: bpy.object of the mesh
+    templateObj: bpy.object to copy, its rotation and scale are kept by every copy
+    VIdx: list of vertex indices
 
-        objCopy = bpy.context.active_object
+    Outputs
+    copies_obj: the blender object holding all the copies
+    """
+    VIdx = np.asarray(VIdx, dtype = np.int64).ravel()
+    P = vertexArray(mesh, mesh.matrix_world)[VIdx]
+    nP = P.shape[0]
 
-        objCopy.location = Vloc
\ No newline at end of file
+    copies_obj = bpy.data.objects.new('vertex subset', numpyMesh(P, [], name = 'vertex subset'))
+    bpy.context.scene.collection.objects.link(copies_obj)
+    setAttribute(copies_obj.data, 'rotation', np.tile(np.array(templateObj.rotation_euler), (nP, 1)), type = 'FLOAT_VECTOR', domain = 'POINT')
+    setAttribute(copies_obj.data, 'scale', np.tile(np.array(templateObj.scale), (nP, 1)), type = 'FLOAT_VECTOR', domain = 'POINT')
+    instanceOnPoints(copies_obj, templateObj, scale = 'scale', rotation = 'rotation')
+    return copies_obj
@@ -13,40 +13,35 @@
 # limitations under the License.
 import bpy
 import numpy as np
+from . instanceTemplates import arrowMesh
 
-def createArrow(length, location, rotation_euler, scale):
-    # create arrow 
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=1, enter_editmode=False, location=(0, 0, 0))
-    sphere = bpy.data.objects['Sphere']
-    
-    bpy.ops.mesh.primitive_cone_add(radius1=1, radius2=0, depth=2, enter_editmode=False, location=(0, 0, 0))
-    cone = bpy.data.objects['Cone']
-    cone.location[2] = length
-    cone.scale[2] = length
+def createArrow(length, location, rotation_euler, scale, numSides = 32):
+    """
+    this function creates an arrow object along its local +z axis, from the origin to z = 2*length, with a head of radius 1. The geometry is a copy of the cached analytic arrow mesh, so materials and modifiers can be set per arrow.
 
-    # select cone
-    bpy.ops.object.select_all(action = 'DESELECT')
-    sphere.select_set(True)
-    bpy.context.view_layer.objects.active = sphere
-
-    bpy.ops.object.modifier_add(type='BOOLEAN')
-    sphere.modifiers["Boolean"].operation = 'UNION'
-    sphere.modifiers["Boolean"].object = cone
-    # bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Boolean") # for blender 2.8
-    bpy.ops.object.modifier_apply(modifier="Boolean")
+    Inputs
+    length: half of the arrow length
+    location: (3,) long tuple of the arrow location (same values as UI)
+    rotation_euler: (3,) long tuple of rotation angles in degrees (same values as UI)
+    scale: (3,) long tuple of per-axis scaling (same values as UI)
+    numSides: number of vertices around the arrow
 
+    Outputs
+    arrow: the blender object of the arrow
+    """
+    arrow = bpy.data.objects.new('Arrow', arrowMesh(numSides, length = 2.0 * length).copy())
+    bpy.context.scene.collection.objects.link(arrow)
     bpy.ops.object.select_all(action = 'DESELECT')
-    cone.select_set(True)
-    bpy.context.view_layer.objects.active = cone
-    bpy.ops.object.delete()  
+    arrow.select_set(True)
+    bpy.context.view_layer.objects.active = arrow
 
     # move 
     x = rotation_euler[0] * 1.0 / 180.0 * np.pi 
     y = rotation_euler[1] * 1.0 / 180.0 * np.pi 
     z = rotation_euler[2] * 1.0 / 180.0 * np.pi 
     angle = (x,y,z)
-    sphere.location = location
-    sphere.rotation_euler = angle
-    sphere.scale = scale
+    arrow.location = location
+    arrow.rotation_euler = angle
+    arrow.scale = scale
 
-    return sphere
\ No newline at end of file
+    return arrow
\ No newline at end of file
@@ -11,58 +11,83 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import bpy, bmesh
+import bpy
 import numpy as np
-import math
-import mathutils
+from . colorMap import colorMap
+from . numpyMesh import numpyMesh
+from . setAttribute import setAttribute
+from . instanceOnPoints import instanceOnPoints
+from . instanceTemplates import templateObject, arrowMesh, lodTemplates, lodIndex
 
 # TODO: for some reasons, I cannot use python to link face area to scale the arrows
-def createScaledVectorFieldMesh(mesh, P, PN, thickness, length, per_vector_scales):
+def createScaledVectorFieldMesh(mesh, P, PN, thickness, length, per_vector_scales, colormap = None, cam = None, lodThresholds = (2, 8, 32)):
+    """
+    this function draws an arrow for every vector of a vector field. All arrows are instances on one point mesh whose position, rotation and scale attributes are written in bulk.
 
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=1, location=(0, 0, 1))
-    arrow_obj = bpy.data.objects[-1]
-    bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center = 'MEDIAN') # set the object origin to the bottom
-    bpy.ops.object.editmode_toggle()
-    arrow_bmesh = bmesh.from_edit_mesh(arrow_obj.data)
-    vertices= [v for v in arrow_bmesh.verts]
-    for v in vertices:
-        if v.index == 81: # 81 is the vertex index for the top UV sphere
-            bpy.ops.mesh.select_all(action = 'DESELECT')
-            v.select = True
-            bpy.ops.transform.translate(value = (0,0,1),constraint_axis = (False, False, True),orient_type = 'GLOBAL',use_proportional_edit=True, proportional_edit_falloff='LINEAR')
-    bpy.ops.object.editmode_toggle()
-    arrow_obj.location = (1e5,1e5,1e5) # move it out of the scene
-    bpy.ops.object.shade_smooth()
+    Inputs
+    mesh: bpy.object whose world matrix is applied to the vectors
+    P: |P|x3 array of vector origins
+    PN: |P|x3 array of vectors
+    thickness: width of the arrows
+    length: global length multiplier of the arrows
+    per_vector_scales: |P| array of per vector length multipliers
+    colormap: (optional) name of a colorMap to color the arrows by their length
+    cam: (optional) bpy.object of the render camera. If given, every arrow is instanced from an arrow with 4 to 32 sides picked by its projected size in pixels
+    lodThresholds: projected radii (in pixels) where the arrow with twice as many sides starts
+
+    Outputs
+    arrow_obj: the (hidden) template arrow object, materials set on it apply to all arrows. With cam, the collection of the template arrows of all levels (they share one material)
+    """
 
     mat = bpy.data.materials.new('MeshMaterial')
-    arrow_obj.data.materials.append(mat)
-    arrow_obj.active_material = mat
     mat.diffuse_color = (1,1,1,1)
+    arrowLength, headRadius = 3.0, 1.0
+    if cam is None:
+        arrow_obj = templateObject(arrowMesh(length = arrowLength, headRadius = headRadius), 'arrow template', mat)
+    else:
+        levels = [arrowMesh(4 * 2 ** level, length = arrowLength, headRadius = headRadius) for level in range(len(lodThresholds) + 1)]
+        arrow_obj = lodTemplates(levels, 'arrow template', mat)
 
-    for ii in range(P.shape[0]): 
-        p1_ref = mathutils.Vector((P[ii,0], P[ii,1], P[ii,2]))
-        p2_ref = mathutils.Vector((P[ii,0]+PN[ii,0], P[ii,1]+PN[ii,1], P[ii,2]+PN[ii,2]))
-
-        p1 = mesh.matrix_world @ p1_ref
-        p2 = mesh.matrix_world @ p2_ref
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        dz = p2[2] - p1[2]
-        dist = math.sqrt(dx**2 + dy**2 + dz**2) 
+    # arrow positions, directions and lengths for all vectors at once
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    PN = np.asarray(PN, dtype = float).reshape(-1, 3)
+    per_vector_scales = np.broadcast_to(np.asarray(per_vector_scales, dtype = float).ravel(), (P.shape[0],))
+    M = np.array(mesh.matrix_world)
+    p1 = P @ M[:3,:3].T + M[:3,3]
+    p2 = (P + PN) @ M[:3,:3].T + M[:3,3]
+    D = p2 - p1
+    dist = np.linalg.norm(D, axis = 1)
+    D = D / np.maximum(dist, 1e-16)[:,None]
 
-        # cylinder.duplicate
-        # bpy.context.selected_objects.clear()
-        # cylinder.select_set(True)
-        bpy.ops.object.duplicate( linked=True)  # annoying I can't specify object i want to apply this to in here
+    rotation = np.zeros(P.shape)
+    rotation[:,1] = np.arccos(np.clip(D[:,2], -1.0, 1.0))
+    rotation[:,2] = np.arctan2(D[:,1], D[:,0])
+    # per instance scale that gives each copy the dimensions (thickness, thickness, arrow length)
+    dimensions = np.zeros(P.shape)
+    dimensions[:,0] = thickness
+    dimensions[:,1] = thickness
+    dimensions[:,2] = dist * per_vector_scales * length
+    # divided by the extents of the analytic arrow (the hidden template object is never evaluated, so its dimensions are not reliable)
+    scale = dimensions / np.array([2.0 * headRadius, 2.0 * headRadius, arrowLength])
 
-        # bpy.context.selected_objects.clear()
-        objCopy = bpy.context.active_object
+    vectors_obj = bpy.data.objects.new('vector field', numpyMesh(0.5 * (p1 + p2), [], name = 'vector field'))
+    bpy.context.scene.collection.objects.link(vectors_obj)
+    setAttribute(vectors_obj.data, 'rotation', rotation, type = 'FLOAT_VECTOR', domain = 'POINT')
+    setAttribute(vectors_obj.data, 'scale', scale, type = 'FLOAT_VECTOR', domain = 'POINT')
+    if cam is not None:
+        radii = 0.5 * np.maximum(dimensions[:,2], thickness)
+        setAttribute(vectors_obj.data, 'lod', lodIndex(cam, 0.5 * (p1 + p2), radii, lodThresholds), type = 'INT', domain = 'POINT')
 
-        objCopy.dimensions = (thickness, thickness, dist * per_vector_scales[ii] * length)
-        objCopy.location = (dx/2 + p1[0], dy/2 + p1[1], dz/2 + p1[2])
-        phi = math.atan2(dy, dx) 
-        theta = math.acos(dz/dist) 
-        bpy.context.object.rotation_euler[1] = theta 
-        bpy.context.object.rotation_euler[2] = phi 
+    if colormap is not None:
+        # color the arrows by their drawn length
+        setAttribute(vectors_obj.data, 'Col', colorMap(dimensions[:,2], colormap), type = 'FLOAT_COLOR', domain = 'POINT')
+        mat.use_nodes = True
+        tree = mat.node_tree
+        ATTR = tree.nodes.new('ShaderNodeAttribute')
+        ATTR.attribute_type = 'INSTANCER'
+        ATTR.attribute_name = 'Col'
+        ATTR.location.x -= 200
+        tree.links.new(ATTR.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
 
+    instanceOnPoints(vectors_obj, arrow_obj, scale = 'scale', rotation = 'rotation', pickInstance = None if cam is None else 'lod')
     return arrow_obj
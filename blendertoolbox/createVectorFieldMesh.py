@@ -11,48 +11,31 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import bpy, bmesh
+import bpy
 import numpy as np
-import math
+from . instanceTemplates import templateObject, arrowMesh
+from . numpyMesh import numpyMesh
+from . tubeMesh import normalizeRows, perpendicular
 
 # TODO: for some reasons, I cannot use python to link face area to scale the arrows
 def createVectorFieldMesh(P, PN, thickness, length, location, rotation, scale):
-    # create a reference arroa mesh
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=1, location=(0, 0, 1))
-    arrow_obj = bpy.data.objects[-1]
-    bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center = 'MEDIAN') # set the object origin to the bottom
-    bpy.ops.object.editmode_toggle()
-    arrow_bmesh = bmesh.from_edit_mesh(arrow_obj.data)
-    vertices= [v for v in arrow_bmesh.verts]
-    for v in vertices:
-        if v.index == 81: # 81 is the vertex index for the top UV sphere
-            bpy.ops.mesh.select_all(action = 'DESELECT')
-            v.select = True
-            bpy.ops.transform.translate(value = (0,0,1),constraint_axis = (False, False, True),orient_type = 'GLOBAL',use_proportional_edit=True, proportional_edit_falloff='LINEAR')
-    bpy.ops.object.editmode_toggle()
-    # arrow_obj.scale = arrow_scale # scale it so that it looks more like an needle
-    arrow_obj.location = (1e5,1e5,1e5) # move it out of the scene
-    bpy.ops.object.shade_smooth()
-
-    # create a triangle mesh for point cloud (V,F)
-    x = np.random.rand(PN.shape[0],3)
-    PN_normalized = PN / np.sqrt(np.sum(PN*PN,1))[:,None]
-    x -= np.sum(x*PN_normalized,1)[:,None] * PN_normalized 
-    x = x / np.sqrt(np.sum(x*x, 1))[:,None] * 1e-4
-    y =  np.cross(PN_normalized, x)
-    y = y / np.sqrt(np.sum(y*y, 1))[:,None] * 1e-3
-    V0 = P + 0.5 * x - np.sqrt(3)/4. * y
-    V1 = P + np.sqrt(3)/4. * y
-    V2 = P - 0.5 * x - np.sqrt(3)/4. * y
+    # the shared arrow template (radius 1, from z = 0 to z = 3)
+    arrow_obj = templateObject(arrowMesh(), 'arrow template')
+
+    # create a tiny triangle per vector, orthogonal to it (deterministic tangent frames, float32)
+    P = np.asarray(P, dtype = np.float32).reshape(-1, 3)
+    PN_normalized = normalizeRows(np.asarray(PN, dtype = np.float32).reshape(-1, 3))
+    x = perpendicular(PN_normalized) * np.float32(1e-4)
+    y = normalizeRows(np.cross(PN_normalized, x)) * np.float32(1e-3)
+    V0 = P + 0.5 * x - 3 ** 0.5 / 4. * y
+    V1 = P + 3 ** 0.5 / 4. * y
+    V2 = P - 0.5 * x - 3 ** 0.5 / 4. * y
     V = np.vstack((V0,V1,V2))
     F = np.arange(V.shape[0]).reshape(3,-1).T
 
     # set location  rotation scalig for he quad mesh
     bpy.ops.object.select_all(action = 'DESELECT')
-    mesh = bpy.data.meshes.new(name='point cloud quad mesh')
-    mesh.from_pydata(V,[],F)
-    mesh.update()
-    mesh.validate(verbose=True)
+    mesh = numpyMesh(V, F, name = 'point cloud quad mesh')
     P_mesh = bpy.data.objects.new('point cloud quad mesh object', mesh)
     P_mesh.location = location
     P_mesh.rotation_euler[0] = rotation[0] / 180. * np.pi
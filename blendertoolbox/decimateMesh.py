@@ -0,0 +1,300 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import numpy as np
+from . numpyMesh import numpyMesh
+from . meshArrays import vertexArray, triangleArray
+from . setAttribute import meshAttributes, setMeshAttributes
+from . downsamplePoints import downsamplingSpacing
+
+# decimated meshes already loaded in this session, keyed by (source path, variant, number of faces)
+LOD_CACHE = {}
+
+def quadricDecimate(V, F, targetFaces = None, maxError = None, boundaryWeight = 100.0, maxIterations = 200, returnIndices = False):
+    """
+    this function simplifies a triangle mesh by edge collapses with the quadric error metric (Garland and Heckbert). Instead of one collapse at a time, every iteration collapses a whole batch of cheap edges that do not share any face, all in numpy. Collapses that would flip a triangle or make the mesh non-manifold are skipped, and boundary edges are kept in place by extra quadrics.
+
+    Inputs
+    V: |V|x3 array of vertex locations
+    F: |F|x3 array of triangle indices
+    targetFaces: (optional) stop once the mesh has at most this many faces
+    maxError: (optional) stop once every remaining collapse moves the surface by more than this distance
+    boundaryWeight: weight of the quadrics that keep the boundary in place
+    maxIterations: maximal number of batches
+    returnIndices: also return where the remaining vertices and faces come from, to carry their attributes over
+
+    Outputs
+    V: |V'|x3 array of vertex locations
+    F: |F'|x3 array of triangle indices
+    vertexIndex: (only with returnIndices) |V'| array of the input vertex every vertex was collapsed into
+    faceIndex: (only with returnIndices) |F'| array of the input triangle of every face, with its corners in the same order
+    """
+    if targetFaces is None and maxError is None:
+        raise ValueError('Error in "quadricDecimate": either targetFaces or maxError must be given')
+    V = np.array(V, dtype = float).reshape(-1, 3)
+    F = np.array(F, dtype = np.int64).reshape(-1, 3)
+    if targetFaces is None:
+        targetFaces = 0
+    maxCost = np.inf if maxError is None else maxError * maxError
+    faceIndex = np.arange(F.shape[0])
+
+    # plane quadrics of the faces, accumulated at their corners
+    normal = np.cross(V[F[:,1]] - V[F[:,0]], V[F[:,2]] - V[F[:,0]])
+    normal /= np.maximum(np.linalg.norm(normal, axis = 1), 1e-300)[:,None]
+    plane = np.concatenate((normal, -np.sum(normal * V[F[:,0]], axis = 1)[:,None]), axis = 1)
+    Q = np.zeros((V.shape[0], 4, 4))
+    K = plane[:,:,None] * plane[:,None,:]
+    for c in range(3):
+        np.add.at(Q, F[:,c], K)
+
+    # boundary edges (used by a single face) get a plane perpendicular to their face
+    A, B = F.ravel(), F[:,[1,2,0]].ravel()
+    key = np.minimum(A, B) * V.shape[0] + np.maximum(A, B)
+    _, inverse, counts = np.unique(key, return_inverse = True, return_counts = True)
+    boundary = counts[inverse.reshape(-1)] == 1
+    A, B = A[boundary], B[boundary]
+    edge = V[B] - V[A]
+    side = np.cross(edge, np.repeat(normal, 3, axis = 0)[boundary])
+    side /= np.maximum(np.linalg.norm(side, axis = 1), 1e-300)[:,None]
+    plane = np.concatenate((side, -np.sum(side * V[A], axis = 1)[:,None]), axis = 1)
+    K = boundaryWeight * plane[:,:,None] * plane[:,None,:]
+    np.add.at(Q, A, K)
+    np.add.at(Q, B, K)
+
+    for iteration in range(maxIterations):
+        if F.shape[0] <= targetFaces:
+            break
+        # unique edges of the remaining faces
+        A, B = F.ravel(), F[:,[1,2,0]].ravel()
+        key, edgeFaces = np.unique(np.minimum(A, B) * V.shape[0] + np.maximum(A, B), return_counts = True)
+        A, B = key // V.shape[0], key % V.shape[0]
+
+        # best position of every collapse: the minimizer of the quadric if it is well defined, else an endpoint or the midpoint
+        QE = Q[A] + Q[B]
+        candidates = np.stack((V[A], V[B], 0.5 * (V[A] + V[B]), 0.5 * (V[A] + V[B])), axis = 1)
+        M = QE[:,:3,:3]
+        solvable = np.abs(np.linalg.det(M)) > 1e-12 * np.maximum(np.abs(M).max(axis = (1,2)), 1e-300) ** 3
+        if solvable.any():
+            candidates[solvable,3] = np.linalg.solve(M[solvable], -QE[solvable,:3,3][:,:,None])[:,:,0]
+        H = np.concatenate((candidates, np.ones(candidates.shape[:2] + (1,))), axis = 2)
+        costs = np.einsum('eci,eij,ecj->ec', H, QE, H)
+        best = np.argmin(costs, axis = 1)
+        cost = costs[np.arange(A.shape[0]), best]
+        position = candidates[np.arange(A.shape[0]), best]
+
+        # a batch of collapses that do not interact, but not (many) more than needed: every interior collapse removes two faces
+        chosen = independentCollapses(V, F, A, B, edgeFaces, position, cost, maxCost, seed = iteration)
+        chosen = chosen[np.argsort(cost[chosen], kind = 'stable')][:max((F.shape[0] - targetFaces + 1) // 2, 1)]
+        if chosen.shape[0] == 0:
+            break
+        a, b = A[chosen], B[chosen]
+        V[a] = position[chosen]
+        Q[a] += Q[b]
+        remap = np.arange(V.shape[0])
+        remap[b] = a
+        F = remap[F]
+        valid = (F[:,0] != F[:,1]) & (F[:,1] != F[:,2]) & (F[:,2] != F[:,0])
+        F, faceIndex = F[valid], faceIndex[valid]
+
+    # remove the collapsed vertices
+    used = np.zeros(V.shape[0], dtype = bool)
+    used[F.ravel()] = True
+    remap = np.cumsum(used) - 1
+    if returnIndices:
+        return V[used], remap[F], np.flatnonzero(used), faceIndex
+    return V[used], remap[F]
+
+def linkCondition(A, B, edgeFaces, nV):
+    """
+    returns for every edge (A[i], B[i]) of a triangle mesh (unique and sorted by A * nV + B, used by edgeFaces[i] faces) whether collapsing it keeps the mesh manifold: its endpoints may only share the neighbors opposite to the edge, and an interior edge may not join two boundary vertices
+    """
+    key = A * nV + B
+    # neighbors of every vertex
+    I, J = np.concatenate((A, B)), np.concatenate((B, A))
+    order = np.argsort(I, kind = 'stable')
+    I, J = I[order], J[order]
+    degree = np.bincount(I, minlength = nV)
+    start = np.cumsum(degree) - degree
+    # for every edge and every neighbor c of A, is (B, c) an edge too
+    edge = np.repeat(np.arange(A.shape[0]), degree[A])
+    c = J[np.arange(edge.shape[0]) - np.repeat(np.cumsum(degree[A]) - degree[A], degree[A]) + np.repeat(start[A], degree[A])]
+    b = B[edge]
+    query = np.minimum(b, c) * nV + np.maximum(b, c)
+    pos = np.clip(np.searchsorted(key, query), 0, key.shape[0] - 1)
+    shared = (key[pos] == query) & (c != b)
+    common = np.bincount(edge[shared], minlength = A.shape[0])
+    # a shared neighbor with only three neighbors would be left with two faces on top of each other
+    thin = np.bincount(edge[shared & (degree[c] <= 3)], minlength = A.shape[0]) > 0
+    boundaryVertex = np.zeros(nV, dtype = bool)
+    boundaryVertex[A[edgeFaces == 1]] = True
+    boundaryVertex[B[edgeFaces == 1]] = True
+    pinch = (edgeFaces > 1) & boundaryVertex[A] & boundaryVertex[B]
+    return (common == edgeFaces) & ~pinch & ~thin
+
+def independentCollapses(V, F, A, B, edgeFaces, position, cost, maxCost, rounds = 8, seed = 0):
+    """
+    picks edge collapses that can be applied at once: no face touches two of them, none flips a face and all of them keep the mesh manifold. The candidates are the cheapest quarter of the edges; they are picked in rounds with random priorities (Luby's algorithm), every round takes the candidates with the highest priority among all candidates sharing a face with them. Ordering by cost instead would stall, since the cost varies smoothly over the mesh and has few local minima.
+
+    Outputs
+    chosen: indices of the edges to collapse
+    """
+    nV, nE = V.shape[0], A.shape[0]
+    candidate = (cost <= maxCost) & linkCondition(A, B, edgeFaces, nV)
+    if not candidate.any():
+        return np.zeros(0, dtype = np.int64)
+    candidate &= cost <= np.sort(cost[candidate])[candidate.sum() // 4]
+    rank = np.random.default_rng(seed).permutation(nE)
+    accepted = np.zeros(nE, dtype = bool)
+    blocked = np.zeros(nV, dtype = bool)
+    edgeOfRank = np.full(nE + 1, -1)
+    for _ in range(rounds):
+        candidate &= ~blocked[A] & ~blocked[B]
+        if not candidate.any():
+            break
+        # smallest candidate rank (highest priority) over the faces around every vertex
+        vertexRank = np.full(nV, nE)
+        np.minimum.at(vertexRank, A[candidate], rank[candidate])
+        np.minimum.at(vertexRank, B[candidate], rank[candidate])
+        faceRank = vertexRank[F].min(axis = 1)
+        ringRank = np.full(nV, nE)
+        for c in range(3):
+            np.minimum.at(ringRank, F[:,c], faceRank)
+        selected = candidate & (ringRank[A] == rank) & (ringRank[B] == rank)
+
+        # faces around the selected edges (each one touches at most one of them), the ones keeping a single endpoint must not flip
+        vertexRank = np.full(nV, nE)
+        vertexRank[A[selected]] = rank[selected]
+        vertexRank[B[selected]] = rank[selected]
+        edgeOfRank[rank[selected]] = np.flatnonzero(selected)
+        faceEdge = edgeOfRank[vertexRank[F].min(axis = 1)]
+        touched = np.flatnonzero(faceEdge >= 0)
+        e = faceEdge[touched]
+        moved = (F[touched] == A[e][:,None]) | (F[touched] == B[e][:,None])
+        P = V[F[touched]]
+        before = np.cross(P[:,1] - P[:,0], P[:,2] - P[:,0])
+        P = np.where(moved[:,:,None], position[e][:,None,:], P)
+        after = np.cross(P[:,1] - P[:,0], P[:,2] - P[:,0])
+        flipped = (moved.sum(axis = 1) == 1) & (np.sum(before * after, axis = 1) <= 0) & np.any(before != 0, axis = 1)
+        bad = np.zeros(nE, dtype = bool)
+        bad[e[flipped]] = True
+        edgeOfRank[rank[selected]] = -1
+
+        selected &= ~bad
+        candidate &= ~bad & ~selected
+        accepted |= selected
+        # the vertices of the faces around an accepted edge may not be used by later rounds
+        keep = selected[e]
+        blocked[F[touched[keep]].ravel()] = True
+    return np.flatnonzero(accepted)
+
+def decimateArrays(mesh_obj, targetFaces = None, maxError = None):
+    """
+    this function decimates the mesh of an object with quadricDecimate and returns the result as a dict of numpy arrays (see setLOD): the vertices "V", triangles "F", per face "smooth" and "material" flags, the point, face and face corner attributes (keys of meshAttributes) and, if the mesh has custom normals, the face corner "normals". Point values are taken from the vertex each vertex was collapsed into, face and corner values from the triangle each face comes from.
+    """
+    data = mesh_obj.data
+    V = vertexArray(mesh_obj)
+    T, triFace = triangleArray(mesh_obj)
+    triLoops = np.zeros(T.size, dtype = np.int32)
+    data.loop_triangles.foreach_get('loops', triLoops)
+    triLoops = triLoops.reshape(-1, 3)
+    V, F, vertexIndex, faceIndex = quadricDecimate(V, T, targetFaces, maxError, returnIndices = True)
+
+    lod = {'V': V.astype(np.float32), 'F': F.astype(np.int32)}
+    face = triFace[faceIndex]
+    corner = triLoops[faceIndex].ravel()
+    for name, field, dtype in (('smooth', 'use_smooth', bool), ('material', 'material_index', np.int32)):
+        values = np.zeros(len(data.polygons), dtype = dtype)
+        data.polygons.foreach_get(field, values)
+        lod[name] = values[face]
+    for key, values in meshAttributes(data).items():
+        domain = key.split(':', 1)[0]
+        lod[key] = values[vertexIndex if domain == 'POINT' else face if domain == 'FACE' else corner]
+    if data.has_custom_normals:
+        normals = np.zeros(len(data.loops) * 3, dtype = np.float32)
+        if hasattr(data, 'corner_normals'): # blender 4.1+
+            data.corner_normals.foreach_get('vector', normals)
+        else:
+            data.calc_normals_split()
+            data.loops.foreach_get('normal', normals)
+        lod['normals'] = normals.reshape(-1, 3)[corner]
+    return lod
+
+def setLOD(mesh_obj, lod):
+    """
+    this function replaces the geometry of a mesh object by a decimated version (a dict returned by decimateArrays), with its face flags, attributes and custom normals. The materials of the mesh are kept
+    """
+    data = mesh_obj.data
+    numpyMesh(lod['V'], lod['F'], mesh = data)
+    if 'smooth' in lod:
+        data.polygons.foreach_set('use_smooth', np.asarray(lod['smooth'], dtype = bool))
+        data.polygons.foreach_set('material_index', np.asarray(lod['material'], dtype = np.int32))
+    setMeshAttributes(data, lod)
+    if 'normals' in lod:
+        if hasattr(data, 'use_auto_smooth'): # custom normals need auto smooth before blender 4.1
+            data.use_auto_smooth = True
+        data.normals_split_custom_set(np.asarray(lod['normals'], dtype = np.float32))
+    data.update()
+
+def decimateMesh(mesh_obj, targetFaces = None, cam = None, pixelError = 0.5, sourcePath = None, variant = ''):
+    """
+    this function decimates a mesh object in place with quadricDecimate, either to a number of faces or until the error would become visible from a camera. Face flags, attributes (vertex colors, uv maps, ...) and custom normals are carried over (see decimateArrays).
+
+    Inputs
+    mesh_obj: bpy.object of the mesh
+    targetFaces: (optional) number of faces to keep
+    cam: (optional) bpy.object of the camera, the error is then bounded by pixelError pixels at the point of the mesh closest to the camera
+    pixelError: allowed error in pixels (only with cam)
+    sourcePath: (optional, with targetFaces) file the mesh comes from (e.g. a .ply or a .blend). The result is then cached in memory and as an .npz next to it (see loadLOD), and reused until the file changes
+    variant: (optional) tells apart several meshes of one source file, or several ways to load it, in the cache (e.g. ".<mesh name>")
+
+    Outputs
+    lod: dict of the arrays of the decimated mesh (see decimateArrays)
+    """
+    cacheable = sourcePath is not None and targetFaces is not None and cam is None
+    lod = loadLOD(sourcePath, targetFaces, variant) if cacheable else None
+    if lod is None:
+        maxError = None
+        if cam is not None:
+            maxError = downsamplingSpacing(vertexArray(mesh_obj), cam, pixelError, mesh_obj.matrix_world)
+        lod = decimateArrays(mesh_obj, targetFaces, maxError)
+        if cacheable:
+            saveLOD(sourcePath, targetFaces, lod, variant)
+    setLOD(mesh_obj, lod)
+    return lod
+
+def lodCachePath(sourcePath, targetFaces, variant = ''):
+    return sourcePath + variant + '.lod%d.npz' % targetFaces
+
+def loadLOD(sourcePath, targetFaces, variant = ''):
+    """
+    returns the cached decimated version (a dict of arrays, see decimateArrays) of a mesh of a file, from memory or from the .npz next to the file as long as it is newer than the file, or None
+    """
+    key = (os.path.abspath(sourcePath), variant, targetFaces)
+    cachePath = lodCachePath(sourcePath, targetFaces, variant)
+    if key in LOD_CACHE:
+        return LOD_CACHE[key]
+    if os.path.exists(cachePath) and os.path.getmtime(cachePath) >= os.path.getmtime(sourcePath):
+        LOD_CACHE[key] = dict(np.load(cachePath))
+        return LOD_CACHE[key]
+    return None
+
+def saveLOD(sourcePath, targetFaces, lod, variant = ''):
+    """
+    keeps the decimated version of a mesh of a file in memory and as an .npz next to the file
+    """
+    LOD_CACHE[(os.path.abspath(sourcePath), variant, targetFaces)] = lod
+    try:
+        np.savez(lodCachePath(sourcePath, targetFaces, variant), **lod)
+    except OSError: # read-only folders are only cached in memory
+        pass
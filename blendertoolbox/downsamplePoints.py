@@ -0,0 +1,172 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from . cameraProjection import pixelsPerUnit
+
+def voxelDownsample(P, voxelSize, point_colors = None):
+    """
+    this function replaces all points that fall into the same voxel by their mean (and mean color)
+
+    Inputs
+    P: |P|x3 array of points
+    voxelSize: edge length of the voxels
+    point_colors: (optional) |P|xk array of point colors
+
+    Outputs
+    P: |P'|x3 array of voxel means
+    point_colors: |P'|xk array of mean colors (None without point_colors)
+    """
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    ijk = np.floor((P - P.min(axis = 0)) / voxelSize).astype(np.int64)
+    dims = ijk.max(axis = 0) + 1
+    key = (ijk[:,0] * dims[1] + ijk[:,1]) * dims[2] + ijk[:,2]
+    _, cell, counts = np.unique(key, return_inverse = True, return_counts = True)
+    cell = cell.reshape(-1)
+    def mean(X):
+        return np.stack([np.bincount(cell, weights = X[:,c]) for c in range(X.shape[1])], axis = 1) / counts[:,None]
+    if point_colors is not None:
+        point_colors = mean(np.asarray(point_colors, dtype = float))
+    return mean(P), point_colors
+
+def neighborPairs(P, radius):
+    """
+    returns all pairs (i, j), i != j, of points closer than radius, found through a hash grid with cells of size radius
+    """
+    ijk = np.floor((P - P.min(axis = 0)) / radius).astype(np.int64) + 1
+    dims = ijk.max(axis = 0) + 2
+    key = (ijk[:,0] * dims[1] + ijk[:,1]) * dims[2] + ijk[:,2]
+    order = np.argsort(key, kind = 'stable')
+    sortedKey = key[order]
+    I, J = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                neighborKey = key + (dx * dims[1] + dy) * dims[2] + dz
+                lo = np.searchsorted(sortedKey, neighborKey, side = 'left')
+                hi = np.searchsorted(sortedKey, neighborKey, side = 'right')
+                n = hi - lo
+                i = np.repeat(np.arange(P.shape[0]), n)
+                j = order[np.arange(i.shape[0]) - np.repeat(np.cumsum(n) - n, n) + np.repeat(lo, n)]
+                close = (i != j) & (np.sum((P[i] - P[j]) ** 2, axis = 1) < radius * radius)
+                I.append(i[close])
+                J.append(j[close])
+    return np.concatenate(I), np.concatenate(J)
+
+def poissonDiskDownsample(P, radius, seed = 0):
+    """
+    this function picks a blue noise subset of the points in which no two points are closer than radius and every point lies within 2*radius of a kept one. The points are first thinned to one random point per voxel of size radius/2, then a maximal independent set of the neighbor graph is found with random priorities, all points deciding in parallel (Luby's algorithm).
+
+    Inputs
+    P: |P|x3 array of points
+    radius: minimum distance between the kept points
+    seed: seed of the random priorities
+
+    Outputs
+    keep: indices of the kept points
+    """
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    rng = np.random.default_rng(seed)
+    priority = rng.permutation(P.shape[0])
+
+    # one candidate per small voxel (the one with the highest priority) bounds the number of neighbors
+    ijk = np.floor((P - P.min(axis = 0)) / (0.5 * radius)).astype(np.int64)
+    dims = ijk.max(axis = 0) + 1
+    key = (ijk[:,0] * dims[1] + ijk[:,1]) * dims[2] + ijk[:,2]
+    order = np.lexsort((-priority, key))
+    first = np.concatenate(([True], key[order][1:] != key[order][:-1]))
+    candidates = order[first]
+
+    Q = P[candidates]
+    priority = priority[candidates]
+    I, J = neighborPairs(Q, radius)
+    undecided = np.ones(Q.shape[0], dtype = bool)
+    kept = np.zeros(Q.shape[0], dtype = bool)
+    while undecided.any():
+        active = undecided[I] & undecided[J]
+        I, J = I[active], J[active]
+        neighborMax = np.full(Q.shape[0], -1)
+        np.maximum.at(neighborMax, I, priority[J])
+        accept = undecided & (priority > neighborMax)
+        kept |= accept
+        undecided &= ~accept
+        undecided[J[accept[I]]] = False
+    return np.sort(candidates[kept])
+
+def downsamplingSpacing(P, cam, pixelSpacing, matrix = None, scene = None):
+    """
+    converts a target spacing in pixels into world units, at the point closest to the camera (so the target density is reached everywhere). matrix is an optional 4x4 object to world matrix of P, the spacing is returned in the coordinates of P.
+    """
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    scaleFactor = 1.0
+    if matrix is not None:
+        matrix = np.asarray(matrix, dtype = float)
+        P = P @ matrix[:3,:3].T + matrix[:3,3]
+        scaleFactor = np.abs(np.linalg.det(matrix[:3,:3])) ** (1.0 / 3.0)
+    return pixelSpacing / max(pixelsPerUnit(cam, P, scene).max(), 1e-12) / scaleFactor
+
+def downsamplePoints(P, method, spacing, point_colors = None, seed = 0):
+    """
+    this function thins out a point cloud that is denser than the rendering can show
+
+    Inputs
+    P: |P|x3 array of points
+    method: 'voxel' (mean per voxel of size spacing) or 'poisson' (blue noise subset with minimum distance spacing)
+    spacing: target distance between points
+    point_colors: (optional) |P|xk array of point colors
+    seed: seed of the poisson disk sampling
+
+    Outputs
+    P: |P'|x3 array of the remaining points
+    point_colors: |P'|xk array of their colors (None without point_colors)
+    """
+    if method == 'voxel':
+        return voxelDownsample(P, spacing, point_colors)
+    elif method == 'poisson':
+        keep = poissonDiskDownsample(P, spacing, seed)
+        return np.asarray(P)[keep], None if point_colors is None else np.asarray(point_colors)[keep]
+    else:
+        raise ValueError('Error in "downsamplePoints": method must be "voxel" or "poisson"')
+
+def blueNoiseSubsample(P, count, seed = 0):
+    """
+    returns the indices of about count points forming a blue noise subset of P: the poisson disk radius is searched by bisection and the extra points of the closest result are dropped at random
+
+    Inputs
+    P: |P|x3 array of points
+    count: number of points to keep
+    seed: seed of the random choices
+
+    Outputs
+    keep: sorted indices of the kept points
+    """
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    if count >= P.shape[0]:
+        return np.arange(P.shape[0])
+    diag = np.linalg.norm(P.max(axis = 0) - P.min(axis = 0))
+    lo, hi = 0.0, diag
+    radius = diag / np.sqrt(count)
+    best = np.arange(P.shape[0])
+    for _ in range(20):
+        keep = poissonDiskDownsample(P, radius, seed)
+        if keep.shape[0] >= count:
+            lo = radius
+            if keep.shape[0] < best.shape[0]:
+                best = keep
+            if keep.shape[0] <= 1.05 * count:
+                break
+        else:
+            hi = radius
+        radius = np.sqrt(lo * hi) if lo > 0 else 0.5 * radius
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(best, count, replace = False))
@@ -12,87 +12,89 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
-import bmesh
 import numpy as np
+from . colorObj import colorObj
 from . initColorNode import initColorNode
+from . boundaryLoops import boundaryLoops
+from . drawCurves import drawCurves
+from . setAttribute import setAttribute
 
-def drawBoundaryLoop(mesh, r, bdColor, subdivision = 2):
-    nV = len(mesh.data.vertices)
-    V = np.zeros((nV, 3), dtype = float)
-    for ii in range(nV):
-        V[ii,:] = mesh.matrix_local.to_3x3() @ mesh.data.vertices[int(ii)].co
-        V[ii,0] += mesh.matrix_local[0][3]
-        V[ii,1] += mesh.matrix_local[1][3]
-        V[ii,2] += mesh.matrix_local[2][3]
+def drawBoundaryLoop(mesh, r, bdColor, subdivision = 2, backend = 'bevel', loopColors = None):
+    """
+    draw the boundary loops of a mesh. The loops are chained in numpy (see boundaryLoops) and written as the splines of a single object, no mesh to curve conversion is involved.
 
-    nF = len(mesh.data.polygons)
-    F = np.zeros((nF, 3), dtype = int)
-    for ii in range(nF):
-        F[ii,:] = mesh.data.polygons[ii].vertices
+    Inputs
+    mesh: bpy.object of the mesh
+    r: radius of the boundary curves
+    bdColor: colorObj of the boundary (with loopColors, only its H/S/V/B/C adjustments are used)
+    subdivision: smoothing of the loops ('bevel' backend only): 0 keeps the polygons, otherwise the loops are smooth NURBS with 2^subdivision samples per edge
+    backend: 'bevel' writes a beveled curve object, 'curves' writes a hair curves object that cycles ray traces directly
+    loopColors: (optional) |L|x4 array of per loop colors, in the order of boundaryLoops(mesh)
 
-    halfE = np.concatenate((F[:,[0,1]],F[:,[1,2]],F[:,[2,0]]), axis = 0)
-    halfE = np.sort(halfE)
-    E, counts = np.unique(halfE, return_counts=True, axis = 0)
-    bEIdx = np.where(counts == 1)[0]
-    bE = E[bEIdx,:]
+    Outputs
+    bdObj: the blender object of the boundary. The loop lengths are stored in its "length" curve attribute ('curves' backend)
+    """
+    P, offsets, lengths = boundaryLoops(mesh, mesh.matrix_local)
+    nL = offsets.shape[0] - 1
+    if loopColors is not None:
+        loopColors = np.asarray(loopColors, dtype = float)
+        if loopColors.shape[0] != nL:
+            raise ValueError('Error in "drawBoundaryLoop": loopColors must have one row per boundary loop')
 
-    # Create bmesh 
-    bdMesh = bpy.data.meshes.new('boundary') 
-    bdObj = bpy.data.objects.new('objBoundary', bdMesh) 
-    bpy.context.scene.collection.objects.link(bdObj)
-    bm = bmesh.new()  
-    bm.from_mesh(bdMesh) 
-
-    unibE, idx = np.unique(bE,  return_inverse=True)
-    bE_new = np.reshape(idx, (int(len(idx.flatten())/2), 2)) # credit to Sidhanth Holalkere (sholalkere) for pointing out the fix!
-
-    # add vertices
-    VList =  []
-    for ii  in range(len(unibE)):
-        v = bm.verts.new( V[unibE[ii],:] )
-        VList.append(v)
-    
-    # addedges
-    for ii in range(bE_new.shape[0]):
-        v1 = VList[bE_new[ii,0]]
-        v2 = VList[bE_new[ii,1]]
-        bm.edges.new((v1, v2))
-    
-    # update bmesh
-    bm.to_mesh(bdMesh)
-    bm.free()
-
-    # bevel with a circle
-    bpy.ops.object.select_all(action='DESELECT')
-    bpy.context.view_layer.objects.active = bdObj
-    bdObj.select_set(state=True)
-    bpy.ops.object.convert(target='CURVE')
-    bpy.ops.curve.primitive_bezier_circle_add(radius=r, location=(1e5, 1e5, 1e5))
-    circ = bpy.context.object
-    bdObj.data.bevel_object = circ
-    bpy.ops.object.shade_smooth()
-
-    # # subdivision
-    level = subdivision
-    bpy.context.view_layer.objects.active = bdObj
-    bpy.ops.object.modifier_add(type='SUBSURF')
-    bdObj.modifiers["Subdivision"].render_levels = level
-    bdObj.modifiers["Subdivision"].levels = level 
-    bdObj.data.bevel_depth = r
+    if backend == 'curves':
+        bdObj = drawCurves(P, offsets, r)
+        setAttribute(bdObj.data, 'length', lengths, type = 'FLOAT', domain = 'CURVE')
+        if loopColors is not None:
+            setAttribute(bdObj.data, 'Col', loopColors, type = 'FLOAT_COLOR', domain = 'CURVE')
+        colors = [bdColor]
+    else:
+        curve = bpy.data.curves.new('boundary', type = 'CURVE')
+        curve.dimensions = '3D'
+        curve.bevel_depth = r
+        curve.bevel_resolution = 4
+        if loopColors is not None:
+            colorIdx = np.unique(loopColors, axis = 0, return_inverse = True)[1].reshape(-1)
+        for l in range(nL):
+            Q = P[offsets[l]:offsets[l+1]]
+            closed = Q.shape[0] > 2 and np.array_equal(Q[0], Q[-1])
+            if closed:
+                Q = Q[:-1]
+            spline = curve.splines.new('NURBS' if subdivision > 0 else 'POLY')
+            spline.points.add(Q.shape[0] - 1)
+            spline.points.foreach_set('co', np.concatenate((Q, np.ones((Q.shape[0], 1))), axis = 1).ravel())
+            spline.use_cyclic_u = closed
+            spline.use_smooth = True
+            if subdivision > 0:
+                spline.order_u = min(3, Q.shape[0])
+                spline.use_endpoint_u = not closed
+                spline.resolution_u = 2 ** subdivision
+            if loopColors is not None:
+                spline.material_index = colorIdx[l]
+        bdObj = bpy.data.objects.new('objBoundary', curve)
+        bpy.context.scene.collection.objects.link(bdObj)
+        # legacy curves have no attributes, so every distinct loop color gets a material
+        colors = [bdColor] if loopColors is None else [colorObj(c, bdColor.H, bdColor.S, bdColor.V, bdColor.B, bdColor.C) for c in np.unique(loopColors, axis = 0)]
 
     # add material
-    mat = bpy.data.materials.new('MeshMaterial')
-    bdObj.data.materials.append(mat)
-    bdObj.active_material = mat
-    mat.use_nodes = True
-    tree = mat.node_tree
+    for color in colors:
+        mat = bpy.data.materials.new('MeshMaterial')
+        bdObj.data.materials.append(mat)
+        mat.use_nodes = True
+        tree = mat.node_tree
 
-    # init color node
-    BCNode = initColorNode(tree, bdColor)
+        # init color node
+        BCNode = initColorNode(tree, color)
+        if backend == 'curves' and loopColors is not None:
+            ATTR = tree.nodes.new('ShaderNodeAttribute')
+            ATTR.attribute_name = 'Col'
+            ATTR.location.x -= 600
+            HSVNode = BCNode.inputs['Color'].links[0].from_node
+            tree.links.new(ATTR.outputs['Color'], HSVNode.inputs['Color'])
 
-    # set principled BSDF
-    tree.nodes["Principled BSDF"].inputs['Roughness'].default_value = 0.7
-    # tree.nodes["Principled BSDF"].inputs['Sheen Tint'].default_value = 0
-    tree.links.new(BCNode.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
+        # set principled BSDF
+        tree.nodes["Principled BSDF"].inputs['Roughness'].default_value = 0.7
+        # tree.nodes["Principled BSDF"].inputs['Sheen Tint'].default_value = 0
+        tree.links.new(BCNode.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
+    bdObj.active_material_index = 0
 
-    return bdObj
\ No newline at end of file
+    return bdObj
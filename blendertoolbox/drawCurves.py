@@ -0,0 +1,79 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+from . colorObj import colorObj
+from . setAttribute import setAttribute
+from . setMat_VColor import setMat_VColor
+
+CURVE_TYPE_POLY = 1
+
+def drawCurves(P, offsets = None, r = 0.01, colorList = None, cyclic = False):
+    """
+    this function writes polylines into a single hair curves object. Cycles ray traces the curves directly with their per point radius, so no tube geometry is generated.
+
+    Inputs
+    P: |P|x3 array of polyline points (all polylines concatenated), or a list of |Pc|x3 arrays (one per polyline) if offsets is None
+    offsets: |C|+1 array, polyline c owns points P[offsets[c]:offsets[c+1]]
+    r: radius of the curves, either a scalar or a |P| array
+    colorList: (optional) |C|x4 (or |C|x3) array of per polyline colors, or a |P|x4 (|P|x3) array of per point colors
+    cyclic: if True, every polyline is drawn as a closed loop
+
+    Outputs
+    curves_obj: the blender object of all curves
+    """
+    if offsets is None:
+        sizes = [len(p) for p in P]
+        P = np.concatenate([np.asarray(p, dtype = float).reshape(-1, 3) for p in P])
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    offsets = np.asarray(offsets, dtype = np.int64)
+    nP = P.shape[0]
+    nC = offsets.shape[0] - 1
+    r = np.broadcast_to(np.asarray(r, dtype = float), (nP,))
+    pointColors = None
+    if colorList is not None:
+        colorList = np.asarray(colorList, dtype = float)
+        if colorList.shape[0] == nP and nP != nC:
+            pointColors = colorList
+
+    if cyclic:
+        # cycles does not close hair curves, so repeat the first point of every loop
+        starts = offsets[:-1]
+        insertAt = offsets[1:]
+        P = np.insert(P, insertAt, P[starts], axis = 0)
+        r = np.insert(r, insertAt, r[starts])
+        if pointColors is not None:
+            pointColors = np.insert(pointColors, insertAt, pointColors[starts], axis = 0)
+        offsets = offsets + np.arange(nC + 1)
+        nP = P.shape[0]
+    sizes = offsets[1:] - offsets[:-1]
+
+    curves = bpy.data.hair_curves.new('curves')
+    curves.add_curves(sizes.tolist())
+    setAttribute(curves, 'position', P, type = 'FLOAT_VECTOR', domain = 'POINT')
+    setAttribute(curves, 'radius', r, type = 'FLOAT', domain = 'POINT')
+    setAttribute(curves, 'curve_type', np.full(nC, CURVE_TYPE_POLY), type = 'INT8', domain = 'CURVE')
+    curves_obj = bpy.data.objects.new('curves', curves)
+    bpy.context.scene.collection.objects.link(curves_obj)
+    # render the curves as round tubes rather than camera facing ribbons
+    bpy.context.scene.cycles_curves.shape = 'THICK'
+
+    if colorList is not None:
+        if pointColors is not None:
+            setAttribute(curves, 'Col', pointColors, type = 'FLOAT_COLOR', domain = 'POINT')
+        else:
+            setAttribute(curves, 'Col', colorList, type = 'FLOAT_COLOR', domain = 'CURVE')
+        setMat_VColor(curves_obj, colorObj((1,1,1,1), 0.5, 1.0, 1.0, 0.0, 0.0))
+    return curves_obj
@@ -12,45 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
-import math
 import numpy as np
+from . meshArrays import vertexArray
+from . numpyMesh import numpyMesh
+from . tubeMesh import segmentTubes
 
-def drawEdgeSubset(mesh, E, r, edgeColor):
-    bpy.ops.mesh.primitive_cylinder_add(radius = r, location = (1e10,1e10,1e10))
-    cylinder = bpy.context.object
+def drawEdgeSubset(mesh, E, r, edgeColor, numSides = 16):
+    """
+    this function draws a subset of mesh edges as tubes of a single mesh object
 
-    mat = bpy.data.materials.new('MeshMaterial')
-    cylinder.data.materials.append(mat)
-    cylinder.active_material = mat
-    mat.diffuse_color = edgeColor
-
-    for ii in range(E.shape[0]): 
-        p1Idx = E[ii,0]
-        p2Idx = E[ii,1]
-        p1 = mesh.matrix_world @ mesh.data.vertices[p1Idx].co
-        p2 = mesh.matrix_world @ mesh.data.vertices[p2Idx].co
-        x1 = p1[0]
-        y1 = p1[1]
-        z1 = p1[2]
-        x2 = p2[0]
-        y2 = p2[1]
-        z2 = p2[2]
-        dx = x2 - x1
-        dy = y2 - y1
-        dz = z2 - z1    
-        dist = math.sqrt(dx**2 + dy**2 + dz**2) 
+    Inputs
+    mesh: bpy.object of the mesh
+    E: |E|x2 array of vertex indices of the edges
+    r: size of the tubes (the tube radius is r/2, as the diameter used to be set to r)
+    edgeColor: RGBA tuple of the edges
+    numSides: number of vertices around each tube
 
-        # cylinder.duplicate
-        # bpy.context.selected_objects.clear()
-        # cylinder.select_set(True)
-        bpy.ops.object.duplicate( linked=True)  # annoying I can't specify object i want to apply this to in here
+    Outputs
+    edge_obj: the blender object of all the edges
+    """
+    E = np.asarray(E, dtype = np.int64).reshape(-1, 2)
+    V = vertexArray(mesh, mesh.matrix_world)
+    Vt, F, faceSizes, _ = segmentTubes(V[E[:,0]], V[E[:,1]], 0.5 * r, numSides)
 
-        # bpy.context.selected_objects.clear()
-        objCopy = bpy.context.active_object
+    edge_obj = bpy.data.objects.new('edge subset', numpyMesh(Vt, F, name = 'edge subset', faceSizes = faceSizes))
+    bpy.context.scene.collection.objects.link(edge_obj)
 
-        objCopy.dimensions = (r,r,dist)
-        objCopy.location = (dx/2 + x1, dy/2 + y1, dz/2 + z1)
-        phi = math.atan2(dy, dx) 
-        theta = math.acos(dz/dist) 
-        bpy.context.object.rotation_euler[1] = theta 
-        bpy.context.object.rotation_euler[2] = phi 
\ No newline at end of file
+    mat = bpy.data.materials.new('MeshMaterial')
+    edge_obj.data.materials.append(mat)
+    edge_obj.active_material = mat
+    mat.diffuse_color = edgeColor
+    return edge_obj
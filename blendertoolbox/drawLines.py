@@ -12,35 +12,71 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
-import math
 import numpy as np
+from . colorObj import colorObj
+from . drawCurves import drawCurves
+from . numpyMesh import numpyMesh
+from . setAttribute import setAttribute
+from . setMat_VColor import setMat_VColor
+from . tubeMesh import segmentTubes, polylineTubes
 
-def drawLines(p1List, p2List, r, colorList = None):
-    for ii in range(p1List.shape[0]): 
-        p1 = p1List[ii,:]
-        p2 = p2List[ii,:]
-        x1 = p1[0]
-        y1 = p1[1]
-        z1 = p1[2]
-        x2 = p2[0]
-        y2 = p2[1]
-        z2 = p2[2]
-        dx = x2 - x1
-        dy = y2 - y1
-        dz = z2 - z1    
-        dist = math.sqrt(dx**2 + dy**2 + dz**2)
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius = r, 
-            depth = dist,
-            location = (dx/2 + x1, dy/2 + y1, dz/2 + z1)   
-        ) 
-        phi = math.atan2(dy, dx) 
-        theta = math.acos(dz/dist) 
-        bpy.context.object.rotation_euler[1] = theta 
-        bpy.context.object.rotation_euler[2] = phi 
+def drawLines(p1List, p2List, r, colorList = None, numSides = 16, joinSegments = False, backend = 'mesh'):
+    """
+    this function draws all the segments as tubes of a single mesh object
 
-        if colorList is not None:
-            mat = bpy.data.materials.new('MeshMaterial')
-            bpy.context.object.data.materials.append(mat)
-            bpy.context.object.active_material = mat
-            mat.diffuse_color = colorList[ii,:]
\ No newline at end of file
+    Inputs
+    p1List: |E|x3 array of segment start points
+    p2List: |E|x3 array of segment end points
+    r: radius of the tubes
+    colorList: (optional) |E|x4 (or |E|x3) array of per segment colors
+    numSides: number of vertices around each tube
+    joinSegments: if True, consecutive segments that share an end point (p2List[i] == p1List[i+1]) are joined into one polyline tube with shared rings at the joints
+    backend: 'mesh' builds tube geometry, 'curves' writes the segments into a hair curves object that cycles renders without tessellation
+
+    Outputs
+    lines_obj: the blender object of all tubes
+    """
+    p1List = np.asarray(p1List, dtype = float).reshape(-1, 3)
+    p2List = np.asarray(p2List, dtype = float).reshape(-1, 3)
+    nE = p1List.shape[0]
+
+    if joinSegments:
+        # break runs wherever a segment does not start at the end of the previous one
+        runStart = np.ones(nE, dtype = bool)
+        runStart[1:] = np.any(p1List[1:] != p2List[:-1], axis = 1)
+        runIdx = np.cumsum(runStart) - 1
+        nRuns = runIdx[-1] + 1 if nE > 0 else 0
+        # every run has one point more than segments: its first p1 followed by all p2
+        P = np.zeros((nE + nRuns, 3))
+        pointIdx = np.arange(nE) + runIdx + 1
+        P[pointIdx] = p2List
+        P[np.flatnonzero(runStart) + np.arange(nRuns)] = p1List[runStart]
+        offsets = np.append(np.flatnonzero(runStart) + np.arange(nRuns), nE + nRuns)
+        if backend == 'curves':
+            if colorList is not None:
+                # color every point with the segment it starts, the last point of a run with its last segment
+                colorList = np.asarray(colorList, dtype = float)
+                pointSegment = np.zeros(nE + nRuns, dtype = int)
+                pointSegment[pointIdx] = np.arange(1, nE + 1)
+                pointSegment[offsets[:-1]] = np.flatnonzero(runStart)
+                pointSegment[offsets[1:] - 1] -= 1
+                colorList = colorList[pointSegment]
+            return drawCurves(P, offsets, r, colorList)
+        # polylineTubes numbers segments polyline by polyline, which is the input order here
+        V, F, faceSizes, faceSegment = polylineTubes(P, offsets, r, numSides)
+    elif backend == 'curves':
+        P = np.stack((p1List, p2List), axis = 1).reshape(-1, 3)
+        return drawCurves(P, np.arange(nE + 1) * 2, r, colorList)
+    else:
+        V, F, faceSizes, faceSegment = segmentTubes(p1List, p2List, r, numSides)
+
+    mesh = numpyMesh(V, F, name = 'lines', faceSizes = faceSizes)
+    lines_obj = bpy.data.objects.new('lines', mesh)
+    bpy.context.scene.collection.objects.link(lines_obj)
+
+    if colorList is not None:
+        # one shared material reading the per segment colors from a face attribute
+        colorList = np.asarray(colorList, dtype = float)
+        setAttribute(mesh, 'Col', colorList[faceSegment], type = 'FLOAT_COLOR', domain = 'FACE')
+        setMat_VColor(lines_obj, colorObj((1,1,1,1), 0.5, 1.0, 1.0, 0.0, 0.0))
+    return lines_obj
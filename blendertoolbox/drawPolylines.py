@@ -0,0 +1,52 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+from . colorObj import colorObj
+from . numpyMesh import numpyMesh
+from . setAttribute import setAttribute
+from . setMat_VColor import setMat_VColor
+from . tubeMesh import polylineTubes
+
+def drawPolylines(P, offsets, r, colorList = None, numSides = 16, cyclic = False):
+    """
+    this function draws polylines as smooth tubes (rotation minimizing frames, shared rings at the joints) of a single mesh object
+
+    Inputs
+    P: |P|x3 array of polyline points (all polylines concatenated)
+    offsets: |C|+1 array, polyline c owns points P[offsets[c]:offsets[c+1]]
+    r: radius of the tubes, either a scalar or a |P| array
+    colorList: (optional) |C|x4 (or |C|x3) array of per polyline colors
+    numSides: number of vertices around each tube
+    cyclic: if True, every polyline is drawn as a closed loop
+
+    Outputs
+    lines_obj: the blender object of all tubes
+    """
+    offsets = np.asarray(offsets, dtype = np.int64)
+    V, F, faceSizes, faceSegment = polylineTubes(P, offsets, r, numSides, cyclic)
+
+    mesh = numpyMesh(V, F, name = 'polylines', faceSizes = faceSizes)
+    lines_obj = bpy.data.objects.new('polylines', mesh)
+    bpy.context.scene.collection.objects.link(lines_obj)
+
+    if colorList is not None:
+        # map segments back to their polyline
+        lengths = offsets[1:] - offsets[:-1]
+        numSegments = lengths if cyclic else lengths - 1
+        segmentCurve = np.repeat(np.arange(lengths.shape[0]), numSegments)
+        colorList = np.asarray(colorList, dtype = float)
+        setAttribute(mesh, 'Col', colorList[segmentCurve[faceSegment]], type = 'FLOAT_COLOR', domain = 'FACE')
+        setMat_VColor(lines_obj, colorObj((1,1,1,1), 0.5, 1.0, 1.0, 0.0, 0.0))
+    return lines_obj
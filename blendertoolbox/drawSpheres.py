@@ -0,0 +1,73 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+from . initColorNode import initColorNode
+from . numpyMesh import numpyMesh
+from . setAttribute import setAttribute
+from . instanceOnPoints import instanceOnPoints
+from . instanceTemplates import templateObject, sphereMesh, icosphereMesh, lodTemplates, lodIndex
+
+def drawSpheres(centers, radii, ptColor, colors = None, cam = None, lodThresholds = (2, 8, 32)):
+    """
+    this function draws many spheres as instances of one shared sphere: one point mesh with a radius attribute and one geometry nodes modifier
+
+    Inputs
+    centers: |P|x3 array of sphere centers
+    radii: scalar or |P| array of sphere radii
+    ptColor: colorObj of the spheres (with colors, only its H/S/V/B/C adjustments are used)
+    colors: (optional) |P|x4 (or |P|x3) array of per sphere colors
+    cam: (optional) bpy.object of the render camera. If given, every sphere is instanced from an icosphere (level 1 to 4) picked by its projected radius in pixels
+    lodThresholds: projected radii (in pixels) where the next icosphere level starts
+
+    Outputs
+    spheres_obj: the blender object holding all the spheres
+    """
+    centers = np.asarray(centers, dtype = float).reshape(-1, 3)
+    nP = centers.shape[0]
+    radii = np.broadcast_to(np.asarray(radii, dtype = float), (nP,))
+
+    mesh = numpyMesh(centers, [], name = 'spheres')
+    setAttribute(mesh, 'radius', radii, type = 'FLOAT', domain = 'POINT')
+    if colors is not None:
+        setAttribute(mesh, 'Col', colors, type = 'FLOAT_COLOR', domain = 'POINT')
+    spheres_obj = bpy.data.objects.new('spheres', mesh)
+    bpy.context.scene.collection.objects.link(spheres_obj)
+
+    # one material for all the spheres
+    mat = bpy.data.materials.new('sphere_mat')
+    mat.use_nodes = True
+    tree = mat.node_tree
+    BCNode = initColorNode(tree, ptColor)
+    if colors is not None:
+        # point attributes are passed on to the instances and read through the instancer
+        ATTR = tree.nodes.new('ShaderNodeAttribute')
+        ATTR.attribute_type = 'INSTANCER'
+        ATTR.attribute_name = 'Col'
+        ATTR.location.x -= 600
+        HSVNode = BCNode.inputs['Color'].links[0].from_node
+        tree.links.new(ATTR.outputs['Color'], HSVNode.inputs['Color'])
+    tree.nodes["Principled BSDF"].inputs['Roughness'].default_value = 1.0
+    tree.nodes["Principled BSDF"].inputs['Sheen Tint'].default_value = [0, 0, 0, 1]
+    tree.links.new(BCNode.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
+
+    if cam is None:
+        template = templateObject(sphereMesh(), 'sphere template', mat)
+        instanceOnPoints(spheres_obj, template, scale = 'radius')
+    else:
+        levels = [icosphereMesh(level) for level in range(1, len(lodThresholds) + 2)]
+        templates = lodTemplates(levels, 'sphere template', mat)
+        setAttribute(mesh, 'lod', lodIndex(cam, centers, radii, lodThresholds), type = 'INT', domain = 'POINT')
+        instanceOnPoints(spheres_obj, templates, scale = 'radius', pickInstance = 'lod')
+    return spheres_obj
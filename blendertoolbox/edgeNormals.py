@@ -11,71 +11,58 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import bpy 
-import math
+import bpy
+import numpy as np
+from . meshArrays import vertexArray, faceArray
+from . meshNormals import faceNormals, setShading
 
 def edgeNormals(mesh, angle = 10):
-    # this fix to handle blender > 4.1 is copied from 
-    # https://blender.stackexchange.com/questions/316696/attributeerror-mesh-object-has-no-attribute-use-auto-smooth
-    bpy.context.view_layer.objects.active = mesh
-    bpy.ops.object.shade_smooth()
-    do_auto_smooth(bpy.context.object, angle)
-    
-def get_object_override(active_object, objects: list = None):
-
-    if objects is None:
-        objects = []
-    else:
-        objects = list(objects)
-
-    if not active_object in objects:
-        objects.append(active_object)
-
-    assert all(isinstance(object, bpy.types.Object) for object in objects)
-
-    return dict(
-        selectable_objects = objects,
-        selected_objects = objects,
-        selected_editable_objects = objects,
-        editable_objects = objects,
-        visible_objects = objects,
-        active_object = active_object,
-        object = active_object,
-    )
-
-
-def has_smooth_by_angle(object: bpy.types.Object):
-    for modifier in object.modifiers:
-
-        if modifier.type != 'NODES':
-            continue
-
-        if modifier.node_group and 'Smooth by Angle' in modifier.node_group.name:
-            return True
-
-    return False
-
-
-def do_auto_smooth(object: bpy.types.Object, angle = 30):
-    try:
-        object.data.use_auto_smooth=True
-    except AttributeError:
-
-        # may just use shade_smooth_by_angle but it modifies the mesh and goes against the new non-destructive auto-smooth idea
-
-        if not hasattr(object, 'modifiers'):
-            return
-
-        if has_smooth_by_angle(object):
-            return
-
-        with bpy.context.temp_override(**get_object_override(object)):
-            result = bpy.ops.object.modifier_add_node_group(asset_library_type='ESSENTIALS', asset_library_identifier="", relative_asset_identifier="geometry_nodes\\smooth_by_angle.blend\\NodeTree\\Smooth by Angle")
-            if 'CANCELLED' in result:
-                return
-
-            modifier = object.modifiers[-1]
-            modifier["Socket_1"] = True
-            modifier["Input_1"] = math.radians(angle)
-            object.update_tag()
-
+    """
+    this function shades a mesh smooth except across the edges whose dihedral angle is larger than "angle" (in degrees), which are marked sharp. This matches auto smooth (or "Smooth by Angle" in blender 4.1+) without any modifier or operator call: the face normals and dihedral angles are computed in numpy and the sharp edges and smooth flags are written in bulk.
+
+    Inputs
+    mesh: bpy.object of the mesh
+    angle: largest dihedral angle (in degrees) that is still shaded smooth
+    """
+    V = vertexArray(mesh)
+    corners, faceSizes = faceArray(mesh)
+    cornerEdges = np.zeros(corners.shape[0], dtype = np.int32)
+    mesh.data.loops.foreach_get('edge_index', cornerEdges)
+    sharp = sharpEdges(V, corners, faceSizes, cornerEdges, len(mesh.data.edges), angle)
+    mesh.data.edges.foreach_set('use_edge_sharp', sharp) # the "sharp_edge" attribute in blender 4.x
+    if hasattr(mesh.data, 'use_auto_smooth'): # before blender 4.1 sharp edges only split the normals with auto smooth
+        mesh.data.use_auto_smooth = True
+        mesh.data.auto_smooth_angle = np.pi
+    setShading(mesh, True)
+
+def sharpEdges(V, corners, faceSizes, cornerEdges, numEdges, angle):
+    """
+    returns for every edge whether it is sharp: its two faces meet at a dihedral angle larger than "angle" (in degrees) or have opposite windings, or it is used by more than two faces. Boundary edges are not sharp.
+
+    Inputs
+    V: |V|x3 array of vertex locations
+    corners: flat array of face corner vertex indices
+    faceSizes: |F| array of the number of corners of each face
+    cornerEdges: edge index of every face corner (the edge from the corner to the next one)
+    numEdges: number of edges
+    angle: dihedral angle threshold in degrees
+    """
+    corners = np.asarray(corners, dtype = np.int64).ravel()
+    faceSizes = np.asarray(faceSizes, dtype = np.int64).ravel()
+    cornerEdges = np.asarray(cornerEdges, dtype = np.int64).ravel()
+    FN, _ = faceNormals(V, corners, faceSizes)
+    face = np.repeat(np.arange(faceSizes.shape[0]), faceSizes)
+    count = np.bincount(cornerEdges, minlength = numEdges)
+
+    # the two corners of every manifold edge
+    order = np.argsort(cornerEdges, kind = 'stable')
+    first = np.cumsum(count) - count
+    manifold = np.flatnonzero(count == 2)
+    c0, c1 = order[first[manifold]], order[first[manifold] + 1]
+    cosine = np.sum(FN[face[c0]] * FN[face[c1]], axis = 1)
+    # consistently oriented faces traverse their shared edge in opposite directions
+    sameDirection = corners[c0] == corners[c1]
+
+    sharp = count > 2
+    sharp[manifold] = (cosine < np.cos(np.radians(angle))) | sameDirection
+    return sharp
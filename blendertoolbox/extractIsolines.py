@@ -0,0 +1,108 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from . meshArrays import vertexArray, triangleArray
+from . simplifyLines import chainSegmentIndices
+from . drawPolylines import drawPolylines
+from . drawCurves import drawCurves
+
+def isolineSegments(V, T, scalars, levels):
+    """
+    this function runs marching triangles for all triangles and all levels at once. Only the (triangle, level) pairs whose level lies within the range of the triangle are visited. Every crossed mesh edge gives one point per level, shared by the triangles on both sides, so the segments can be chained into polylines.
+
+    Inputs
+    V: |V|x3 array of vertex locations
+    T: |T|x3 array of triangle indices
+    scalars: |V| array of per vertex values
+    levels: sorted array of iso values
+
+    Outputs
+    points: |P|x3 array of the points where the isolines cross the mesh edges
+    pointLevel: |P| array of the level index of every point
+    E: |E|x2 array of point indices of every segment
+    """
+    V = np.asarray(V, dtype = float).reshape(-1, 3)
+    T = np.asarray(T, dtype = np.int64).reshape(-1, 3)
+    s = np.asarray(scalars, dtype = float).ravel()
+    levels = np.asarray(levels, dtype = float).ravel()
+    nV = V.shape[0]
+
+    # (triangle, level) pairs with min < level <= max, a vertex with value == level counts as above it
+    S = s[T]
+    first = np.searchsorted(levels, S.min(axis = 1), side = 'right')
+    last = np.searchsorted(levels, S.max(axis = 1), side = 'right')
+    count = last - first
+    tri = np.repeat(np.arange(T.shape[0]), count)
+    level = np.arange(tri.shape[0]) - np.repeat(np.cumsum(count) - count, count) + np.repeat(first, count)
+    if tri.shape[0] == 0:
+        return np.zeros((0,3)), np.zeros(0, dtype = np.int64), np.zeros((0,2), dtype = np.int64)
+
+    # the two triangle edges (c, c+1) whose ends lie on different sides of the level
+    above = S[tri] >= levels[level][:,None]
+    crossing = above != above[:,[1,2,0]]
+    side = np.argsort(~crossing, axis = 1, kind = 'stable')[:,:2]
+    a = np.take_along_axis(T[tri], side, axis = 1)
+    b = np.take_along_axis(T[tri], (side + 1) % 3, axis = 1)
+
+    # one point per (level, mesh edge)
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    key = (level[:,None] * nV + lo) * nV + hi
+    uniqueKey, E = np.unique(key, return_inverse = True)
+    E = E.reshape(-1, 2)
+    pointLevel = uniqueKey // (nV * nV)
+    lo, hi = (uniqueKey // nV) % nV, uniqueKey % nV
+    t = (levels[pointLevel] - s[lo]) / (s[hi] - s[lo])
+    points = V[lo] + t[:,None] * (V[hi] - V[lo])
+    return points, pointLevel, E
+
+def extractIsolines(mesh, scalars, levels, r = None, colorList = None, backend = 'tubes'):
+    """
+    this function draws the isolines of a per vertex scalar field as geometry of constant width (instead of the texture trick with vertexScalarToUV, whose line width varies with the gradient). The isolines of all levels are extracted at once by marching triangles, chained into polylines and drawn as a single object.
+
+    Inputs
+    mesh: bpy.object of the mesh
+    scalars: |V| array of per vertex values
+    levels: number of evenly spaced levels strictly inside the range of the scalars, or an array of iso values
+    r: (optional) radius of the lines, default 0.2% of the bounding box diagonal
+    colorList: (optional) |L|x4 array of per level colors
+    backend: 'tubes' draws tube meshes (drawPolylines), 'curves' hair curves that cycles ray traces directly (drawCurves)
+
+    Outputs
+    isoline_obj: the blender object of all isolines
+    """
+    scalars = np.asarray(scalars, dtype = float).ravel()
+    if np.ndim(levels) == 0:
+        lo, hi = scalars.min(), scalars.max()
+        levels = lo + (hi - lo) * np.arange(1, int(levels) + 1) / (int(levels) + 1)
+    levels = np.asarray(levels, dtype = float).ravel()
+    order = np.argsort(levels)
+
+    V = vertexArray(mesh, mesh.matrix_world)
+    if scalars.shape[0] != V.shape[0]:
+        raise ValueError('Error in "extractIsolines": there must be one scalar per vertex')
+    T, _ = triangleArray(mesh)
+    points, pointLevel, E = isolineSegments(V, T, scalars, levels[order])
+    chainPoints, offsets = chainSegmentIndices(E, points.shape[0])
+    P = points[chainPoints]
+    if r is None:
+        r = 0.002 * np.linalg.norm(V.max(axis = 0) - V.min(axis = 0))
+    if colorList is not None:
+        colorList = np.asarray(colorList, dtype = float)[order][pointLevel[chainPoints[offsets[:-1]]]]
+
+    if backend == 'curves':
+        return drawCurves(P, offsets, r, colorList)
+    elif backend == 'tubes':
+        return drawPolylines(P, offsets, r, colorList)
+    else:
+        raise ValueError('Error in "extractIsolines": backend must be "tubes" or "curves"')
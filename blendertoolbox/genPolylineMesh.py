@@ -15,57 +15,69 @@ import bpy
 import bmesh
 import numpy as np
 from . initColorNode import initColorNode
+from . meshArrays import vertexArray
+from . drawCurves import drawCurves
 
-def genPolylineMesh(mesh, v_list, r, bdColor):
-    nV = len(mesh.data.vertices)
-    V = np.zeros((nV, 3), dtype = float)
-    for ii in range(nV):
-        V[ii,:] = mesh.matrix_local.to_3x3() @ mesh.data.vertices[int(ii)].co
-        V[ii,0] += mesh.matrix_local[0][3]
-        V[ii,1] += mesh.matrix_local[1][3]
-        V[ii,2] += mesh.matrix_local[2][3]
+def genPolylineMesh(mesh, v_list, r, bdColor, backend = 'bevel'):
+    """
+    draw the polyline through the vertices v_list of a mesh
 
-    # create a mesh
-    bdMesh = bpy.data.meshes.new('boundary') 
-    bdObj = bpy.data.objects.new('objBoundary', bdMesh) 
-    bpy.context.scene.collection.objects.link(bdObj)
-    bm = bmesh.new()  
-    bm.from_mesh(bdMesh) 
+    Inputs
+    mesh: bpy.object of the mesh
+    v_list: list of vertex indices of the polyline
+    r: radius of the polyline
+    bdColor: colorObj of the polyline
+    backend: 'bevel' converts an edge mesh to a beveled curve with a subdivision modifier, 'curves' writes a single hair curve that cycles ray traces directly
 
-    # add vertices
-    VList =  []
-    for ii in range(len(v_list)):
-        v = bm.verts.new( V[v_list[ii],:] )
-        VList.append(v)
+    Outputs
+    bdObj: the blender object of the polyline
+    """
+    V = vertexArray(mesh, mesh.matrix_local)
+
+    if backend == 'curves':
+        bdObj = drawCurves(V[np.asarray(v_list)], np.array([0, len(v_list)]), r)
+    else:
+        # create a mesh
+        bdMesh = bpy.data.meshes.new('boundary') 
+        bdObj = bpy.data.objects.new('objBoundary', bdMesh) 
+        bpy.context.scene.collection.objects.link(bdObj)
+        bm = bmesh.new()  
+        bm.from_mesh(bdMesh) 
+
+        # add vertices
+        VList =  []
+        for ii in range(len(v_list)):
+            v = bm.verts.new( V[v_list[ii],:] )
+            VList.append(v)
     
-    # addedges
-    for ii in range(len(v_list)-1):
-        v1 = VList[ii]
-        v2 = VList[ii+1]
-        bm.edges.new((v1, v2))
+        # addedges
+        for ii in range(len(v_list)-1):
+            v1 = VList[ii]
+            v2 = VList[ii+1]
+            bm.edges.new((v1, v2))
 
 
-    # update bmesh
-    bm.to_mesh(bdMesh)
-    bm.free()
+        # update bmesh
+        bm.to_mesh(bdMesh)
+        bm.free()
 
-    # bevel with a circle
-    bpy.ops.object.select_all(action='DESELECT')
-    bpy.context.view_layer.objects.active = bdObj
-    bdObj.select_set(state=True)
-    bpy.ops.object.convert(target='CURVE')
-    bpy.ops.curve.primitive_bezier_circle_add(radius=r, location=(1e5, 1e5, 1e5))
-    circ = bpy.context.object
-    bdObj.data.bevel_object = circ
-    bpy.ops.object.shade_smooth()
+        # bevel with a circle
+        bpy.ops.object.select_all(action='DESELECT')
+        bpy.context.view_layer.objects.active = bdObj
+        bdObj.select_set(state=True)
+        bpy.ops.object.convert(target='CURVE')
+        bpy.ops.curve.primitive_bezier_circle_add(radius=r, location=(1e5, 1e5, 1e5))
+        circ = bpy.context.object
+        bdObj.data.bevel_object = circ
+        bpy.ops.object.shade_smooth()
 
-    # # subdivision
-    level = 2
-    bpy.context.view_layer.objects.active = bdObj
-    bpy.ops.object.modifier_add(type='SUBSURF')
-    bdObj.modifiers["Subdivision"].render_levels = level
-    bdObj.modifiers["Subdivision"].levels = level 
-    bdObj.data.bevel_depth = r
+        # # subdivision
+        level = 2
+        bpy.context.view_layer.objects.active = bdObj
+        bpy.ops.object.modifier_add(type='SUBSURF')
+        bdObj.modifiers["Subdivision"].render_levels = level
+        bdObj.modifiers["Subdivision"].levels = level 
+        bdObj.data.bevel_depth = r
 
     # add material
     mat = bpy.data.materials.new('MeshMaterial')
@@ -81,3 +93,5 @@ def genPolylineMesh(mesh, v_list, r, bdColor):
     tree.nodes["Principled BSDF"].inputs['Roughness'].default_value = 0.7
     tree.nodes["Principled BSDF"].inputs['Sheen Tint'].default_value = 0
     tree.links.new(BCNode.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
+
+    return bdObj
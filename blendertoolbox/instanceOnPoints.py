@@ -0,0 +1,73 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+
+def instanceOnPoints(points_obj, instance, scale = None, rotation = None, pickInstance = None):
+    """
+    this function adds a geometry nodes modifier that puts one instance of a template on every vertex of points_obj. The instances are never realized, so cycles only stores the template once.
+
+    Inputs
+    points_obj: bpy.object of a (vertex only) mesh
+    instance: bpy.object (or bpy.collection) used as the template
+    scale: (optional) name of a FLOAT (uniform) or FLOAT_VECTOR point attribute used as per instance scale
+    rotation: (optional) name of a FLOAT_VECTOR point attribute of per instance euler angles (radians)
+    pickInstance: (optional) name of an INT point attribute choosing one child of the instance collection per point
+
+    Outputs
+    MOD: the geometry nodes modifier
+    """
+    MOD = points_obj.modifiers.new("GeometryNode", type="NODES")
+    group = bpy.data.node_groups.new("InstanceOnPoints", "GeometryNodeTree")
+    group.interface.new_socket(name='Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+    group.interface.new_socket(name='Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    MOD.node_group = group
+
+    IN = group.nodes.new('NodeGroupInput')
+    OUT = group.nodes.new('NodeGroupOutput')
+    OUT.is_active_output = True
+    IN.location.x = -600
+    OUT.location.x = 200
+
+    IN2PTS = group.nodes.new(type='GeometryNodeInstanceOnPoints')
+    group.links.new(IN.outputs[0], IN2PTS.inputs['Points'])
+    group.links.new(IN2PTS.outputs['Instances'], OUT.inputs[0])
+
+    if isinstance(instance, bpy.types.Collection):
+        INFO = group.nodes.new("GeometryNodeCollectionInfo")
+        INFO.inputs['Collection'].default_value = instance
+        INFO.inputs['Separate Children'].default_value = True
+        INFO.inputs['Reset Children'].default_value = True
+        group.links.new(INFO.outputs['Instances'], IN2PTS.inputs['Instance'])
+    else:
+        INFO = group.nodes.new("GeometryNodeObjectInfo")
+        INFO.inputs['Object'].default_value = instance
+        group.links.new(INFO.outputs['Geometry'], IN2PTS.inputs['Instance'])
+    INFO.location.x = -300
+    INFO.location.y = -200
+
+    attributes = points_obj.data.attributes
+    yLoc = -400
+    for name, socket in ((scale, 'Scale'), (rotation, 'Rotation'), (pickInstance, 'Instance Index')):
+        if name is None:
+            continue
+        ATTR = group.nodes.new("GeometryNodeInputNamedAttribute")
+        ATTR.data_type = attributes[name].data_type
+        ATTR.inputs['Name'].default_value = name
+        ATTR.location.x = -300
+        ATTR.location.y = yLoc
+        yLoc -= 150
+        group.links.new(ATTR.outputs['Attribute'], IN2PTS.inputs[socket])
+    if pickInstance is not None:
+        IN2PTS.inputs['Pick Instance'].default_value = True
+    return MOD
@@ -0,0 +1,144 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import bmesh
+import numpy as np
+from . cameraProjection import projectedRadius
+from . numpyMesh import numpyMesh
+from . tubeMesh import ringFaces
+
+def templateObject(mesh, name = 'template', material = None, collection = None):
+    """
+    this function wraps a template mesh into a hidden object that can be instanced with instanceOnPoints. The object gets its own copy of the mesh (templates are a few hundred vertices, all instances still share the one template), so setMat_* appending material slots on it never touches the cached mesh that other templates are made from. Its material slot is linked to the object.
+
+    Inputs
+    mesh: bpy mesh datablock of the template (left untouched)
+    name: name of the object
+    material: (optional) bpy material of the instances
+    collection: (optional) collection the object is linked to (default: the scene collection)
+
+    Outputs
+    obj: the hidden template object
+    """
+    mesh = mesh.copy()
+    if len(mesh.materials) == 0:
+        mesh.materials.append(None)
+    obj = bpy.data.objects.new(name, mesh)
+    if collection is None:
+        collection = bpy.context.scene.collection
+    collection.objects.link(obj)
+    # materials set on the template later go to the object as well
+    obj.material_slots[0].link = 'OBJECT'
+    if material is not None:
+        obj.material_slots[0].material = material
+    obj.hide_render = True
+    obj.hide_set(True)
+    return obj
+
+def sphereMesh(segments = 32, rings = 16):
+    """
+    returns a smooth shaded UV sphere of radius 1. The mesh is built once per session and reused by all calls with the same resolution.
+    """
+    name = 'unit sphere ' + str(segments) + 'x' + str(rings)
+    mesh = bpy.data.meshes.get(name)
+    if mesh is None:
+        mesh = bpy.data.meshes.new(name)
+        bm = bmesh.new()
+        bmesh.ops.create_uvsphere(bm, u_segments = segments, v_segments = rings, radius = 1.0)
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.polygons.foreach_set('use_smooth', np.ones(len(mesh.polygons), dtype = bool))
+        mesh.update()
+    return mesh
+
+def icosphereMesh(level = 3):
+    """
+    returns a smooth shaded icosphere of radius 1 (level 1 is the icosahedron, every level splits each triangle in four). The mesh is built once per session.
+    """
+    name = 'unit icosphere ' + str(level)
+    mesh = bpy.data.meshes.get(name)
+    if mesh is None:
+        mesh = bpy.data.meshes.new(name)
+        bm = bmesh.new()
+        bmesh.ops.create_icosphere(bm, subdivisions = level, radius = 1.0)
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.polygons.foreach_set('use_smooth', np.ones(len(mesh.polygons), dtype = bool))
+        mesh.update()
+    return mesh
+
+def arrowMesh(numSides = 16, length = 3.0, shaftRadius = 0.4, headRadius = 1.0, headLength = 1.2):
+    """
+    returns an arrow along +z from the origin to z = length: a capped cylindrical shaft and a cone head. The mesh is generated in numpy once per session for every set of parameters. The bottom cap, shaft, back of the head and cone have their own vertices, so smooth shading keeps their borders sharp. The head is at most 80% of the arrow, so short arrows keep a shaft instead of turning inside out.
+    """
+    headLength = min(headLength, 0.8 * length)
+    name = 'arrow %d %g %g %g %g' % (numSides, length, shaftRadius, headRadius, headLength)
+    mesh = bpy.data.meshes.get(name)
+    if mesh is None:
+        theta = np.linspace(0, 2 * np.pi, numSides, endpoint = False)
+        circle = np.stack((np.cos(theta), np.sin(theta), np.zeros(numSides)), axis = 1)
+        zHead = length - headLength
+        # rings of (radius, height), two per band
+        bands = [(shaftRadius, 0.0), (shaftRadius, 0.0), (shaftRadius, zHead), (shaftRadius, zHead), (headRadius, zHead), (headRadius, zHead)]
+        V = np.concatenate([radius * circle + [0, 0, z] for radius, z in bands] + [[[0, 0, 0], [0, 0, length]]])
+        bottom, tip = 6 * numSides, 6 * numSides + 1
+        k = np.arange(numSides)
+        k1 = (k + 1) % numSides
+        ring = numSides * np.arange(6)
+        F = np.concatenate((
+            np.stack((np.full(numSides, bottom), ring[0] + k1, ring[0] + k), axis = 1).reshape(-1), # bottom cap
+            ringFaces(np.array([ring[1]]), np.array([ring[2]]), numSides).reshape(-1), # shaft
+            ringFaces(np.array([ring[3]]), np.array([ring[4]]), numSides).reshape(-1), # back of the head
+            np.stack((ring[5] + k, ring[5] + k1, np.full(numSides, tip)), axis = 1).reshape(-1))) # cone
+        faceSizes = np.concatenate((np.full(numSides, 3), np.full(2 * numSides, 4), np.full(numSides, 3)))
+        mesh = numpyMesh(V, F, name = name, faceSizes = faceSizes)
+        mesh.polygons.foreach_set('use_smooth', np.ones(4 * numSides, dtype = bool))
+        mesh.update()
+    return mesh
+
+def lodTemplates(meshes, name = 'template', material = None):
+    """
+    this function puts one hidden template object per level of detail into a new collection, ordered from the coarsest to the finest mesh. Used with instanceOnPoints(..., pickInstance = 'lod'), the child with index lod[i] is instanced on point i.
+
+    Inputs
+    meshes: list of bpy mesh datablocks, from coarse to fine
+    name: name of the collection (the templates are named "<name> lod <level>")
+    material: (optional) bpy material of all levels
+
+    Outputs
+    collection: the collection of the templates
+    """
+    collection = bpy.data.collections.new(name)
+    bpy.context.scene.collection.children.link(collection)
+    # collection info lists the children by name, so the names follow the level order
+    for level, mesh in enumerate(meshes):
+        templateObject(mesh, name + ' lod ' + str(level).zfill(2), material, collection)
+    return collection
+
+def lodIndex(cam, centers, radii, thresholds, scene = None):
+    """
+    this function picks a level of detail for every instance from its projected radius in pixels: level k is used if thresholds[k-1] <= radius < thresholds[k]
+
+    Inputs
+    cam: bpy.object of the camera
+    centers: |P|x3 array of world space instance centers
+    radii: scalar or |P| array of world space bounding radii of the instances
+    thresholds: increasing list of pixel radii between consecutive levels (len(thresholds)+1 levels)
+    scene: (optional) scene whose render resolution is used (default: the current scene)
+
+    Outputs
+    lod: |P| int array of levels
+    """
+    pixels = projectedRadius(cam, centers, radii, scene)
+    return np.searchsorted(np.asarray(thresholds, dtype = float), pixels, side = 'right').astype(np.int32)
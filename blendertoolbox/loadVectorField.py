@@ -0,0 +1,55 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import numpy as np
+from . downsamplePoints import blueNoiseSubsample
+
+def loadArrayCached(path, cache = True):
+    """
+    loads a text array (np.loadtxt) as float32 and keeps a binary copy next to it (path + '.npy'). Later calls read the copy as long as it is newer than the text file.
+    """
+    cachePath = path + '.npy'
+    if cache and os.path.exists(cachePath) and os.path.getmtime(cachePath) >= os.path.getmtime(path):
+        return np.load(cachePath)
+    A = np.loadtxt(path, dtype = np.float32, ndmin = 2)
+    if cache:
+        try:
+            np.save(cachePath, A)
+        except OSError: # read-only folders simply are not cached
+            pass
+    return A
+
+def loadVectorField(pointsPath, vectorsPath, count = None, seed = 0, cache = True):
+    """
+    this function loads a vector field stored as two text files (one row per vector) with a binary cache, and optionally subsamples it with blue noise
+
+    Inputs
+    pointsPath: path of the |P|x3 vector origins
+    vectorsPath: path of the |P|x3 vectors
+    count: (optional) number of vectors to keep, picked as a blue noise subset of the origins (on the surface they sample)
+    seed: seed of the subsampling
+    cache: if True, the arrays are cached as .npy files next to the text files
+
+    Outputs
+    P: |P'|x3 float32 array of vector origins
+    PN: |P'|x3 float32 array of vectors
+    """
+    P = loadArrayCached(pointsPath, cache)
+    PN = loadArrayCached(vectorsPath, cache)
+    if P.shape != PN.shape:
+        raise ValueError('Error in "loadVectorField": the points and vectors must have the same shape')
+    if count is not None and count < P.shape[0]:
+        keep = blueNoiseSubsample(P, count, seed)
+        P, PN = P[keep], PN[keep]
+    return P, PN
@@ -0,0 +1,83 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import inspect
+import functools
+import numpy as np
+from . colorObj import colorObj
+
+# materials of this session, keyed by (function name, parameter values)
+MATERIAL_CACHE = {}
+
+def materialKey(value):
+    """
+    returns a hashable version of a material parameter (colorObj, number, string, list/tuple/array of them), or raises TypeError if there is none
+    """
+    if isinstance(value, colorObj):
+        return ('colorObj',) + value.key()
+    if isinstance(value, np.ndarray):
+        return tuple(materialKey(v) for v in value.tolist()) if value.ndim > 0 else value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(materialKey(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # other objects would be compared by identity, so equal settings would never share a material
+    raise TypeError('no material key for ' + type(value).__name__)
+
+def internMaterial(key, build):
+    """
+    returns the material of this session stored under key, or builds it with build() (a function returning the new material) and stores it. A material that was deleted meanwhile (e.g. by blenderInit resetting the file) is built again
+    """
+    mat = MATERIAL_CACHE.get(key)
+    if mat is not None:
+        try:
+            mat.name # raises ReferenceError if the material was removed
+            return mat
+        except ReferenceError:
+            pass
+    mat = build()
+    MATERIAL_CACHE[key] = mat
+    return mat
+
+def cachedMaterial(setMat):
+    """
+    this decorator interns the materials of a setMat_* function: the first call with some parameter values builds the node tree as usual, later calls with equal values (same colorObj values, same numbers...) link the existing material to the mesh instead of building another "MeshMaterial.0001". Calls with unhashable parameters build a new material.
+
+    The decorated function must take the mesh object as its first argument, assign its material to mesh.active_material and do nothing else to the object (object settings such as shadow visibility would be skipped on a cache hit). The wrapper returns the material
+    """
+    signature = inspect.signature(setMat)
+
+    @functools.wraps(setMat)
+    def wrapper(mesh, *args, **kwargs):
+        bound = signature.bind(mesh, *args, **kwargs)
+        bound.apply_defaults()
+        try:
+            key = (setMat.__name__,) + tuple(materialKey(value) for name, value in bound.arguments.items() if name != 'mesh')
+        except TypeError:
+            setMat(mesh, *args, **kwargs)
+            return mesh.active_material
+        built = []
+        def build():
+            setMat(mesh, *args, **kwargs)
+            built.append(True)
+            return mesh.active_material
+        mat = internMaterial(key, build)
+        if not built:
+            mesh.data.materials.append(mat)
+            mesh.active_material = mat
+        return mat
+
+    return wrapper
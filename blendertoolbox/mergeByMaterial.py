@@ -0,0 +1,93 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+from . numpyMesh import numpyMesh
+from . meshArrays import vertexArray, faceArray
+from . setAttribute import ATTRIBUTE_FIELDS, setAttribute
+
+def mergeByMaterial(objects, name = 'merged'):
+    """
+    this function replaces many small mesh objects that share their materials (e.g. spheres from drawSphere, tubes of separate drawLines calls, per stroke pieces) by one mesh object per material. The world space vertices and the faces of every group are concatenated in numpy with vertex index offsets and written in bulk, so blender (depsgraph evaluation, cycles object handling) sees a few large objects instead of many small ones.
+
+    Objects are grouped by the list of their material slots, so the per face material indices stay valid. Point, face and face corner attributes (vertex colors, uv maps, ...) that all objects of a group have with the same type and domain are kept, as are the smooth shading flags. Custom normals and edge attributes are not kept. Objects that are not meshes or have modifiers are left untouched.
+
+    Inputs
+    objects: list of bpy.object
+    name: prefix of the names of the merged objects
+
+    Outputs
+    merged: list of the merged objects, one per material (list of material slots)
+    """
+    groups = {}
+    for obj in objects:
+        if obj.type != 'MESH' or len(obj.modifiers) > 0:
+            continue
+        key = tuple(slot.material for slot in obj.material_slots)
+        groups.setdefault(key, []).append(obj)
+
+    merged = []
+    for materials, group in groups.items():
+        V, corners, faceSizes = [], [], []
+        offset = 0
+        for obj in group:
+            V.append(vertexArray(obj, obj.matrix_world))
+            c, s = faceArray(obj)
+            corners.append(c.astype(np.int64) + offset)
+            faceSizes.append(s)
+            offset += V[-1].shape[0]
+        mesh = numpyMesh(np.concatenate(V), np.concatenate(corners), name = name, faceSizes = np.concatenate(faceSizes))
+
+        # face flags
+        for field, dtype in (('use_smooth', bool), ('material_index', np.int32)):
+            values = []
+            for obj in group:
+                array = np.zeros(len(obj.data.polygons), dtype = dtype)
+                obj.data.polygons.foreach_get(field, array)
+                values.append(array)
+            mesh.polygons.foreach_set(field, np.concatenate(values))
+
+        # generic attributes shared by all objects of the group
+        domainSize = {'POINT': 'vertices', 'FACE': 'polygons', 'CORNER': 'loops'}
+        first = group[0].data.attributes
+        for attr in first:
+            if attr.name.startswith('.') or attr.name in ('position', 'sharp_face', 'material_index') or attr.domain not in domainSize or attr.data_type not in ATTRIBUTE_FIELDS:
+                continue
+            attrName, attrType, attrDomain = attr.name, attr.data_type, attr.domain
+            others = [obj.data.attributes.get(attrName) for obj in group]
+            if any(other is None or other.data_type != attrType or other.domain != attrDomain for other in others):
+                continue
+            field, dtype, width = ATTRIBUTE_FIELDS[attrType]
+            values = []
+            for obj, other in zip(group, others):
+                array = np.zeros(len(getattr(obj.data, domainSize[attrDomain])) * width, dtype = dtype)
+                other.data.foreach_get(field, array)
+                values.append(array.reshape(-1, width))
+            setAttribute(mesh, attrName, np.concatenate(values), attrType, attrDomain)
+
+        for material in materials:
+            mesh.materials.append(material)
+        mesh.update()
+        merged_obj = bpy.data.objects.new(name + ('_' + materials[0].name if len(materials) > 0 and materials[0] is not None else ''), mesh)
+        collections = group[0].users_collection
+        (collections[0] if len(collections) > 0 else bpy.context.scene.collection).objects.link(merged_obj)
+
+        # remove the source objects (and their meshes if nothing else uses them)
+        for obj in group:
+            data = obj.data
+            bpy.data.objects.remove(obj, do_unlink = True)
+            if data.users == 0:
+                bpy.data.meshes.remove(data)
+        merged.append(merged_obj)
+    return merged
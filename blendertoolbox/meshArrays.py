@@ -0,0 +1,68 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+
+def vertexArray(mesh_obj, matrix = None):
+    """
+    returns the |V|x3 vertex locations of a mesh object with one foreach_get call
+
+    Inputs
+    mesh_obj: bpy.object of the mesh
+    matrix: (optional) 4x4 matrix applied to the vertices, e.g. mesh_obj.matrix_world. None returns local coordinates
+    """
+    mesh = mesh_obj.data
+    V = np.zeros(len(mesh.vertices) * 3, dtype = np.float32)
+    mesh.vertices.foreach_get('co', V)
+    V = V.reshape(-1, 3).astype(float)
+    if matrix is not None:
+        M = np.array(matrix, dtype = float)
+        V = V @ M[:3,:3].T + M[:3,3]
+    return V
+
+def vertexNormalArray(mesh_obj, matrix = None):
+    """
+    returns the |V|x3 unit vertex normals of a mesh object, optionally transformed by the normal matrix of "matrix"
+    """
+    mesh = mesh_obj.data
+    N = np.zeros(len(mesh.vertices) * 3, dtype = np.float32)
+    mesh.vertices.foreach_get('normal', N)
+    N = N.reshape(-1, 3).astype(float)
+    if matrix is not None:
+        M = np.array(matrix, dtype = float)
+        N = N @ np.linalg.inv(M[:3,:3])
+        N /= np.maximum(np.linalg.norm(N, axis = 1), 1e-16)[:,None]
+    return N
+
+def faceArray(mesh_obj):
+    """
+    returns the faces of a mesh object as a flat array of corner vertex indices and the number of corners of each face
+    """
+    mesh = mesh_obj.data
+    corners = np.zeros(len(mesh.loops), dtype = np.int32)
+    mesh.loops.foreach_get('vertex_index', corners)
+    faceSizes = np.zeros(len(mesh.polygons), dtype = np.int32)
+    mesh.polygons.foreach_get('loop_total', faceSizes)
+    return corners, faceSizes
+
+def triangleArray(mesh_obj):
+    """
+    returns the |T|x3 triangles of a mesh object (its loop triangulation) and the face each triangle comes from
+    """
+    mesh = mesh_obj.data
+    mesh.calc_loop_triangles()
+    T = np.zeros(len(mesh.loop_triangles) * 3, dtype = np.int32)
+    mesh.loop_triangles.foreach_get('vertices', T)
+    triFace = np.zeros(len(mesh.loop_triangles), dtype = np.int32)
+    mesh.loop_triangles.foreach_get('polygon_index', triFace)
+    return T.reshape(-1, 3), triFace
@@ -0,0 +1,103 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from . meshArrays import vertexArray, faceArray
+
+def faceNormals(V, corners, faceSizes):
+    """
+    returns the unit normals and the areas of the faces of a polygon mesh (the vector area of every polygon, so non-planar faces get their average normal)
+
+    Inputs
+    V: |V|x3 array of vertex locations
+    corners: flat array of face corner vertex indices
+    faceSizes: |F| array of the number of corners of each face
+
+    Outputs
+    FN: |F|x3 array of unit face normals (0 for faces without area)
+    area: |F| array of face areas
+    """
+    V = np.asarray(V, dtype = float).reshape(-1, 3)
+    corners = np.asarray(corners, dtype = np.int64).ravel()
+    faceSizes = np.asarray(faceSizes, dtype = np.int64).ravel()
+    face = np.repeat(np.arange(faceSizes.shape[0]), faceSizes)
+    start = np.cumsum(faceSizes) - faceSizes
+    nextCorner = start[face] + (np.arange(corners.shape[0]) - start[face] + 1) % faceSizes[face]
+    vectorArea = np.zeros((faceSizes.shape[0], 3))
+    origin = V[corners[start[face]]] # relative to the first corner, for precision far from the origin
+    np.add.at(vectorArea, face, 0.5 * np.cross(V[corners] - origin, V[corners[nextCorner]] - origin))
+    area = np.linalg.norm(vectorArea, axis = 1)
+    return vectorArea / np.maximum(area, 1e-300)[:,None], area
+
+def vertexNormals(V, corners, faceSizes, weighting = 'angle'):
+    """
+    this function computes vertex normals as a weighted average of the normals of the faces around every vertex
+
+    Inputs
+    V: |V|x3 array of vertex locations
+    corners: flat array of face corner vertex indices
+    faceSizes: |F| array of the number of corners of each face
+    weighting: 'angle' (weighted by the corner angles, as blender does) or 'area' (weighted by the face areas)
+
+    Outputs
+    VN: |V|x3 array of unit vertex normals (0 for vertices without faces)
+    """
+    V = np.asarray(V, dtype = float).reshape(-1, 3)
+    corners = np.asarray(corners, dtype = np.int64).ravel()
+    faceSizes = np.asarray(faceSizes, dtype = np.int64).ravel()
+    FN, area = faceNormals(V, corners, faceSizes)
+    face = np.repeat(np.arange(faceSizes.shape[0]), faceSizes)
+    if weighting == 'area':
+        weight = area[face]
+    elif weighting == 'angle':
+        start = np.cumsum(faceSizes) - faceSizes
+        position = np.arange(corners.shape[0]) - start[face]
+        nextCorner = corners[start[face] + (position + 1) % faceSizes[face]]
+        prevCorner = corners[start[face] + (position - 1) % faceSizes[face]]
+        e1 = V[nextCorner] - V[corners]
+        e2 = V[prevCorner] - V[corners]
+        weight = np.arctan2(np.linalg.norm(np.cross(e1, e2), axis = 1), np.sum(e1 * e2, axis = 1))
+    else:
+        raise ValueError('Error in "vertexNormals": weighting must be "angle" or "area"')
+    VN = np.zeros((V.shape[0], 3))
+    for c in range(3):
+        VN[:,c] = np.bincount(corners, weights = weight * FN[face,c], minlength = V.shape[0])
+    return VN / np.maximum(np.linalg.norm(VN, axis = 1), 1e-300)[:,None]
+
+def setShading(mesh_obj, smooth = True, normals = None):
+    """
+    this function sets the shading of a mesh object by writing its data in bulk, instead of calling the shade_smooth/shade_flat operators (which act on the selection)
+
+    Inputs
+    mesh_obj: bpy.object of the mesh
+    smooth: smooth (True) or flat (False) shading of all faces
+    normals: (optional, smooth only) custom normals, either a |V|x3 array of vertex normals, a |corners|x3 array of face corner normals, or 'angle'/'area' to compute vertex normals with vertexNormals. None keeps the custom normals of the mesh (e.g. imported from an OBJ file) if it has any, else the normals blender computes
+    """
+    mesh = mesh_obj.data
+    mesh.polygons.foreach_set('use_smooth', np.full(len(mesh.polygons), smooth, dtype = bool))
+    if smooth and normals is None and mesh.has_custom_normals and hasattr(mesh, 'use_auto_smooth'):
+        mesh.use_auto_smooth = True
+    elif smooth and normals is not None:
+        if isinstance(normals, str):
+            corners, faceSizes = faceArray(mesh_obj)
+            normals = vertexNormals(vertexArray(mesh_obj), corners, faceSizes, normals)
+        normals = np.asarray(normals, dtype = np.float32).reshape(-1, 3)
+        if hasattr(mesh, 'use_auto_smooth'): # custom normals need auto smooth before blender 4.1
+            mesh.use_auto_smooth = True
+        if normals.shape[0] == len(mesh.vertices):
+            mesh.normals_split_custom_set_from_vertices(normals)
+        elif normals.shape[0] == len(mesh.loops):
+            mesh.normals_split_custom_set(normals)
+        else:
+            raise ValueError('Error in "setShading": there must be one normal per vertex or per face corner')
+    mesh.update()
@@ -0,0 +1,141 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+
+# shader node groups of this session, keyed by their look (and the parameters baked into them)
+NODE_GROUPS = {}
+
+# inputs of a color adjusted by a Hue/Saturation and a Bright/Contrast node, the values of a colorObj
+COLOR_INPUTS = [('Color', 'NodeSocketColor', (0.7, 0.7, 0.7, 1.0)), ('Hue', 'NodeSocketFloat', 0.5), ('Saturation', 'NodeSocketFloat', 1.0), ('Value', 'NodeSocketFloat', 1.0), ('Bright', 'NodeSocketFloat', 0.0), ('Contrast', 'NodeSocketFloat', 0.0)]
+
+def colorInputs(prefix = '', withColor = True):
+    """
+    returns the (name, socket type, default) of the colorObj inputs of a node group, with an optional name prefix
+    """
+    return [(prefix + name, socket, default) for name, socket, default in COLOR_INPUTS if withColor or name != 'Color']
+
+def colorValues(color, prefix = '', withColor = True):
+    """
+    returns the input values of a node group for the colorObj "color" (see colorInputs)
+    """
+    values = {prefix + 'Hue': color.H, prefix + 'Saturation': color.S, prefix + 'Value': color.V, prefix + 'Bright': color.B, prefix + 'Contrast': color.C}
+    if withColor:
+        values[prefix + 'Color'] = color.RGBA
+    return values
+
+def nodeGroup(key, name, inputs, build):
+    """
+    this function returns the shader node group of a look, built only once per session (and again after the file was reset, e.g. by blenderInit)
+
+    Inputs
+    key: hashable key of the look (and of the parameters baked into the group)
+    name: name of the node group
+    inputs: list of (name, socket type, default value) of the group inputs
+    build: function build(tree, groupIn, groupOut) adding the nodes of the look, it must link a shader to groupOut.inputs['Shader']
+
+    Outputs
+    group: the bpy shader node group
+    """
+    group = NODE_GROUPS.get(key)
+    if group is not None:
+        try:
+            group.name # raises ReferenceError once the file was reset
+            return group
+        except ReferenceError:
+            pass
+    group = bpy.data.node_groups.new(name, 'ShaderNodeTree')
+    for inputName, socketType, default in inputs:
+        socket = group.interface.new_socket(inputName, in_out = 'INPUT', socket_type = socketType)
+        socket.default_value = default
+    group.interface.new_socket('Shader', in_out = 'OUTPUT', socket_type = 'NodeSocketShader')
+    groupIn = group.nodes.new('NodeGroupInput')
+    groupIn.location.x = -1200
+    groupOut = group.nodes.new('NodeGroupOutput')
+    groupOut.location.x = 400
+    build(group, groupIn, groupOut)
+    NODE_GROUPS[key] = group
+    return group
+
+def groupMaterial(mesh, group, values):
+    """
+    this function gives a mesh a new material made of a single group node (see nodeGroup) with the input values "values" (dict of input name to value)
+
+    Outputs
+    mat: the bpy material
+    """
+    mat = bpy.data.materials.new('MeshMaterial')
+    mesh.data.materials.append(mat)
+    mesh.active_material = mat
+    mat.use_nodes = True
+    tree = mat.node_tree
+    tree.nodes.remove(tree.nodes['Principled BSDF'])
+    node = tree.nodes.new('ShaderNodeGroup')
+    node.node_tree = group
+    node.location.x -= 200
+    for name, value in values.items():
+        node.inputs[name].default_value = value
+    tree.links.new(node.outputs['Shader'], tree.nodes['Material Output'].inputs['Surface'])
+    return mat
+
+def addColorAdjust(tree, groupIn, colorSocket = None, prefix = ''):
+    """
+    adds a Hue/Saturation and a Bright/Contrast node driven by the colorInputs(prefix) of the group and returns the adjusted color socket. colorSocket replaces the Color input (e.g. a vertex color attribute)
+    """
+    HSVNode = tree.nodes.new('ShaderNodeHueSaturation')
+    tree.links.new(colorSocket if colorSocket is not None else groupIn.outputs[prefix + 'Color'], HSVNode.inputs['Color'])
+    for name in ('Hue', 'Saturation', 'Value'):
+        tree.links.new(groupIn.outputs[prefix + name], HSVNode.inputs[name])
+    HSVNode.location.x = -1000
+    BCNode = tree.nodes.new('ShaderNodeBrightContrast')
+    tree.links.new(HSVNode.outputs['Color'], BCNode.inputs['Color'])
+    tree.links.new(groupIn.outputs[prefix + 'Bright'], BCNode.inputs['Bright'])
+    tree.links.new(groupIn.outputs[prefix + 'Contrast'], BCNode.inputs['Contrast'])
+    BCNode.location.x = -800
+    return BCNode.outputs['Color']
+
+def addAmbientOcclusion(tree, groupIn, colorSocket):
+    """
+    multiplies a color by the ambient occlusion raised to the power of the "AO Strength" input of the group and returns the resulting color socket
+    """
+    AONode = tree.nodes.new('ShaderNodeAmbientOcclusion')
+    AONode.inputs['Distance'].default_value = 10.0
+    tree.links.new(colorSocket, AONode.inputs['Color'])
+    AONode.location.x = -600
+    gammaNode = tree.nodes.new('ShaderNodeGamma')
+    tree.links.new(AONode.outputs['AO'], gammaNode.inputs['Color'])
+    tree.links.new(groupIn.outputs['AO Strength'], gammaNode.inputs['Gamma'])
+    gammaNode.location.x = -400
+    MIXRGB = tree.nodes.new('ShaderNodeMixRGB')
+    MIXRGB.blend_type = 'MULTIPLY'
+    tree.links.new(AONode.outputs['Color'], MIXRGB.inputs['Color1'])
+    tree.links.new(gammaNode.outputs['Color'], MIXRGB.inputs['Color2'])
+    MIXRGB.location.x = -200
+    return MIXRGB.outputs['Color']
+
+def addEdge(tree, groupIn, shaderSocket):
+    """
+    mixes a shader with a diffuse wireframe colored by the colorInputs('Edge ') of the group, of width "Edge Thickness", and returns the mixed shader socket
+    """
+    wire = tree.nodes.new('ShaderNodeWireframe')
+    tree.links.new(groupIn.outputs['Edge Thickness'], wire.inputs[0])
+    wire.location = (-200, 200)
+    mat_wire = tree.nodes.new('ShaderNodeBsdfDiffuse')
+    tree.links.new(addColorAdjust(tree, groupIn, prefix = 'Edge '), mat_wire.inputs['Color'])
+    mat_wire.location = (-200, -200)
+    MIX = tree.nodes.new('ShaderNodeMixShader')
+    tree.links.new(wire.outputs[0], MIX.inputs[0])
+    tree.links.new(shaderSocket, MIX.inputs[1])
+    tree.links.new(mat_wire.outputs['BSDF'], MIX.inputs[2])
+    MIX.location.x = 200
+    return MIX.outputs['Shader']
@@ -0,0 +1,68 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+
+def numpyMesh(V, F, name = 'numpy mesh', faceSizes = None, mesh = None):
+    """
+    this function writes numpy arrays into a blender mesh datablock in bulk (foreach_set) instead of going through from_pydata
+
+    Inputs
+    V: |V|x3 array of vertex locations
+    F: |F|xn array of face indices, or a flat array of face corners if faceSizes is given
+    name: name of the new mesh datablock
+    faceSizes: (optional) |F| array of the number of corners of each face, for meshes with mixed face sizes
+    mesh: (optional) an existing mesh datablock to overwrite instead of creating a new one
+
+    Output
+    mesh: a blender mesh datablock (not linked to any object)
+    """
+    V = np.asarray(V, dtype = np.float32).reshape(-1, 3)
+    if faceSizes is None and not isinstance(F, np.ndarray) and len(set(len(f) for f in F)) > 1:
+        # python list of polygons with different sizes (as accepted by from_pydata)
+        faceSizes = [len(f) for f in F]
+        F = np.concatenate([np.asarray(f).ravel() for f in F])
+    if faceSizes is None:
+        F = np.asarray(F, dtype = np.int32)
+        if F.size == 0:
+            corners = np.zeros(0, dtype = np.int32)
+            faceSizes = np.zeros(0, dtype = np.int32)
+        else:
+            F = F.reshape(F.shape[0], -1)
+            corners = F.ravel()
+            faceSizes = np.full(F.shape[0], F.shape[1], dtype = np.int32)
+    else:
+        corners = np.asarray(F, dtype = np.int32).ravel()
+        faceSizes = np.asarray(faceSizes, dtype = np.int32).ravel()
+    if faceSizes.sum() != corners.shape[0]:
+        raise ValueError('Error in "numpyMesh": faceSizes must sum up to the number of face corners')
+    loopStart = np.zeros(faceSizes.shape[0], dtype = np.int32)
+    if faceSizes.shape[0] > 1:
+        loopStart[1:] = np.cumsum(faceSizes[:-1])
+
+    if mesh is None:
+        mesh = bpy.data.meshes.new(name = name)
+    else:
+        mesh.clear_geometry()
+    mesh.vertices.add(V.shape[0])
+    mesh.vertices.foreach_set('co', V.ravel())
+    mesh.loops.add(corners.shape[0])
+    mesh.loops.foreach_set('vertex_index', corners)
+    mesh.polygons.add(faceSizes.shape[0])
+    mesh.polygons.foreach_set('loop_start', loopStart)
+    # newer blender derives the face sizes from loop_start and makes loop_total read-only
+    if not mesh.polygons.bl_rna.properties['loop_total'].is_readonly:
+        mesh.polygons.foreach_set('loop_total', faceSizes)
+    mesh.update(calc_edges = True)
+    return mesh
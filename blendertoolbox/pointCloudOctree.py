@@ -0,0 +1,257 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import bpy
+import mathutils
+import numpy as np
+from . cameraProjection import cameraIntrinsics, worldToPixel, pixelsPerUnit
+from . readNumpyPointCloud import readNumpyPointCloud
+
+# nodes are identified by depth * KEY_RANGE + cell key, which also sorts them depth by depth
+KEY_RANGE = 2 ** 48
+MAX_DEPTH = 16
+# number of points read at once while building the octree
+CHUNK_SIZE = 2 ** 22
+
+def writePointCloudOctree(P, folder, point_colors = None, nodeCapacity = 20000, maxDepth = 12, seed = 0):
+    """
+    this function writes a point cloud into an on-disk octree for out-of-core rendering (see readPointCloudOctree). The points are shuffled and every octree node keeps up to nodeCapacity points of its cell that no ancestor took, so each node is a uniform subsample and loading more levels refines the density everywhere.
+
+    Files in folder
+    points.npy: |P|x3 float32 points, grouped by node (memory-mappable)
+    colors.npy: |P|x4 uint8 colors in the same order (only with point_colors)
+    nodes.npz: per node depth, cell index, start, count, tight bounds (lower, upper) and point spacing, plus the root cube (origin, size)
+
+    Inputs
+    P: |P|x3 array of points. A np.memmap works too: the coordinates and colors are read in chunks of CHUNK_SIZE points, only the point indices (8 bytes per point) are held in memory
+    folder: output folder (created if needed)
+    point_colors: (optional) |P|x3 (or |P|x4) array of colors, either floats between [0,1] or uint8
+    nodeCapacity: number of points per node
+    maxDepth: depth of the finest level (at most 16), its nodes take all remaining points
+    seed: seed of the shuffle
+    """
+    if maxDepth > MAX_DEPTH:
+        raise ValueError('Error in "writePointCloudOctree": maxDepth must be at most ' + str(MAX_DEPTH))
+    os.makedirs(folder, exist_ok = True)
+    nP = P.shape[0]
+    origin = np.asarray(P.min(axis = 0), dtype = float)
+    size = float((np.asarray(P.max(axis = 0), dtype = float) - origin).max()) * (1 + 1e-6) + 1e-12
+
+    # assign points to nodes level by level, the shuffle makes every node a random subsample of its cell. The points are read chunk by chunk, a node takes the first nodeCapacity points of its cell in shuffled order across all chunks
+    remaining = np.random.default_rng(seed).permutation(nP)
+    pointOrder = []
+    nodeIds = []
+    nodeCounts = []
+    lower = []
+    upper = []
+    for depth in range(maxDepth + 1):
+        if remaining.shape[0] == 0:
+            break
+        cells = 2 ** depth
+        seenKeys = np.zeros(0, dtype = np.int64)
+        seenCounts = np.zeros(0, dtype = np.int64)
+        takenKeys, takenIdx, boundKeys, boundLower, boundUpper, left = [], [], [], [], [], []
+        for c0 in range(0, remaining.shape[0], CHUNK_SIZE):
+            idx = remaining[c0:c0 + CHUNK_SIZE]
+            X = readRows(P, idx).astype(float)
+            ijk = np.clip(np.floor((X - origin) / size * cells).astype(np.int64), 0, cells - 1)
+            key = (ijk[:,0] * cells + ijk[:,1]) * cells + ijk[:,2]
+            if depth < maxDepth:
+                # rank of every point in its cell: within the chunk plus the points of earlier chunks
+                order = np.argsort(key, kind = 'stable')
+                sortedKey = key[order]
+                groupStart = np.flatnonzero(np.concatenate(([True], sortedKey[1:] != sortedKey[:-1])))
+                groupSize = np.diff(np.append(groupStart, key.shape[0]))
+                rank = np.empty(key.shape[0], dtype = np.int64)
+                rank[order] = np.arange(key.shape[0]) - np.repeat(groupStart, groupSize)
+                if seenKeys.shape[0] > 0:
+                    pos = np.minimum(np.searchsorted(seenKeys, key), seenKeys.shape[0] - 1)
+                    rank += np.where(seenKeys[pos] == key, seenCounts[pos], 0)
+                take = rank < nodeCapacity
+                allKeys, inverse = np.unique(np.concatenate((seenKeys, sortedKey[groupStart])), return_inverse = True)
+                seenCounts = np.bincount(inverse.reshape(-1), weights = np.concatenate((seenCounts, groupSize)), minlength = allKeys.shape[0]).astype(np.int64)
+                seenKeys = allKeys
+                left.append(idx[~take])
+            else:
+                take = np.ones(key.shape[0], dtype = bool)
+            key, X = key[take], X[take]
+            takenKeys.append(key)
+            takenIdx.append(idx[take])
+            # per chunk bounds of the taken points of every cell
+            order = np.argsort(key, kind = 'stable')
+            key, X = key[order], X[order]
+            first = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1]))) if key.shape[0] > 0 else np.zeros(0, dtype = np.int64)
+            boundKeys.append(key[first])
+            boundLower.append(np.minimum.reduceat(X, first, axis = 0) if first.shape[0] > 0 else np.zeros((0,3)))
+            boundUpper.append(np.maximum.reduceat(X, first, axis = 0) if first.shape[0] > 0 else np.zeros((0,3)))
+
+        # group the taken points by node, keeping their shuffled order within each node
+        takenKey = np.concatenate(takenKeys)
+        order = np.argsort(takenKey, kind = 'stable')
+        takenKey = takenKey[order]
+        pointOrder.append(np.concatenate(takenIdx)[order])
+        first = np.flatnonzero(np.concatenate(([True], takenKey[1:] != takenKey[:-1])))
+        nodeIds.append(depth * KEY_RANGE + takenKey[first])
+        nodeCounts.append(np.diff(np.append(first, takenKey.shape[0])))
+        # merge the chunk bounds of every node (the nodes come out in the same sorted key order)
+        nodeKeys, inverse = np.unique(np.concatenate(boundKeys), return_inverse = True)
+        inverse = inverse.reshape(-1)
+        lo = np.full((nodeKeys.shape[0], 3), np.inf)
+        hi = np.full((nodeKeys.shape[0], 3), -np.inf)
+        np.minimum.at(lo, inverse, np.concatenate(boundLower))
+        np.maximum.at(hi, inverse, np.concatenate(boundUpper))
+        lower.append(lo)
+        upper.append(hi)
+        remaining = np.concatenate(left) if len(left) > 0 else np.zeros(0, dtype = np.int64)
+
+    pointOrder = np.concatenate(pointOrder)
+    nodeIds = np.concatenate(nodeIds)
+    count = np.concatenate(nodeCounts)
+    lower = np.concatenate(lower).astype(np.float32)
+    upper = np.concatenate(upper).astype(np.float32)
+    start = np.cumsum(count) - count
+    depth = nodeIds // KEY_RANGE
+    key = nodeIds % KEY_RANGE
+    cells = 2 ** depth
+    ijk = np.stack((key // (cells * cells), (key // cells) % cells, key % cells), axis = 1)
+
+    # write the points (and colors) in node order, chunk by chunk
+    points = np.lib.format.open_memmap(os.path.join(folder, 'points.npy'), mode = 'w+', dtype = np.float32, shape = (nP, 3))
+    colors = None
+    if point_colors is not None:
+        colors = np.lib.format.open_memmap(os.path.join(folder, 'colors.npy'), mode = 'w+', dtype = np.uint8, shape = (nP, 4))
+        isBytes = np.asarray(point_colors[:1]).dtype == np.uint8
+    for c0 in range(0, nP, CHUNK_SIZE):
+        idx = pointOrder[c0:c0 + CHUNK_SIZE]
+        points[c0:c0 + idx.shape[0]] = readRows(P, idx)
+        if colors is not None:
+            C = readRows(point_colors, idx).astype(float)
+            if not isBytes:
+                C = np.round(np.clip(C, 0, 1) * 255)
+            if C.shape[1] == 3:
+                C = np.concatenate((C, np.full((C.shape[0], 1), 255)), axis = 1)
+            colors[c0:c0 + idx.shape[0]] = C.astype(np.uint8)
+    points.flush()
+    if colors is not None:
+        colors.flush()
+
+    # spacing of a node's points, assuming they sample a surface
+    spacing = (size / cells / np.sqrt(np.minimum(count, nodeCapacity))).astype(np.float32)
+    np.savez(os.path.join(folder, 'nodes.npz'), depth = depth.astype(np.int8), ijk = ijk.astype(np.int32), start = start, count = count, lower = lower, upper = upper, spacing = spacing, origin = origin, size = size)
+
+def readRows(A, idx):
+    """
+    returns A[idx] while reading the rows of A in increasing order, which keeps np.memmap reads sequential
+    """
+    order = np.argsort(idx)
+    rows = np.empty((idx.shape[0],) + A.shape[1:], dtype = A.dtype)
+    rows[order] = A[idx[order]]
+    return rows
+
+def selectOctreeNodes(nodes, cam, matrix, pixelSpacing = 2.0, maxPoints = None, scene = None):
+    """
+    returns the indices of the octree nodes needed to render the points with about pixelSpacing pixels between neighbors: a node is loaded if its bounds are in view and its parent is still coarser than pixelSpacing. Ancestors of loaded nodes are always loaded; with maxPoints the finest nodes are dropped first.
+    """
+    depth = nodes['depth'].astype(np.int64)
+    ijk = nodes['ijk'].astype(np.int64)
+    count = nodes['count']
+    nN = depth.shape[0]
+    matrix = np.asarray(matrix, dtype = float)
+
+    # world space corners of the node bounds
+    lower, upper = nodes['lower'].astype(float), nodes['upper'].astype(float)
+    bits = np.array([[i & 1, (i >> 1) & 1, (i >> 2) & 1] for i in range(8)], dtype = bool)
+    corners = np.where(bits[None,:,:], upper[:,None,:], lower[:,None,:]).reshape(-1, 3)
+    corners = corners @ matrix[:3,:3].T + matrix[:3,3]
+    uv, z = worldToPixel(cam, corners, scene)
+    uv, z = uv.reshape(nN, 8, 2), z.reshape(nN, 8)
+
+    # conservative view test: drop nodes fully behind the camera or fully on one side of the image
+    resX, resY, focal = cameraIntrinsics(cam, scene)
+    front = (z > 0).all(axis = 1)
+    outside = (uv[:,:,0] < 0).all(axis = 1) | (uv[:,:,0] > resX).all(axis = 1) | (uv[:,:,1] < 0).all(axis = 1) | (uv[:,:,1] > resY).all(axis = 1)
+    visible = ~(z <= 0).all(axis = 1) & ~(front & outside)
+
+    # pixel spacing at the distance of the bounds from the camera
+    worldCorners = corners.reshape(nN, 8, 3)
+    camLoc = np.array(cam.matrix_world.translation)
+    dist = np.linalg.norm(np.clip(camLoc, worldCorners.min(axis = 1), worldCorners.max(axis = 1)) - camLoc, axis = 1)
+    scaleFactor = np.abs(np.linalg.det(matrix[:3,:3])) ** (1.0 / 3.0)
+    if cam.data.type == 'ORTHO':
+        spacingPx = nodes['spacing'] * scaleFactor * focal
+    else:
+        spacingPx = nodes['spacing'] * scaleFactor * focal / np.maximum(dist, 1e-12)
+
+    # parents are found by their id, nodes are sorted by id
+    cells = 2 ** depth
+    ids = depth * KEY_RANGE + (ijk[:,0] * cells + ijk[:,1]) * cells + ijk[:,2]
+    parentIjk = ijk // 2
+    parentCells = np.maximum(cells // 2, 1)
+    parentIds = (depth - 1) * KEY_RANGE + (parentIjk[:,0] * parentCells + parentIjk[:,1]) * parentCells + parentIjk[:,2]
+    parent = np.clip(np.searchsorted(ids, parentIds), 0, nN - 1)
+    isRoot = depth == 0
+
+    selected = visible & (isRoot | (spacingPx[parent] > pixelSpacing))
+    for d in range(1, depth.max() + 1 if nN else 0):
+        atDepth = np.flatnonzero(depth == d)
+        selected[atDepth] &= selected[parent[atDepth]]
+    selected = np.flatnonzero(selected)
+
+    if maxPoints is not None:
+        order = np.lexsort((-spacingPx[selected], depth[selected]))
+        keep = np.cumsum(count[selected][order]) <= maxPoints
+        keep[0] = True
+        selected = np.sort(selected[order][keep])
+    return selected
+
+def readPointCloudOctree(folder, cam, location, rotation_euler, scale, pixelSpacing = 2.0, maxPoints = None, radius = None, scene = None):
+    """
+    this function streams the octree nodes (written by writePointCloudOctree) that a camera needs into a blender point cloud. Only the selected node ranges are read from the memory-mapped files, so memory and load time depend on the screen coverage rather than on the total number of points.
+
+    Inputs
+    folder: folder of the octree
+    cam: bpy.object of the camera
+    location: (3,) long tuple of point cloud locations (same values as UI)
+    rotation: (3,) long tuple of rotation angles (same values as UI)
+    scale: (3,) long tuple of per-axis scaling (same values as UI)
+    pixelSpacing: target distance in pixels between neighboring points
+    maxPoints: (optional) upper bound of the number of loaded points
+    radius: (optional) point radius. If None, every point covers about pixelSpacing pixels
+    scene: (optional) scene whose render resolution is used (default: the current scene)
+
+    Output
+    pc_obj: a blender point cloud object
+    """
+    angle = [a * 1.0 / 180.0 * np.pi for a in rotation_euler]
+    matrix = np.array(mathutils.Matrix.LocRotScale(mathutils.Vector(location), mathutils.Euler(angle), mathutils.Vector(scale)))
+    nodes = np.load(os.path.join(folder, 'nodes.npz'))
+    selected = selectOctreeNodes(nodes, cam, matrix, pixelSpacing, maxPoints, scene)
+
+    # merge nodes that are stored next to each other into single reads
+    start, count = nodes['start'][selected], nodes['count'][selected]
+    runStart = np.flatnonzero(np.concatenate(([True], start[1:] != start[:-1] + count[:-1])))
+    runEnd = np.append(runStart[1:], selected.shape[0]) - 1
+    ranges = list(zip(start[runStart], start[runEnd] + count[runEnd]))
+    points = np.load(os.path.join(folder, 'points.npy'), mmap_mode = 'r')
+    P = np.concatenate([points[a:b] for a, b in ranges] + [np.zeros((0,3), dtype = np.float32)]).astype(float)
+    point_colors = None
+    if os.path.exists(os.path.join(folder, 'colors.npy')):
+        colors = np.load(os.path.join(folder, 'colors.npy'), mmap_mode = 'r')
+        point_colors = np.concatenate([colors[a:b] for a, b in ranges] + [np.zeros((0,4), dtype = np.uint8)]) / 255.0
+
+    if radius is None:
+        scaleFactor = np.abs(np.linalg.det(matrix[:3,:3])) ** (1.0 / 3.0)
+        ppu = pixelsPerUnit(cam, P @ matrix[:3,:3].T + matrix[:3,3], scene)
+        radius = np.where(ppu > 0, 0.5 * pixelSpacing / np.maximum(ppu, 1e-12) / scaleFactor, 0.0)
+    return readNumpyPointCloud(P, location, rotation_euler, scale, radius, point_colors)
@@ -18,17 +18,44 @@ import os
 from .readOBJ import readOBJ
 from .readPLY import readPLY
 from .readSTL import readSTL
+from .weldMesh import weldMesh
+from .readNumpyMesh import readNumpyMesh
+from .decimateMesh import decimateMesh, loadLOD, setLOD
+from .meshNormals import setShading
 
-def readMesh(filePath, location, rotation_euler, scale):
-	_, extension = os.path.splitext(filePath)
-	if extension == '.ply' or extension == '.PLY':
-		mesh = readPLY(filePath, location, rotation_euler, scale)
-	elif extension == '.obj' or extension == '.OBJ':
-		mesh = readOBJ(filePath, location, rotation_euler, scale)
-	elif extension == '.stl' or extension == '.STL':
-	 	mesh = readSTL(filePath, location, rotation_euler, scale)
+def readMesh(filePath, location, rotation_euler, scale, weld = False, weldTolerance = None, lod = None, shading = 'flat'):
+	# weld = True welds duplicated vertices and removes degenerate/duplicate faces (see weldMesh)
+	# shading = 'flat' or 'smooth'. Smooth shading keeps the normals of the file (OBJ vn) and otherwise uses area weighted vertex normals (see setShading)
+	# lod = number of faces of a decimated version to use instead, cached in memory and next to the file (see decimateMesh). By default it is the draftFaces of blenderInit, i.e. only draft renders use it
+	if shading != 'flat' and shading != 'smooth':
+		raise ValueError('Error in "readMesh": shading must be "flat" or "smooth"')
+	if lod is None:
+		lod = bpy.context.scene.get('draftFaces', 0)
+	# welded and unwelded loads decimate differently, so the weld settings are part of the cache key and file name
+	variant = '' if not weld else '.weld' if weldTolerance is None else '.weld%g' % weldTolerance
+	mesh = None
+	if lod:
+		lodArrays = loadLOD(filePath, lod, variant)
+		if lodArrays is not None:
+			mesh = readNumpyMesh(lodArrays['V'], lodArrays['F'], location, rotation_euler, scale)
+			setLOD(mesh, lodArrays)
+	if mesh is None:
+		_, extension = os.path.splitext(filePath)
+		if extension == '.ply' or extension == '.PLY':
+			mesh = readPLY(filePath, location, rotation_euler, scale)
+		elif extension == '.obj' or extension == '.OBJ':
+			mesh = readOBJ(filePath, location, rotation_euler, scale)
+		elif extension == '.stl' or extension == '.STL':
+			mesh = readSTL(filePath, location, rotation_euler, scale)
+		else:
+			raise TypeError("only support .ply, .obj, and .stl for now")
+		if weld:
+			weldMesh(mesh, weldTolerance)
+		if lod and len(mesh.data.polygons) > lod:
+			decimateMesh(mesh, lod, sourcePath = filePath, variant = variant)
+	if shading == 'smooth':
+		setShading(mesh, True, None if mesh.data.has_custom_normals else 'area')
 	else:
-		raise TypeError("only support .ply, .obj, and .stl for now")
+		setShading(mesh, False)
 	bpy.context.view_layer.objects.active = mesh
-	bpy.ops.object.shade_flat() # defaiult flat shading
 	return mesh 
\ No newline at end of file
@@ -13,6 +13,7 @@
 # limitations under the License.
 import bpy
 import numpy as np
+from . numpyMesh import numpyMesh
 
 def readNumpyMesh(V,F,location,rotation_euler,scale):
     """
@@ -33,9 +34,7 @@ def readNumpyMesh(V,F,location,rotation_euler,scale):
     z = rotation_euler[2] * 1.0 / 180.0 * np.pi 
     angle = (x,y,z)
 
-    mesh = bpy.data.meshes.new(name='numpy mesh')
-    mesh.from_pydata(V,[],F)
-    mesh.update()
+    mesh = numpyMesh(V, F, name='numpy mesh')
     mesh.validate()
     mesh_obj = bpy.data.objects.new('numpy mesh object', mesh)
     mesh_obj.location = location
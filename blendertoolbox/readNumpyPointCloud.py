@@ -0,0 +1,72 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+from . numpyMesh import numpyMesh
+from . setAttribute import setAttribute
+
+def readNumpyPointCloud(P, location, rotation_euler, scale, radius = 0.01, point_colors = None):
+    """
+    this function creates a blender point cloud (not a mesh) from numpy arrays. Cycles intersects the points analytically as spheres, no geometry nodes modifier is needed at render time.
+
+    Inputs
+    P: |P|x3 array of point locations
+    location: (3,) long tuple of point cloud locations (same values as UI)
+    rotation: (3,) long tuple of rotation angles (same values as UI)
+    scale: (3,) long tuple of per-axis scaling (same values as UI)
+    radius: scalar or |P| array of point radii
+    point_colors: (optional) |P|x3 (or |P|x4) array of point colors between [0,1], stored in the "Col" attribute
+
+    Output
+    pc_obj: a blender point cloud object
+    """
+    x = rotation_euler[0] * 1.0 / 180.0 * np.pi
+    y = rotation_euler[1] * 1.0 / 180.0 * np.pi
+    z = rotation_euler[2] * 1.0 / 180.0 * np.pi
+    angle = (x,y,z)
+
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    nP = P.shape[0]
+    if point_colors is not None:
+        point_colors = np.asarray(point_colors, dtype = float)
+    if point_colors is not None and point_colors.shape[0] != nP:
+        raise ValueError('Error in "readNumpyPointCloud": point colors must have the same length as the number of points')
+
+    pointcloud = bpy.data.pointclouds.new(name = 'numpy point cloud')
+    if hasattr(pointcloud, 'resize'):
+        pointcloud.resize(nP)
+        pc_obj = bpy.data.objects.new('numpy point cloud object', pointcloud)
+        bpy.context.scene.collection.objects.link(pc_obj)
+    else:
+        # older blender cannot resize a point cloud from python, convert a vertex-only mesh instead
+        bpy.data.pointclouds.remove(pointcloud)
+        mesh_obj = bpy.data.objects.new('numpy point cloud object', numpyMesh(P, [], name = 'numpy point cloud'))
+        bpy.context.scene.collection.objects.link(mesh_obj)
+        bpy.ops.object.select_all(action = 'DESELECT')
+        mesh_obj.select_set(True)
+        bpy.context.view_layer.objects.active = mesh_obj
+        bpy.ops.object.convert(target = 'POINTCLOUD')
+        pc_obj = bpy.context.view_layer.objects.active
+        pointcloud = pc_obj.data
+
+    setAttribute(pointcloud, 'position', P, type = 'FLOAT_VECTOR', domain = 'POINT')
+    setAttribute(pointcloud, 'radius', np.broadcast_to(radius, (nP,)), type = 'FLOAT', domain = 'POINT')
+    if point_colors is not None:
+        setAttribute(pointcloud, 'Col', point_colors, type = 'FLOAT_COLOR', domain = 'POINT')
+
+    pc_obj.location = location
+    pc_obj.rotation_euler = angle
+    pc_obj.scale = scale
+    bpy.context.view_layer.update()
+    return pc_obj
@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
+import mathutils
 import numpy as np
+from . downsamplePoints import downsamplePoints, downsamplingSpacing
 
-def readNumpyPoints(P,location,rotation_euler,scale,point_colors=None):
+def readNumpyPoints(P,location,rotation_euler,scale,point_colors=None,downsample=None,spacing=None,cam=None,pixelSpacing=1.0):
     """
     this function creates a blender mesh from numpy array
 
@@ -24,12 +26,16 @@ def readNumpyPoints(P,location,rotation_euler,scale,point_colors=None):
     rotation: (3,) long tuple of rotation angles (same values as UI)
     scale: (3,) long tuple of per-axis mesh scaling (same values as UI)
     point_colors: (optional) |V|x3 list of point colors, each row is a rgb color between [0,1]
+    downsample: (optional) 'voxel' or 'poisson' to thin out the points before building the mesh (see downsamplePoints)
+    spacing: target point spacing of the downsampling, in the units of P
+    cam: (optional) bpy.object of the camera, used instead of spacing to aim for pixelSpacing pixels between points
+    pixelSpacing: target point spacing in pixels (with cam)
 
     Output
     mesh_obj a blender object
 
     Note
-    We should update this structure (using a mesh to encode point clouds) when the PointCloud data becomes mature.
+    This encodes the point cloud as a vertex-only mesh. See readNumpyPointCloud for a native blender point cloud that cycles renders without the mesh-to-points modifier.
 
     """
     x = rotation_euler[0] * 1.0 / 180.0 * np.pi 
@@ -37,6 +43,12 @@ def readNumpyPoints(P,location,rotation_euler,scale,point_colors=None):
     z = rotation_euler[2] * 1.0 / 180.0 * np.pi 
     angle = (x,y,z)
 
+    if downsample is not None:
+        if spacing is None:
+            matrix = mathutils.Matrix.LocRotScale(mathutils.Vector(location), mathutils.Euler(angle), mathutils.Vector(scale))
+            spacing = downsamplingSpacing(P, cam, pixelSpacing, matrix)
+        P, point_colors = downsamplePoints(P, downsample, spacing, point_colors)
+
     mesh = bpy.data.meshes.new(name='numpy point cloud')
     # F = [np.arange(P.shape[0])] # the face of a point cloud is a single large polygonal face because blender mesh only support face colors 
     mesh.from_pydata(P,[],[])
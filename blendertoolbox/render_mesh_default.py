@@ -12,17 +12,8 @@ from . setLight_sun import setLight_sun
 from . setLight_ambient import setLight_ambient
 from . shadowThreshold import shadowThreshold
 from . renderImage import renderImage
-
-class colorObj(object):
-    def __init__(self, RGBA, \
-    H = 0.5, S = 1.0, V = 1.0,\
-    B = 0.0, C = 0.0):
-        self.H = H # hue
-        self.S = S # saturation
-        self.V = V # value
-        self.RGBA = RGBA
-        self.B = B # birghtness
-        self.C = C # contrast
+from . meshNormals import setShading
+from . colorObj import colorObj
 
 def render_mesh_default(args):
   ## initialize blender
@@ -49,14 +40,14 @@ def render_mesh_default(args):
 
   ## set shading (uncomment one of them)
   if args["shading"] == "smooth":
-    bpy.ops.object.shade_smooth() 
+    setShading(mesh, True, None if mesh.data.has_custom_normals else 'area')
   elif args["shading"] == "flat":
-    bpy.ops.object.shade_flat() 
+    setShading(mesh, False)
   else:
     raise ValueError("shading should be either flat or smooth in lazy pipeline")
 
-  ## subdivision
-  subdivision(mesh, level = args["subdivision_iteration"])
+  ## subdivision, applied once and cached (also on disk with "cache_folder") instead of a modifier evaluated at every update
+  subdivision(mesh, level = args["subdivision_iteration"], apply = True, cacheFolder = args.get("cache_folder", None))
 
   ## default render as plastic
   RGB = args["mesh_RGB"]
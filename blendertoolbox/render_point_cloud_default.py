@@ -1,9 +1,12 @@
-import os, bpy
+import os, bpy, mathutils
 import numpy as np
 
 from . blenderInit import blenderInit
 from . readMesh import readMesh
 from . readNumpyPoints import readNumpyPoints
+from . readNumpyPointCloud import readNumpyPointCloud
+from . pointCloudOctree import readPointCloudOctree
+from . downsamplePoints import downsamplePoints, downsamplingSpacing
 from . setMat_pointCloud import setMat_pointCloud
 from . invisibleGround import invisibleGround
 from . setCamera import setCamera
@@ -11,17 +14,7 @@ from . setLight_sun import setLight_sun
 from . setLight_ambient import setLight_ambient
 from . shadowThreshold import shadowThreshold
 from . renderImage import renderImage
-
-class colorObj(object):
-    def __init__(self, RGBA, \
-    H = 0.5, S = 1.0, V = 1.0,\
-    B = 0.0, C = 0.0):
-        self.H = H # hue
-        self.S = S # saturation
-        self.V = V # value
-        self.RGBA = RGBA
-        self.B = B # birghtness
-        self.C = C # contrast
+from . colorObj import colorObj
 
 def render_point_cloud_default(args):
   ## initialize blender
@@ -32,6 +25,12 @@ def render_point_cloud_default(args):
   use_GPU = True
   blenderInit(imgRes_x, imgRes_y, numSamples, exposure, use_GPU)
 
+  ## set camera 
+  camLocation = (3, 0, 2)
+  lookAtLocation = (0,0,0.5)
+  focalLength = 45 # (UI: click camera > Object Data > Focal Length)
+  cam = setCamera(camLocation, lookAtLocation, focalLength)
+
   ## read mesh
   location = args["mesh_position"]
   rotation = args["mesh_rotation"]
@@ -39,11 +38,23 @@ def render_point_cloud_default(args):
   if "mesh_path" in args:
     meshPath = args["mesh_path"]
     mesh = readMesh(meshPath, location, rotation, scale)
+  elif "octree_path" in args: # out-of-core point cloud written by writePointCloudOctree, only the nodes the camera needs are loaded
+    mesh = readPointCloudOctree(args["octree_path"], cam, location, rotation, scale, args.get("pixel_spacing", 2.0), args.get("max_points", None), args["point_size"])
   elif "mesh_path" not in args and "vertices" in args:
     P = args["vertices"]
-    mesh = readNumpyPoints(P,location,rotation,scale)
+    if "downsample" in args: # 'voxel' or 'poisson', spacing in world units or in pixels of the camera
+      spacing = args.get("downsample_spacing", None)
+      if spacing is None:
+        angle = [a / 180.0 * np.pi for a in rotation]
+        matrix = mathutils.Matrix.LocRotScale(mathutils.Vector(location), mathutils.Euler(angle), mathutils.Vector(scale))
+        spacing = downsamplingSpacing(P, cam, args.get("pixel_spacing", 1.0), matrix)
+      P, _ = downsamplePoints(P, args["downsample"], spacing)
+    if args.get("native_point_cloud", False): # blender point cloud, no mesh-to-points modifier
+      mesh = readNumpyPointCloud(P,location,rotation,scale,args["point_size"])
+    else:
+      mesh = readNumpyPoints(P,location,rotation,scale)
   else:
-    raise ValueError("one should provide either [mesh_path] or [vertices, faces] in the args")   
+    raise ValueError("one should provide either [mesh_path], [octree_path] or [vertices, faces] in the args")   
 
   ## default render for point cloud
   RGB = args["mesh_RGB"]
@@ -55,12 +66,6 @@ def render_point_cloud_default(args):
   ## set invisible plane (shadow catcher)
   invisibleGround(shadowBrightness=0.9)
 
-  ## set camera 
-  camLocation = (3, 0, 2)
-  lookAtLocation = (0,0,0.5)
-  focalLength = 45 # (UI: click camera > Object Data > Focal Length)
-  cam = setCamera(camLocation, lookAtLocation, focalLength)
-
   ## set light
   lightAngle = args["light_angle"]
   strength = 2
@@ -0,0 +1,100 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+
+# name of the foreach_set property and numpy dtype for each attribute type
+ATTRIBUTE_FIELDS = {
+    'FLOAT': ('value', np.float32, 1),
+    'INT': ('value', np.int32, 1),
+    'INT8': ('value', np.int8, 1),
+    'BOOLEAN': ('value', bool, 1),
+    'FLOAT2': ('vector', np.float32, 2),
+    'FLOAT_VECTOR': ('vector', np.float32, 3),
+    'FLOAT_COLOR': ('color', np.float32, 4),
+    'BYTE_COLOR': ('color', np.float32, 4),
+}
+
+def setAttribute(data, name, values, type = 'FLOAT', domain = 'POINT'):
+    """
+    This function writes a numpy array into a generic attribute of a mesh/curves/point cloud datablock in one bulk call
+
+    Inputs
+    data: bpy mesh, curves, or point cloud datablock (e.g., mesh_obj.data)
+    name: name of the attribute (e.g., "Col" for the color read by the setMat_VColor family)
+    values: |D| or |D|xk numpy array, one row per element of the domain
+    type: attribute type, one of the keys of ATTRIBUTE_FIELDS
+    domain: attribute domain, e.g. 'POINT', 'EDGE', 'FACE', 'CORNER', 'CURVE', 'INSTANCE'
+
+    Outputs
+    attr: the blender attribute
+    """
+    field, dtype, width = ATTRIBUTE_FIELDS[type]
+    values = np.asarray(values, dtype = dtype)
+    if width > 1:
+        values = values.reshape(values.shape[0], -1)
+        if width == 4 and values.shape[1] == 3: # rgb -> rgba
+            values = np.concatenate((values, np.ones((values.shape[0], 1), dtype = dtype)), axis = 1)
+        if values.shape[1] != width:
+            raise ValueError('Error in "setAttribute": ' + type + ' attributes need ' + str(width) + ' values per element')
+
+    attr = data.attributes.get(name)
+    if attr is not None and (attr.data_type != type or attr.domain != domain):
+        data.attributes.remove(attr)
+        attr = None
+    if attr is None:
+        attr = data.attributes.new(name = name, type = type, domain = domain)
+    if len(attr.data) * width != values.size:
+        raise ValueError('Error in "setAttribute": attribute "' + name + '" expects ' + str(len(attr.data)) + ' elements on the ' + domain + ' domain')
+    attr.data.foreach_set(field, np.ascontiguousarray(values).ravel())
+    return attr
+
+def getAttribute(data, name):
+    """
+    this function reads a generic attribute of a mesh/curves/point cloud datablock into a numpy array in one bulk call
+
+    Inputs
+    data: bpy mesh, curves, or point cloud datablock (e.g., mesh_obj.data)
+    name: name of the attribute
+
+    Outputs
+    values: |D| or |D|xk numpy array, one row per element of the domain of the attribute
+    """
+    attr = data.attributes.get(name)
+    if attr is None or attr.data_type not in ATTRIBUTE_FIELDS:
+        raise ValueError('Error in "getAttribute": no attribute "' + name + '" of a supported type')
+    field, dtype, width = ATTRIBUTE_FIELDS[attr.data_type]
+    values = np.zeros(len(attr.data) * width, dtype = dtype)
+    attr.data.foreach_get(field, values)
+    return values.reshape(-1, width) if width > 1 else values
+
+def meshAttributes(data):
+    """
+    returns the generic point, face and face corner attributes of a mesh datablock (vertex colors, uv maps, ...) as a dict of numpy arrays keyed by "DOMAIN:TYPE:name", e.g. to store them with the geometry in an .npz. Internal attributes (names starting with ".", position, face smoothness and material index) are left out
+    """
+    arrays = {}
+    for attr in data.attributes:
+        if attr.name.startswith('.') or attr.name in ('position', 'sharp_face', 'material_index'):
+            continue
+        if attr.domain in ('POINT', 'FACE', 'CORNER') and attr.data_type in ATTRIBUTE_FIELDS:
+            arrays[attr.domain + ':' + attr.data_type + ':' + attr.name] = getAttribute(data, attr.name)
+    return arrays
+
+def setMeshAttributes(data, arrays):
+    """
+    writes attributes returned by meshAttributes back into a mesh datablock with matching element counts. Entries of arrays whose key is not of the form "DOMAIN:TYPE:name" are ignored, so a whole cache dict can be passed
+    """
+    for key, values in arrays.items():
+        parts = key.split(':', 2)
+        if len(parts) == 3 and parts[1] in ATTRIBUTE_FIELDS:
+            setAttribute(data, parts[2], values, parts[1], parts[0])
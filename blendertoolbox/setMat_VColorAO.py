@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
+from . materialCache import cachedMaterial
 
+@cachedMaterial
 def setMat_VColorAO(mesh, meshVColor, AOPercent):
     mat = bpy.data.materials.new('MeshMaterial')
     mesh.data.materials.append(mat)
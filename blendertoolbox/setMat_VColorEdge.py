@@ -12,67 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
+from . materialCache import cachedMaterial
+from . nodeGroups import nodeGroup, groupMaterial, colorInputs, colorValues, addColorAdjust, addEdge
 
-def setMat_VColorEdge(mesh, meshVColor, edgeThickness, edgeColor):
-	mat = bpy.data.materials.new('MeshMaterial')
-	mesh.data.materials.append(mat)
-	mesh.active_material = mat
-	mat.use_nodes = True
-	tree = mat.node_tree
-
+def buildVColorEdge(tree, groupIn, groupOut):
 	# read vertex attribute
-	tree.nodes.new('ShaderNodeAttribute')
-	tree.nodes[-1].attribute_name = "Col"
-	HSVNode = tree.nodes.new('ShaderNodeHueSaturation')
-	tree.links.new(tree.nodes["Attribute"].outputs['Color'], HSVNode.inputs['Color'])
-	HSVNode.inputs['Saturation'].default_value = meshVColor.S
-	HSVNode.inputs['Value'].default_value = meshVColor.V
-	HSVNode.inputs['Hue'].default_value = meshVColor.H
-	HSVNode.location.x -= 200
-
-	# set color brightness/contrast
-	BCNode = tree.nodes.new('ShaderNodeBrightContrast')
-	BCNode.inputs['Bright'].default_value = meshVColor.B
-	BCNode.inputs['Contrast'].default_value = meshVColor.C
-	BCNode.location.x -= 400
+	attribute = tree.nodes.new('ShaderNodeAttribute')
+	attribute.attribute_name = "Col"
+	attribute.location.x = -1200
+	attribute.location.y = 300
 
-	# set principled BSDF
-	tree.nodes["Principled BSDF"].inputs['Roughness'].default_value = 1.0
-	tree.nodes["Principled BSDF"].inputs['Sheen Tint'].default_value = 0
-
-	# link VColor to principle BSDF
-	tree.links.new(HSVNode.outputs['Color'], BCNode.inputs['Color'])
-	tree.links.new(BCNode.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
+	# set principled BSDF, colored by the adjusted vertex colors
+	PRIN = tree.nodes.new('ShaderNodeBsdfPrincipled')
+	PRIN.inputs['Roughness'].default_value = 1.0
+	PRIN.inputs['Sheen Tint'].default_value = [0, 0, 0, 1]
+	tree.links.new(addColorAdjust(tree, groupIn, attribute.outputs['Color']), PRIN.inputs['Base Color'])
 
 	# add edge wire frame
-	wire = tree.nodes.new(type="ShaderNodeWireframe")
-	wire.inputs[0].default_value = edgeThickness
-	wire.location.x -= 600
-	wire.location.y += 200
-	mat_wire = tree.nodes.new(type="ShaderNodeBsdfDiffuse")
-	HSVNode = tree.nodes.new('ShaderNodeHueSaturation')
-	HSVNode.inputs['Color'].default_value = edgeColor.RGBA
-	HSVNode.inputs['Saturation'].default_value = edgeColor.S
-	HSVNode.inputs['Value'].default_value = edgeColor.V
-	HSVNode.inputs['Hue'].default_value = edgeColor.H
-	HSVNode.location.x -= 200
-	HSVNode.location.y += 200
-	# set color brightness/contrast
-	BCNode = tree.nodes.new('ShaderNodeBrightContrast')
-	BCNode.inputs['Bright'].default_value = edgeColor.B
-	BCNode.inputs['Contrast'].default_value = edgeColor.C
-	BCNode.location.x -= 400
-	BCNode.location.y += 200
-
-	tree.links.new(HSVNode.outputs['Color'],BCNode.inputs['Color'])
-	tree.links.new(BCNode.outputs['Color'],mat_wire.inputs['Color'])
+	tree.links.new(addEdge(tree, groupIn, PRIN.outputs['BSDF']), groupOut.inputs['Shader'])
 
-
-	MIX = tree.nodes.new('ShaderNodeMixShader')
-	tree.links.new(wire.outputs[0], MIX.inputs[0])
-	tree.links.new(mat_wire.outputs['BSDF'], MIX.inputs[2])
-	tree.links.new(tree.nodes["Principled BSDF"].outputs['BSDF'], MIX.inputs[1])
-
-	tree.links.new(MIX.outputs['Shader'], tree.nodes['Material Output'].inputs['Surface'])
-
-	
+@cachedMaterial
+def setMat_VColorEdge(mesh, meshVColor, edgeThickness, edgeColor):
+	# the look is a node group built once per session, the material only holds its input values
+	inputs = colorInputs(withColor = False) + [('Edge Thickness', 'NodeSocketFloat', 0.01)] + colorInputs('Edge ')
+	group = nodeGroup('VColorEdge', 'VColor Edge', inputs, buildVColorEdge)
+	values = colorValues(meshVColor, withColor = False)
+	values.update(colorValues(edgeColor, 'Edge '))
+	values['Edge Thickness'] = edgeThickness
+	groupMaterial(mesh, group, values)
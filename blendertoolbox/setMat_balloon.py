@@ -12,56 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
+from . materialCache import cachedMaterial
+from . nodeGroups import nodeGroup, groupMaterial, colorInputs, colorValues, addColorAdjust, addAmbientOcclusion
 
-def setMat_balloon(mesh, meshColor, AOStrength = 0.0):
-	# reference: https://www.youtube.com/watch?v=8KZ6M-FeC8g
-
-	mat = bpy.data.materials.new('MeshMaterial')
-	mesh.data.materials.append(mat)
-	mesh.active_material = mat
-	mat.use_nodes = True
-	tree = mat.node_tree
+def buildBalloon(tree, groupIn, groupOut):
+	# color with ambient occlusion
+	color = addAmbientOcclusion(tree, groupIn, addColorAdjust(tree, groupIn))
 
 	# set principled BSDF
-	tree.nodes["Principled BSDF"].inputs['Specular IOR Level'].default_value = 0.5
-	tree.nodes["Principled BSDF"].inputs['Roughness'].default_value = 0.3
-	tree.nodes["Principled BSDF"].inputs['Sheen Tint'].default_value = [0.5, 0.5, 0.5, 1] # expects a sequence now
-	tree.nodes["Principled BSDF"].inputs['Coat Roughness'].default_value = 0.3
-	tree.nodes["Principled BSDF"].inputs['Coat Weight'].default_value = 1
-
-	# add Ambient Occlusion
-	tree.nodes.new('ShaderNodeAmbientOcclusion')
-	tree.nodes.new('ShaderNodeGamma')
-
-	MIXRGB = tree.nodes.new('ShaderNodeMixRGB')
-	MIXRGB.blend_type = 'MULTIPLY'
-	tree.nodes["Gamma"].inputs["Gamma"].default_value = AOStrength
-	tree.nodes["Ambient Occlusion"].inputs["Distance"].default_value = 10.0
-	tree.nodes["Gamma"].location.x -= 600
-
-	# set color using Hue/Saturation node
-	HSVNode = tree.nodes.new('ShaderNodeHueSaturation')
-	HSVNode.inputs['Color'].default_value = meshColor.RGBA
-	HSVNode.inputs['Saturation'].default_value = meshColor.S
-	HSVNode.inputs['Value'].default_value = meshColor.V
-	HSVNode.inputs['Hue'].default_value = meshColor.H
-	HSVNode.location.x -= 200
-
-	# set color brightness/contrast
-	BCNode = tree.nodes.new('ShaderNodeBrightContrast')
-	BCNode.inputs['Bright'].default_value = meshColor.B
-	BCNode.inputs['Contrast'].default_value = meshColor.C
-	BCNode.location.x -= 400
-
-	# link all the nodes
-	tree.links.new(HSVNode.outputs['Color'], BCNode.inputs['Color'])
-	tree.links.new(BCNode.outputs['Color'], tree.nodes['Ambient Occlusion'].inputs['Color'])
-
-	tree.links.new(tree.nodes["Ambient Occlusion"].outputs['Color'], MIXRGB.inputs['Color1'])
-	tree.links.new(tree.nodes["Ambient Occlusion"].outputs['AO'], tree.nodes['Gamma'].inputs['Color'])
-	tree.links.new(tree.nodes["Gamma"].outputs['Color'], MIXRGB.inputs['Color2'])
-	tree.links.new(MIXRGB.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
-
+	PRIN = tree.nodes.new('ShaderNodeBsdfPrincipled')
+	PRIN.inputs['Specular IOR Level'].default_value = 0.5
+	PRIN.inputs['Roughness'].default_value = 0.3
+	PRIN.inputs['Sheen Tint'].default_value = [0.5, 0.5, 0.5, 1] # expects a sequence now
+	PRIN.inputs['Coat Roughness'].default_value = 0.3
+	PRIN.inputs['Coat Weight'].default_value = 1
+	tree.links.new(color, PRIN.inputs['Base Color'])
 
 	# add transparent
 	TRAN = tree.nodes.new('ShaderNodeBsdfTransparent')
@@ -72,9 +37,6 @@ def setMat_balloon(mesh, meshColor, AOStrength = 0.0):
 	LAY.inputs[0].default_value = 0.3
 	DIF = tree.nodes.new('ShaderNodeBsdfDiffuse')
 
-
-
-	PRIN = tree.nodes["Principled BSDF"]
 	tree.links.new(PRIN.outputs[0], MIX.inputs[2])
 	tree.links.new(TRAN.outputs[0], MIX2.inputs[1])
 	tree.links.new(TRAN.outputs[0], MIX2.inputs[2])
@@ -82,9 +44,16 @@ def setMat_balloon(mesh, meshColor, AOStrength = 0.0):
 	tree.links.new(LAY.outputs[1], MIX.inputs[0])
 	tree.links.new(MIX2.outputs[0], MIX.inputs[1])
 
-	tree.links.new(MIXRGB.outputs['Color'], TRAN.inputs[0])
-	tree.links.new(MIXRGB.outputs['Color'], DIF.inputs[0])
+	tree.links.new(color, TRAN.inputs[0])
+	tree.links.new(color, DIF.inputs[0])
 
-	tree.links.new(MIX.outputs[0], tree.nodes['Material Output'].inputs['Surface'])
+	tree.links.new(MIX.outputs[0], groupOut.inputs['Shader'])
 
-	
\ No newline at end of file
+@cachedMaterial
+def setMat_balloon(mesh, meshColor, AOStrength = 0.0):
+	# reference: https://www.youtube.com/watch?v=8KZ6M-FeC8g
+	# the look is a node group built once per session, the material only holds its input values
+	group = nodeGroup('balloon', 'Balloon', colorInputs() + [('AO Strength', 'NodeSocketFloat', 0.0)], buildBalloon)
+	values = colorValues(meshColor)
+	values['AO Strength'] = AOStrength
+	groupMaterial(mesh, group, values)
@@ -13,7 +13,9 @@
 # limitations under the License.
 import bpy
 from . initColorNode import initColorNode
+from . materialCache import cachedMaterial
 
+@cachedMaterial
 def setMat_crackedCeramic(mesh, meshColor, crackScale, crackDisp):
     mat = bpy.data.materials.new('MeshMaterial')
     mesh.data.materials.append(mat)
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy, os
+from . materialCache import cachedMaterial
 
+@cachedMaterial
 def setMat_edgeWithTexture(mesh, edgeThickness, edgeRGBA, texturePath, textureHSVBC):
 
 	meshRGBA = (1,1,1,0)
@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
+from . materialCache import cachedMaterial
 
 # follow the instruction by Ned Poreyra
+
+@cachedMaterial
 def setMat_muscle(mesh, meshColor, fiberShape, bumpStrength = 0.4, wrinkleness = 0.03, maxBrightness = 1.0, minBrightness = 0.1):
     mat = bpy.data.materials.new('MeshMaterial')
     mesh.data.materials.append(mat)
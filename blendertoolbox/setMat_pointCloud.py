@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
+import numpy as np
 from mathutils import Vector
+from . setAttribute import setAttribute
 
 def setMat_pointCloud(mesh, \
                 meshColor, \
@@ -58,6 +60,14 @@ def setMat_pointCloud(mesh, \
     tree.links.new(tree.nodes["Gamma"].outputs['Color'], MIXRGB.inputs['Color2'])
     tree.links.new(MIXRGB.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
 
+    # a native point cloud (readNumpyPointCloud) is rendered as is, no geometry node needed
+    if mesh.type == 'POINTCLOUD':
+        mesh.data.materials.append(mat)
+        mesh.active_material = mat
+        if ptSize is not None: # None keeps the per point radii
+            setAttribute(mesh.data, 'radius', np.full(len(mesh.data.points), ptSize), type = 'FLOAT', domain = 'POINT')
+        return
+
     # turn a mesh into point cloud using geometry node
     mesh.select_set(True)
     bpy.context.view_layer.objects.active = mesh
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy
+import numpy as np
 from mathutils import Vector
+from . setAttribute import setAttribute
 
 def setMat_pointCloudColored(mesh, meshColor, ptSize): 
     mat = bpy.data.materials.new('MeshMaterial')
@@ -43,6 +45,12 @@ def setMat_pointCloudColored(mesh, meshColor, ptSize):
     tree.links.new(HSVNode.outputs['Color'], BCNode.inputs['Color'])
     tree.links.new(BCNode.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
 
+    # a native point cloud (readNumpyPointCloud) is rendered as is, no geometry node needed
+    if mesh.type == 'POINTCLOUD':
+        if ptSize is not None: # None keeps the per point radii
+            setAttribute(mesh.data, 'radius', np.full(len(mesh.data.points), ptSize), type = 'FLOAT', domain = 'POINT')
+        return
+
     # turn a mesh into point cloud using geometry node
     mesh.select_set(True)
     bpy.context.view_layer.objects.active = mesh
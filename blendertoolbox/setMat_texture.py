@@ -13,7 +13,9 @@
 # limitations under the License.
 import bpy
 import os
+from . materialCache import cachedMaterial
 
+@cachedMaterial
 def setMat_texture(mesh, texturePath, meshColor, alpha= 1.0, colorspace_settting='sRGB'):
     mat = bpy.data.materials.new('MeshMaterial')
     mesh.data.materials.append(mat)
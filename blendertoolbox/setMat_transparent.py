@@ -13,8 +13,17 @@
 # limitations under the License.
 import bpy
 from . initColorNode import initColorNode
+from . materialCache import cachedMaterial
 
 def setMat_transparent(mesh, meshColor, alpha, transmission, roughness = 0.7, visible_shadow=True):
+	mat = transparentMaterial(mesh, meshColor, alpha, transmission, roughness)
+
+	# whether to have shadows (set on the object, so it runs for shared materials too)
+	mesh.visible_shadow = visible_shadow
+	return mat
+
+@cachedMaterial
+def transparentMaterial(mesh, meshColor, alpha, transmission, roughness):
 	mat = bpy.data.materials.new('MeshMaterial')
 	mesh.data.materials.append(mat)
 	mesh.active_material = mat
@@ -45,14 +54,3 @@ def setMat_transparent(mesh, meshColor, alpha, transmission, roughness = 0.7, vi
 	# link all the nodes
 	tree.links.new(HSVNode.outputs['Color'], BCNode.inputs['Color'])
 	tree.links.new(BCNode.outputs['Color'], tree.nodes['Principled BSDF'].inputs['Base Color'])
-
-	# whether to have shadows
-	mesh.visible_shadow = visible_shadow
-
-	
-
-
-
-	
-
-	
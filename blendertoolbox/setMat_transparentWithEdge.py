@@ -13,9 +13,15 @@
 # limitations under the License.
 import bpy
 from . initColorNode import initColorNode
+from . materialCache import cachedMaterial
 
 def setMat_transparentWithEdge(mesh, edgeThickness, edgeColor, meshColor, transparency, transmission):
+	# no shadows (set on the object, so it runs for shared materials too)
 	mesh.cycles_visibility.shadow = False
+	return transparentWithEdgeMaterial(mesh, edgeThickness, edgeColor, meshColor, transparency, transmission)
+
+@cachedMaterial
+def transparentWithEdgeMaterial(mesh, edgeThickness, edgeColor, meshColor, transparency, transmission):
 	mat = bpy.data.materials.new('MeshMaterial')
 	mesh.data.materials.append(mat)
 	mesh.active_material = mat
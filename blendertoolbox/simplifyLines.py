@@ -0,0 +1,287 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from . cameraProjection import worldToPixel, pixelsPerUnit
+
+def weldSegments(p1List, p2List, tol = None):
+    """
+    this function merges coincident segment end points into shared vertices
+
+    Inputs
+    p1List: |E|x3 array of segment start points
+    p2List: |E|x3 array of segment end points
+    tol: end points closer than tol (per axis) are merged (default: 1e-6 of the bounding box diagonal)
+
+    Outputs
+    V: |V|x3 array of vertex locations
+    E: |E|x2 array of vertex indices of every segment
+    """
+    p1List = np.asarray(p1List, dtype = float).reshape(-1, 3)
+    p2List = np.asarray(p2List, dtype = float).reshape(-1, 3)
+    ends = np.concatenate((p1List, p2List))
+    if tol is None:
+        diag = np.linalg.norm(ends.max(axis = 0) - ends.min(axis = 0)) if ends.shape[0] else 0.0
+        tol = 1e-6 * diag if diag > 0 else 1e-12
+    keys = np.round(ends / tol).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis = 0, return_index = True, return_inverse = True)
+    inverse = inverse.reshape(-1)
+    V = ends[first]
+    E = np.stack((inverse[:p1List.shape[0]], inverse[p1List.shape[0]:]), axis = 1)
+    return V, E
+
+def chainSegments(V, E):
+    """
+    this function chains segments into polylines that pass through every degree-2 vertex. Polylines end at vertices of any other degree; closed loops of degree-2 vertices repeat their first point at the end. Degenerate and duplicate segments are dropped. All chains and loops are walked in parallel, so the number of numpy passes does not grow with the number of polylines.
+
+    Inputs
+    V: |V|x3 array of vertex locations
+    E: |E|x2 array of vertex indices of every segment
+
+    Outputs
+    P: |P|x3 array of polyline points (all polylines concatenated)
+    offsets: |C|+1 array, polyline c owns points P[offsets[c]:offsets[c+1]]
+    """
+    V = np.asarray(V, dtype = float).reshape(-1, 3)
+    chainVertices, offsets = chainSegmentIndices(E, V.shape[0])
+    return V[chainVertices], offsets
+
+def chainSegmentIndices(E, numVertices):
+    """
+    same as chainSegments, but returns the vertex indices of the polyline points (|P| array) instead of their locations
+    """
+    E = np.asarray(E, dtype = np.int64).reshape(-1, 2)
+    E = E[E[:,0] != E[:,1]]
+    _, unique = np.unique(E.min(axis = 1) * numVertices + E.max(axis = 1), return_index = True)
+    E = E[np.sort(unique)]
+    nE = E.shape[0]
+    if nE == 0:
+        return np.zeros(0, dtype = np.int64), np.zeros(1, dtype = np.int64)
+
+    # half edge h = 2e + side sits at vertex ends[h]; at a degree-2 vertex it is paired with the other half edge there
+    ends = E.reshape(-1)
+    degree = np.bincount(ends, minlength = numVertices)
+    order = np.argsort(ends, kind = 'stable')
+    sortedEnds = ends[order]
+    pair = np.flatnonzero((sortedEnds[:-1] == sortedEnds[1:]) & (degree[sortedEnds[:-1]] == 2))
+    partner = np.full(2 * nE, -1, dtype = np.int64)
+    partner[order[pair]] = order[pair + 1]
+    partner[order[pair + 1]] = order[pair]
+
+    # walk all open chains in parallel, starting from every half edge that is not paired
+    start = np.flatnonzero(partner == -1)
+    chain = [np.arange(start.shape[0])]
+    vertex = [ends[start]]
+    visited = np.zeros(nE, dtype = bool)
+    active = np.arange(start.shape[0])
+    current = start.copy()
+    last = np.zeros(start.shape[0], dtype = np.int64)
+    while active.shape[0] > 0:
+        exit = current ^ 1
+        visited[current >> 1] = True
+        chain.append(active)
+        vertex.append(ends[exit])
+        last[active] = exit
+        current = partner[exit]
+        keep = current != -1
+        active = active[keep]
+        current = current[keep]
+    # every open chain was walked from both of its ends, keep one direction
+    chain = np.concatenate(chain)
+    vertex = np.concatenate(vertex)
+    forward = start < last
+    pieces = []
+    counts = []
+    if start.shape[0] > 0:
+        # points of a chain were appended in walking order, a stable sort by chain keeps that order
+        order = np.argsort(chain, kind = 'stable')
+        chain = chain[order]
+        vertex = vertex[order]
+        mask = forward[chain]
+        pieces.append(vertex[mask])
+        counts.append(np.bincount(chain[mask], minlength = start.shape[0])[forward])
+
+    # the remaining segments form closed loops of degree-2 vertices. A state is the half edge a walk enters through and
+    # its successor is the next one entered, so every loop gives one cycle of states per direction
+    rest = np.flatnonzero(~visited)
+    if rest.shape[0] > 0:
+        states = np.concatenate((2 * rest, 2 * rest + 1))
+        nS = states.shape[0]
+        index = np.full(2 * nE, -1, dtype = np.int64)
+        index[states] = np.arange(nS)
+        succ = index[partner[states ^ 1]]
+        rounds = int(np.ceil(np.log2(max(nS, 2)))) + 1
+
+        # pointer jumping: label every state with the smallest state of its cycle
+        label = states.copy()
+        jump = succ.copy()
+        for _ in range(rounds):
+            label = np.minimum(label, label[jump])
+            jump = jump[jump]
+
+        # list ranking: distance of every state to the one before the label, where the cycle is cut
+        tail = states[succ] == label
+        dist = np.where(tail, 0, 1)
+        jump = np.where(tail, np.arange(nS), succ)
+        for _ in range(rounds):
+            dist = dist + dist[jump]
+            jump = jump[jump]
+
+        # keep one direction per loop, start at its label and close it by repeating the first point
+        keep = label < label[index[label ^ 1]]
+        order = np.lexsort((-dist[keep], label[keep]))
+        loopLabel = label[keep][order]
+        loopVertex = ends[states[keep][order]]
+        first = np.flatnonzero(np.concatenate(([True], loopLabel[1:] != loopLabel[:-1])))
+        loopSizes = np.diff(np.append(first, loopLabel.shape[0]))
+        pieces.append(np.insert(loopVertex, np.append(first[1:], loopLabel.shape[0]), loopVertex[first]))
+        counts.append(loopSizes + 1)
+
+    counts = np.concatenate(counts) if counts else np.zeros(0, dtype = np.int64)
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    chainVertices = np.concatenate(pieces) if pieces else np.zeros(0, dtype = np.int64)
+    return chainVertices, offsets
+
+def simplifyPolylines(P, offsets, epsilon):
+    """
+    this function simplifies all polylines at once with Ramer-Douglas-Peucker. Every round splits all pending intervals in one vectorized pass, so the number of rounds is the depth of the recursion rather than the number of points.
+
+    Inputs
+    P: |P|x3 array of polyline points (all polylines concatenated)
+    offsets: |C|+1 array, polyline c owns points P[offsets[c]:offsets[c+1]]
+    epsilon: scalar or |P| array of the allowed deviation (in world units) of every point
+
+    Outputs
+    P: |P'|x3 array of the remaining points
+    offsets: |C|+1 array of the simplified polylines
+    """
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    offsets = np.asarray(offsets, dtype = np.int64)
+    nP = P.shape[0]
+    epsilon = np.broadcast_to(np.asarray(epsilon, dtype = float), (nP,))
+
+    keep = np.zeros(nP, dtype = bool)
+    nonEmpty = offsets[1:] > offsets[:-1]
+    a = offsets[:-1][nonEmpty]
+    b = offsets[1:][nonEmpty] - 1
+    keep[a] = True
+    keep[b] = True
+    while a.shape[0] > 0:
+        counts = b - a - 1
+        pending = counts > 0
+        a, b, counts = a[pending], b[pending], counts[pending]
+        if a.shape[0] == 0:
+            break
+        groupStart = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        group = np.repeat(np.arange(a.shape[0]), counts)
+        idx = a[group] + np.arange(group.shape[0]) - groupStart[group] + 1
+
+        # distance of every interior point to the chord of its interval
+        A = P[a[group]]
+        AB = P[b[group]] - A
+        t = np.sum((P[idx] - A) * AB, axis = 1) / np.maximum(np.sum(AB * AB, axis = 1), 1e-300)
+        t = np.clip(t, 0.0, 1.0)
+        score = np.linalg.norm(A + t[:,None] * AB - P[idx], axis = 1) - epsilon[idx]
+
+        best = np.maximum.reduceat(score, groupStart)
+        candidate = np.flatnonzero(score == best[group])
+        _, first = np.unique(group[candidate], return_index = True)
+        split = idx[candidate[first]]
+        split = np.where(best > 0, split, -1)
+        refine = split >= 0
+        a, b, split = a[refine], b[refine], split[refine]
+        keep[split] = True
+        a, b = np.concatenate((a, split)), np.concatenate((split, b))
+
+    counts = np.bincount(np.repeat(np.arange(offsets.shape[0] - 1), offsets[1:] - offsets[:-1])[keep], minlength = offsets.shape[0] - 1)
+    return P[keep], np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+def dropShortSegments(P, offsets, cam, minPixelLength = 1.0, scene = None):
+    """
+    this function removes polyline points so that (roughly) no segment is shorter than minPixelLength pixels in the image of a camera, and removes polylines whose whole image is shorter than that. Segments behind the camera are kept.
+
+    Inputs
+    P: |P|x3 array of polyline points (all polylines concatenated)
+    offsets: |C|+1 array, polyline c owns points P[offsets[c]:offsets[c+1]]
+    cam: bpy.object of the camera
+    minPixelLength: shortest segment length in pixels
+    scene: (optional) scene whose render resolution is used (default: the current scene)
+
+    Outputs
+    P: |P'|x3 array of the remaining points
+    offsets: |C'|+1 array of the remaining polylines
+    """
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    offsets = np.asarray(offsets, dtype = np.int64)
+    nC = offsets.shape[0] - 1
+    lengths = offsets[1:] - offsets[:-1]
+    polyline = np.repeat(np.arange(nC), lengths)
+    uv, depth = worldToPixel(cam, P, scene)
+
+    # pixel arc length along every polyline
+    segLength = np.zeros(P.shape[0])
+    segLength[1:] = np.linalg.norm(uv[1:] - uv[:-1], axis = 1)
+    behind = np.zeros(P.shape[0], dtype = bool)
+    behind[1:] = (depth[1:] <= 0) | (depth[:-1] <= 0)
+    segLength[behind] = 2.0 * minPixelLength
+    first = offsets[:-1][lengths > 0]
+    segLength[first] = 0
+    arc = np.cumsum(segLength)
+    arc -= arc[offsets[:-1]][polyline] if nC > 0 else 0
+
+    # keep a point whenever the arc length crosses the next multiple of minPixelLength
+    bucket = np.floor(arc / minPixelLength)
+    keep = np.ones(P.shape[0], dtype = bool)
+    keep[1:] = bucket[1:] > bucket[:-1]
+    keep[first] = True
+    last = offsets[1:][lengths > 0] - 1
+    keep[last] = True
+
+    # drop polylines that are shorter than a single segment on screen
+    total = np.zeros(nC)
+    total[lengths > 0] = arc[last]
+    keep &= (total >= minPixelLength)[polyline]
+    counts = np.bincount(polyline[keep], minlength = nC)
+    counts = counts[counts > 0]
+    return P[keep], np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+def simplifyLines(p1List, p2List, cam = None, epsilon = None, pixelEpsilon = 0.5, minPixelLength = 1.0, tol = None):
+    """
+    this function turns a set of line segments into fewer, longer polylines before any geometry is built: it welds the segment end points, chains segments through degree-2 vertices, simplifies the chains with Ramer-Douglas-Peucker and (with a camera) drops segments that are shorter than minPixelLength pixels. The result can be drawn with drawPolylines or drawCurves.
+
+    Inputs
+    p1List: |E|x3 array of segment start points
+    p2List: |E|x3 array of segment end points
+    cam: (optional) bpy.object of the camera used for the screen space tolerances
+    epsilon: (optional) world space RDP tolerance (overrides pixelEpsilon)
+    pixelEpsilon: RDP tolerance in pixels, used when a camera is given and epsilon is None
+    minPixelLength: shortest segment length in pixels, used when a camera is given
+    tol: end points closer than tol are merged (default: 1e-6 of the bounding box diagonal)
+
+    Outputs
+    P: |P|x3 array of polyline points (all polylines concatenated)
+    offsets: |C|+1 array, polyline c owns points P[offsets[c]:offsets[c+1]]
+    """
+    V, E = weldSegments(p1List, p2List, tol)
+    P, offsets = chainSegments(V, E)
+    if epsilon is None:
+        if cam is None:
+            # only removes points that are collinear up to round-off
+            epsilon = 1e-9 * np.linalg.norm(P.max(axis = 0) - P.min(axis = 0)) if P.shape[0] else 0.0
+        else:
+            ppu = pixelsPerUnit(cam, P)
+            epsilon = np.where(ppu > 0, pixelEpsilon / np.maximum(ppu, 1e-300), 0.0)
+    P, offsets = simplifyPolylines(P, offsets, epsilon)
+    if cam is not None:
+        P, offsets = dropShortSegments(P, offsets, cam, minPixelLength)
+    return P, offsets
@@ -0,0 +1,171 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+from . numpyMesh import numpyMesh
+
+# the cube with corners c = dx + 2*dy + 4*dz is split into six tetrahedra around the diagonal 0-7, which matches across neighboring cubes
+CUBE_CORNERS = np.array([[0,0,0],[1,0,0],[0,1,0],[1,1,0],[0,0,1],[1,0,1],[0,1,1],[1,1,1]], dtype = np.int64)
+CUBE_TETS = np.array([[0,1,3,7],[0,3,2,7],[0,2,6,7],[0,6,4,7],[0,4,5,7],[0,5,1,7]], dtype = np.int64)
+# for every inside/outside pattern of a tetrahedron (bit i set if corner i is inside), its corners with the outside ones first
+TET_ORDER = np.array([np.argsort([(case >> i) & 1 for i in range(4)], kind = 'stable') for case in range(16)], dtype = np.int64)
+
+def sphereUnionField(centers, radii, resolution = 128, chunkSize = 4000000):
+    """
+    this function samples the distance field of a union of spheres, min_i(|x - c_i| - r_i), on a sparse grid. Only grid points inside the bounding box of a sphere (grown by two cells) are visited, so the work scales with the sphere volumes instead of the whole grid; the sphere-point pairs are generated in chunks of about chunkSize and merged by their grid key.
+
+    Inputs
+    centers: |S|x3 array of sphere centers
+    radii: scalar or |S| array of sphere radii
+    resolution: number of grid cells along the longest side of the bounding box
+    chunkSize: number of sphere-point pairs evaluated at once
+
+    Outputs
+    keys: sorted int64 array of linear grid indices (i + n0*(j + n1*k)) of the sampled points
+    values: distance field value of every sampled point
+    dims: (n0, n1, n2) number of grid points per axis
+    origin: location of grid point (0,0,0)
+    h: grid spacing
+    """
+    centers = np.asarray(centers, dtype = float).reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype = float), (centers.shape[0],))
+    lo = (centers - radii[:,None]).min(axis = 0)
+    hi = (centers + radii[:,None]).max(axis = 0)
+    h = (hi - lo).max() / resolution
+    origin = lo - 2 * h
+    dims = np.ceil((hi - lo) / h).astype(np.int64) + 5
+
+    # grid box of every sphere, grown by two cells
+    boxLo = np.clip(np.floor((centers - radii[:,None] - 2 * h - origin) / h).astype(np.int64), 0, dims - 1)
+    boxHi = np.clip(np.ceil((centers + radii[:,None] + 2 * h - origin) / h).astype(np.int64), 0, dims - 1)
+    boxDims = boxHi - boxLo + 1
+    counts = np.prod(boxDims, axis = 1)
+
+    # split the spheres into chunks of about chunkSize pairs
+    cumulative = np.cumsum(counts)
+    chunkId = (cumulative - counts) // chunkSize
+    bounds = np.flatnonzero(np.diff(chunkId)) + 1
+    bounds = np.concatenate(([0], bounds, [centers.shape[0]]))
+
+    allKeys = []
+    allValues = []
+    for s0, s1 in zip(bounds[:-1], bounds[1:]):
+        sphere = np.repeat(np.arange(s0, s1), counts[s0:s1])
+        local = np.arange(sphere.shape[0]) - np.repeat(cumulative[s0:s1] - counts[s0:s1] - (cumulative[s0] - counts[s0]), counts[s0:s1])
+        nx, ny = boxDims[sphere,0], boxDims[sphere,1]
+        ijk = np.stack((local % nx, (local // nx) % ny, local // (nx * ny)), axis = 1) + boxLo[sphere]
+        value = np.linalg.norm(origin + ijk * h - centers[sphere], axis = 1) - radii[sphere]
+        key = ijk[:,0] + dims[0] * (ijk[:,1] + dims[1] * ijk[:,2])
+        key, value = reduceMin(key, value)
+        allKeys.append(key)
+        allValues.append(value)
+    keys, values = reduceMin(np.concatenate(allKeys), np.concatenate(allValues))
+    return keys, values, dims, origin, h
+
+def reduceMin(keys, values):
+    """
+    returns the sorted unique keys and the smallest value of each key
+    """
+    order = np.argsort(keys, kind = 'stable')
+    keys, values = keys[order], values[order]
+    start = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[start], np.minimum.reduceat(values, start)
+
+def sparseMarchingTetrahedra(keys, values, dims, origin, h):
+    """
+    this function extracts the zero level set of a field sampled on a sparse grid (as returned by sphereUnionField). Grid points that are not sampled are treated as outside. Every cube is split into six tetrahedra; vertices on shared grid edges are merged, so the surface is watertight, and the triangles face the positive side.
+
+    Outputs
+    V: |V|x3 array of vertex locations
+    F: |F|x3 array of triangle indices
+    """
+    keys = np.asarray(keys, dtype = np.int64)
+    values = np.asarray(values, dtype = float)
+    values = np.where(values == 0, 1e-12 * h, values) # keep the surface off the grid points
+    dims = np.asarray(dims, dtype = np.int64)
+    cornerOffset = CUBE_CORNERS[:,0] + dims[0] * (CUBE_CORNERS[:,1] + dims[1] * CUBE_CORNERS[:,2])
+    directions = np.sort(cornerOffset) # every tetrahedron edge goes from a corner to one with larger offset
+    def lookup(key):
+        pos = np.clip(np.searchsorted(keys, key), 0, keys.shape[0] - 1)
+        return np.where(keys[pos] == key, values[pos], np.inf)
+    def gridPoint(key):
+        return origin + h * np.stack((key % dims[0], (key // dims[0]) % dims[1], key // (dims[0] * dims[1])), axis = 1)
+
+    # cubes with a sampled corner 0 and both signs among their corners
+    i, j, k = keys % dims[0], (keys // dims[0]) % dims[1], keys // (dims[0] * dims[1])
+    inGrid = (i < dims[0] - 1) & (j < dims[1] - 1) & (k < dims[2] - 1)
+    cubeKeys = keys[inGrid][:,None] + cornerOffset[None,:]
+    cubeValues = lookup(cubeKeys)
+    inside = cubeValues < 0
+    mixed = inside.any(axis = 1) & ~inside.all(axis = 1)
+    cubeKeys, cubeValues = cubeKeys[mixed], cubeValues[mixed]
+
+    # tetrahedra with both signs
+    tetKeys = cubeKeys[:,CUBE_TETS].reshape(-1, 4)
+    tetValues = cubeValues[:,CUBE_TETS].reshape(-1, 4)
+    inside = tetValues < 0
+    nInside = inside.sum(axis = 1)
+    mixed = (nInside > 0) & (nInside < 4)
+    tetKeys, tetValues, inside, nInside = tetKeys[mixed], tetValues[mixed], inside[mixed], nInside[mixed]
+    case = inside @ np.array([1, 2, 4, 8])
+    o = np.take_along_axis(tetKeys, TET_ORDER[case], axis = 1) # outside corners first
+
+    # every triangle is given by three tetrahedron edges (pairs of grid keys)
+    one = nInside == 1
+    three = nInside == 3
+    two = nInside == 2
+    edgesA = [o[one][:,[3,3,3]], o[three][:,[0,0,0]], o[two][:,[2,2,3]], o[two][:,[2,3,3]]]
+    edgesB = [o[one][:,[0,1,2]], o[three][:,[1,2,3]], o[two][:,[0,1,1]], o[two][:,[0,1,0]]]
+    triTet = np.concatenate((np.flatnonzero(one), np.flatnonzero(three), np.flatnonzero(two), np.flatnonzero(two)))
+    edgesA = np.concatenate(edgesA).reshape(-1)
+    edgesB = np.concatenate(edgesB).reshape(-1)
+
+    # one vertex per grid edge, an edge is its lower grid key and its direction within the cube
+    lower = np.minimum(edgesA, edgesB)
+    direction = np.searchsorted(directions, np.maximum(edgesA, edgesB) - lower)
+    edgeIds, F = np.unique(lower * 8 + direction, return_inverse = True)
+    F = F.reshape(-1, 3)
+    uniqueEdges = np.stack((edgeIds // 8, edgeIds // 8 + directions[edgeIds % 8]), axis = 1)
+    valueA, valueB = lookup(uniqueEdges[:,0]), lookup(uniqueEdges[:,1])
+    t = np.where(np.isinf(valueB), 0.0, valueA / (valueA - np.where(np.isinf(valueB), 1.0, valueB)))
+    PA = gridPoint(uniqueEdges[:,0])
+    V = PA + t[:,None] * (gridPoint(uniqueEdges[:,1]) - PA)
+
+    # orient every triangle from the inside corners towards the outside corners of its tetrahedron
+    corners = gridPoint(tetKeys.reshape(-1)).reshape(-1, 4, 3)
+    outward = (corners * ~inside[:,:,None]).sum(axis = 1) / (4 - nInside)[:,None] - (corners * inside[:,:,None]).sum(axis = 1) / nInside[:,None]
+    normal = np.cross(V[F[:,1]] - V[F[:,0]], V[F[:,2]] - V[F[:,0]])
+    flip = np.sum(normal * outward[triTet], axis = 1) < 0
+    F[flip] = F[flip][:,::-1]
+    return V, F
+
+def sphereUnionMesh(centers, radii, resolution = 128):
+    """
+    this function builds a single surface for the union of many spheres. The union distance field is sampled on a sparse grid around the spheres and its zero level set is extracted, so the render cost depends on the visible surface rather than on the number of spheres.
+
+    Inputs
+    centers: |S|x3 array of sphere centers
+    radii: scalar or |S| array of sphere radii
+    resolution: number of grid cells along the longest side of the bounding box
+
+    Outputs
+    union_obj: the blender object of the union surface
+    """
+    keys, values, dims, origin, h = sphereUnionField(centers, radii, resolution)
+    V, F = sparseMarchingTetrahedra(keys, values, dims, origin, h)
+    mesh = numpyMesh(V, F, name = 'sphere union')
+    mesh.polygons.foreach_set('use_smooth', np.ones(F.shape[0], dtype = bool))
+    union_obj = bpy.data.objects.new('sphere union', mesh)
+    bpy.context.scene.collection.objects.link(union_obj)
+    return union_obj
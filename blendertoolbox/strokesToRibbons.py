@@ -0,0 +1,95 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+import numpy as np
+from . numpyMesh import numpyMesh
+from . setAttribute import setAttribute
+from . tubeMesh import normalizeRows, polylineTangents
+
+def strokesToRibbons(points, normals, widths, offsets, taper = 0.0, twoSided = False, thickness = None, colors = None):
+    """
+    this function turns VR strokes (polylines with per point normals and widths) into ribbon quads for all strokes in one vectorized pass and returns them as a single mesh object. The ribbon normals follow the stroke normals (set as custom normals).
+
+    Inputs
+    points: |P|x3 array of stroke points (all strokes concatenated)
+    normals: |P|x3 array of stroke normals (the ribbon lies orthogonal to them)
+    widths: scalar or |P| array of ribbon widths
+    offsets: |S|+1 array, stroke s owns points[offsets[s]:offsets[s+1]]
+    taper: fraction of the stroke length over which the width fades in/out at both ends (0 keeps the width constant)
+    twoSided: if True, a back sheet with flipped winding and normals is added under every ribbon, so each side has its own geometry and normals
+    thickness: distance between the two sheets of a two-sided ribbon (default 1% of the ribbon width)
+    colors: (optional) |S|x4 (or |S|x3) array of per stroke colors, stored in the face attribute "Col"
+
+    Outputs
+    ribbon_obj: the blender object of all the ribbons (also carries a face attribute "stroke" with the stroke index)
+    """
+    P = np.asarray(points, dtype = float).reshape(-1, 3)
+    offsets = np.asarray(offsets, dtype = np.int64)
+    nP = P.shape[0]
+    nS = offsets.shape[0] - 1
+    lengths = offsets[1:] - offsets[:-1]
+    stroke = np.repeat(np.arange(nS), lengths)
+    widths = np.broadcast_to(np.asarray(widths, dtype = float), (nP,))
+
+    # ribbon frame: tangent, stroke normal made orthogonal to it, and the binormal across the ribbon
+    T = polylineTangents(P, offsets)
+    N = np.asarray(normals, dtype = float).reshape(-1, 3)
+    N = normalizeRows(N - np.sum(N * T, axis = 1)[:,None] * T)
+    B = normalizeRows(np.cross(T, N))
+
+    if taper > 0:
+        # normalized arc length along every stroke
+        segLength = np.zeros(nP)
+        segLength[1:] = np.linalg.norm(P[1:] - P[:-1], axis = 1)
+        segLength[offsets[:-1]] = 0
+        arc = np.cumsum(segLength)
+        arc -= arc[offsets[:-1]][stroke]
+        total = arc[offsets[1:] - 1][stroke]
+        s = arc / np.maximum(total, 1e-16)
+        t = np.clip(np.minimum(s, 1.0 - s) / taper, 0.0, 1.0)
+        widths = widths * t * t * (3.0 - 2.0 * t)
+
+    halfWidth = 0.5 * widths[:,None] * B
+    V = np.stack((P - halfWidth, P + halfWidth), axis = 1).reshape(-1, 3)
+    VN = np.repeat(N, 2, axis = 0)
+
+    # quad (left_i, right_i, right_i+1, left_i+1) faces along +N
+    segStart = np.arange(nP)
+    isLast = np.zeros(nP, dtype = bool)
+    isLast[offsets[1:] - 1] = True
+    segStart = segStart[~isLast]
+    F = np.stack((2 * segStart, 2 * segStart + 1, 2 * segStart + 3, 2 * segStart + 2), axis = 1)
+    faceStroke = stroke[segStart]
+
+    if twoSided:
+        if thickness is None:
+            thickness = 0.01 * np.repeat(widths, 2)[:,None]
+        V = np.concatenate((V, V - thickness * VN))
+        VN = np.concatenate((VN, -VN))
+        F = np.concatenate((F, F[:,::-1] + 2 * nP))
+        faceStroke = np.concatenate((faceStroke, faceStroke))
+
+    mesh = numpyMesh(V, F, name = 'ribbons')
+    mesh.polygons.foreach_set('use_smooth', np.ones(F.shape[0], dtype = bool))
+    if hasattr(mesh, 'use_auto_smooth'): # custom normals need auto smooth before blender 4.1
+        mesh.use_auto_smooth = True
+    mesh.normals_split_custom_set_from_vertices(VN.astype(np.float32))
+    setAttribute(mesh, 'stroke', faceStroke, type = 'INT', domain = 'FACE')
+    if colors is not None:
+        colors = np.asarray(colors, dtype = float)
+        setAttribute(mesh, 'Col', colors[faceStroke], type = 'FLOAT_COLOR', domain = 'FACE')
+
+    ribbon_obj = bpy.data.objects.new('ribbons', mesh)
+    bpy.context.scene.collection.objects.link(ribbon_obj)
+    return ribbon_obj
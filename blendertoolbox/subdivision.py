@@ -12,10 +12,102 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import bpy 
+import os
+import hashlib
+import numpy as np
+from .numpyMesh import numpyMesh
+from .setAttribute import meshAttributes, setMeshAttributes
 
-def subdivision(mesh, level = 0):
+# subdivided meshes of this session, keyed by the hash of the source mesh and the level
+SUBDIVISION_CACHE = {}
+
+def subdivision(mesh, level = 0, apply = False, cacheFolder = None):
+	# apply = True evaluates the subdivision once and replaces the mesh data by the result (see applySubdivision) instead of adding a modifier that is evaluated again at every update and render
+	if apply:
+		return applySubdivision(mesh, level, cacheFolder)
 	bpy.context.view_layer.objects.active = mesh
 	bpy.ops.object.modifier_add(type='SUBSURF')
 	mesh.modifiers["Subdivision"].render_levels = level # rendering subdivision level
 	mesh.modifiers["Subdivision"].levels = level # subdivision level in 3D view
 
+def meshDataArrays(data):
+	# vertices, faces, smooth flags, material indices, point/face/corner attributes (see meshAttributes) and the name of the active uv map of a mesh datablock
+	V = np.zeros(len(data.vertices) * 3, dtype = np.float32)
+	data.vertices.foreach_get('co', V)
+	corners = np.zeros(len(data.loops), dtype = np.int32)
+	data.loops.foreach_get('vertex_index', corners)
+	faceSizes = np.zeros(len(data.polygons), dtype = np.int32)
+	data.polygons.foreach_get('loop_total', faceSizes)
+	smooth = np.zeros(len(data.polygons), dtype = bool)
+	data.polygons.foreach_get('use_smooth', smooth)
+	material = np.zeros(len(data.polygons), dtype = np.int32)
+	data.polygons.foreach_get('material_index', material)
+	arrays = {'V': V.reshape(-1, 3), 'corners': corners, 'faceSizes': faceSizes, 'smooth': smooth, 'material': material}
+	arrays.update(meshAttributes(data))
+	if data.uv_layers.active is not None:
+		arrays['activeUV'] = np.array(data.uv_layers.active.name)
+	return arrays
+
+def meshFromArrays(data, arrays):
+	# rewrites a mesh datablock from the arrays of meshDataArrays (its materials are kept)
+	numpyMesh(arrays['V'], arrays['corners'], faceSizes = arrays['faceSizes'], mesh = data)
+	data.polygons.foreach_set('use_smooth', np.asarray(arrays['smooth'], dtype = bool))
+	data.polygons.foreach_set('material_index', np.asarray(arrays['material'], dtype = np.int32))
+	setMeshAttributes(data, arrays)
+	if 'activeUV' in arrays and data.uv_layers.get(str(arrays['activeUV'])) is not None:
+		data.uv_layers.active = data.uv_layers[str(arrays['activeUV'])]
+	data.update()
+	return data
+
+def applySubdivision(mesh, level, cacheFolder = None):
+	"""
+	this function subdivides a mesh object once and substitutes the result as plain mesh data, so that it is not evaluated again at every depsgraph update and camera render. The result is cached by the hash of the source mesh (vertices, faces, smooth and material flags of the faces, point/face/corner attributes such as uv maps and vertex colors) and the level, in memory and, if cacheFolder is given, as .npz files in that folder, so repeated renders of the same mesh do not pay for the subdivision again.
+
+	Inputs
+	mesh: bpy.object of the mesh
+	level: subdivision level (Catmull-Clark)
+	cacheFolder: (optional) folder for the cache files
+
+	Outputs
+	mesh: the same object, with the subdivided mesh data (a new datablock, the source data is left untouched)
+	"""
+	if level <= 0:
+		return mesh
+	source = meshDataArrays(mesh.data)
+	digest = hashlib.sha1(str(level).encode())
+	# all arrays are part of the key (flags and attributes too), the cached result carries them
+	for name in sorted(source):
+		digest.update(name.encode())
+		digest.update(np.ascontiguousarray(source[name]).tobytes())
+	key = digest.hexdigest()
+	cachePath = None if cacheFolder is None else os.path.join(cacheFolder, 'subdivision_%s.npz' % key)
+
+	arrays = SUBDIVISION_CACHE.get(key)
+	if arrays is None and cachePath is not None and os.path.exists(cachePath):
+		arrays = dict(np.load(cachePath))
+	if arrays is None:
+		# evaluate only the subdivision (the other modifiers are turned off meanwhile)
+		shown = [modifier.show_viewport for modifier in mesh.modifiers]
+		for modifier in mesh.modifiers:
+			modifier.show_viewport = False
+		subsurf = mesh.modifiers.new('Subdivision', 'SUBSURF')
+		subsurf.levels = level
+		subsurf.render_levels = level
+		evaluated = mesh.evaluated_get(bpy.context.evaluated_depsgraph_get())
+		data = bpy.data.meshes.new_from_object(evaluated)
+		mesh.modifiers.remove(subsurf)
+		for modifier, show in zip(mesh.modifiers, shown):
+			modifier.show_viewport = show
+		arrays = meshDataArrays(data)
+		bpy.data.meshes.remove(data)
+		if cachePath is not None:
+			try:
+				os.makedirs(cacheFolder, exist_ok = True)
+				np.savez(cachePath, **arrays)
+			except OSError: # read-only folders are only cached in memory
+				pass
+	# a hit and a miss build the mesh the same way, from the arrays. A copy keeps the materials (and leaves the source to other objects sharing it)
+	data = meshFromArrays(mesh.data.copy(), arrays)
+	SUBDIVISION_CACHE[key] = arrays
+	mesh.data = data
+	return mesh
@@ -0,0 +1,207 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+
+def normalizeRows(X):
+    return X / np.maximum(np.linalg.norm(X, axis = 1), 1e-16)[:,None]
+
+def perpendicular(T):
+    """
+    returns unit vectors perpendicular to each row of T (rows of T are unit vectors)
+    """
+    A = np.zeros_like(T)
+    useX = np.abs(T[:,2]) > 0.9
+    A[useX,0] = 1.0
+    A[~useX,2] = 1.0
+    return normalizeRows(np.cross(T, A))
+
+def ringFaces(ringStart, nextRingStart, numSides):
+    """
+    quads connecting pairs of rings with numSides vertices each (outward facing)
+    """
+    k = np.arange(numSides)
+    k1 = (k + 1) % numSides
+    a = ringStart[:,None]
+    b = nextRingStart[:,None]
+    return np.stack((a + k, a + k1, b + k1, b + k), axis = 2).reshape(-1, 4)
+
+def segmentTubes(p1List, p2List, r, numSides = 16, caps = True):
+    """
+    this function builds independent cylinders for a list of segments in one vectorized pass
+
+    Inputs
+    p1List: |E|x3 array of segment start points
+    p2List: |E|x3 array of segment end points
+    r: radius, either a scalar or a |E| array
+    numSides: number of vertices on each ring
+    caps: close both ends with a polygon
+
+    Outputs
+    V: |V|x3 vertex array
+    F: flat array of face corners
+    faceSizes: number of corners of each face
+    faceSegment: index of the segment each face belongs to (for per-segment attributes)
+    """
+    p1List = np.asarray(p1List, dtype = float).reshape(-1, 3)
+    p2List = np.asarray(p2List, dtype = float).reshape(-1, 3)
+    nE = p1List.shape[0]
+    r = np.broadcast_to(np.asarray(r, dtype = float), (nE,))
+
+    T = normalizeRows(p2List - p1List)
+    U = perpendicular(T)
+    W = np.cross(T, U)
+    theta = 2.0 * np.pi * np.arange(numSides) / numSides
+    offset = r[:,None,None] * (np.cos(theta)[None,:,None] * U[:,None,:] + np.sin(theta)[None,:,None] * W[:,None,:])
+    V = np.stack((p1List[:,None,:] + offset, p2List[:,None,:] + offset), axis = 1).reshape(-1, 3)
+
+    ringStart = np.arange(nE) * 2 * numSides
+    F = ringFaces(ringStart, ringStart + numSides, numSides)
+    faceSizes = np.full(F.shape[0], 4)
+    faceSegment = np.repeat(np.arange(nE), numSides)
+    if caps:
+        k = np.arange(numSides)
+        bottom = ringStart[:,None] + k[::-1]
+        top = ringStart[:,None] + numSides + k
+        F = np.concatenate((F.ravel(), bottom.ravel(), top.ravel()))
+        faceSizes = np.concatenate((faceSizes, np.full(2 * nE, numSides)))
+        faceSegment = np.concatenate((faceSegment, np.arange(nE), np.arange(nE)))
+    return V, F.ravel(), faceSizes, faceSegment
+
+def rotationMinimizingFrames(P, offsets, T, cyclic = False):
+    """
+    this function transports a normal frame along every polyline with the double reflection method [Wang et al. 2008]. All polylines are processed together, one point index at a time.
+
+    Inputs
+    P: |P|x3 array of polyline points (all polylines concatenated)
+    offsets: |C|+1 array, polyline c owns points offsets[c]:offsets[c+1]
+    T: |P|x3 array of unit tangents
+    cyclic: if True, the twist accumulated around each closed polyline is distributed along it
+
+    Outputs
+    R: |P|x3 array of unit normals, orthogonal to T
+    """
+    starts = offsets[:-1]
+    lengths = offsets[1:] - offsets[:-1]
+    R = np.zeros_like(P)
+    R[starts] = perpendicular(T[starts])
+    for jj in range(1, lengths.max(initial = 0)):
+        cur = starts[lengths > jj] + jj
+        prev = cur - 1
+        R[cur] = reflectFrame(P[prev], T[prev], R[prev], P[cur], T[cur])
+
+    if cyclic:
+        # transport once more around the closing segment and spread the mismatch
+        last = offsets[1:] - 1
+        R_end = reflectFrame(P[last], T[last], R[last], P[starts], T[starts])
+        R0 = R[starts]
+        angle = np.arctan2(np.sum(np.cross(R0, R_end) * T[starts], axis = 1), np.sum(R0 * R_end, axis = 1))
+        curve = np.repeat(np.arange(len(starts)), lengths)
+        s = (np.arange(P.shape[0]) - starts[curve]) / lengths[curve]
+        alpha = -angle[curve] * s
+        R = np.cos(alpha)[:,None] * R + np.sin(alpha)[:,None] * np.cross(T, R)
+    return normalizeRows(R)
+
+def reflectFrame(x0, t0, r0, x1, t1):
+    v1 = x1 - x0
+    c1 = np.maximum(np.sum(v1 * v1, axis = 1), 1e-32)
+    rL = r0 - (2.0 / c1 * np.sum(v1 * r0, axis = 1))[:,None] * v1
+    tL = t0 - (2.0 / c1 * np.sum(v1 * t0, axis = 1))[:,None] * v1
+    v2 = t1 - tL
+    c2 = np.sum(v2 * v2, axis = 1)
+    valid = c2 > 1e-32
+    r1 = rL.copy()
+    r1[valid] -= (2.0 / c2[valid] * np.sum(v2[valid] * rL[valid], axis = 1))[:,None] * v2[valid]
+    # make sure the frame stays orthogonal to the new tangent
+    r1 -= np.sum(r1 * t1, axis = 1)[:,None] * t1
+    return normalizeRows(r1)
+
+def polylineTangents(P, offsets, cyclic = False):
+    """
+    unit tangents of concatenated polylines: averaged segment directions at joints, segment direction at the ends
+    """
+    starts = offsets[:-1]
+    last = offsets[1:] - 1
+    D = np.zeros_like(P)
+    D[:-1] = normalizeRows(P[1:] - P[:-1])
+    D[last] = 0 # no segment leaves the last point of a polyline
+    if cyclic:
+        D[last] = normalizeRows(P[starts] - P[last])
+    Dprev = np.zeros_like(P)
+    Dprev[1:] = D[:-1]
+    Dprev[starts] = D[last] if cyclic else 0
+    T = D + Dprev
+    # a joint that folds back onto itself has no average direction
+    degenerate = np.linalg.norm(T, axis = 1) < 1e-8
+    T[degenerate] = D[degenerate] + (np.linalg.norm(D[degenerate], axis = 1) < 1e-8)[:,None] * Dprev[degenerate]
+    return normalizeRows(T)
+
+def polylineTubes(P, offsets, r, numSides = 16, cyclic = False, caps = True):
+    """
+    this function builds one continuous tube per polyline with shared rings at the joints, oriented with rotation minimizing frames so the tubes do not twist
+
+    Inputs
+    P: |P|x3 array of polyline points (all polylines concatenated)
+    offsets: |C|+1 array, polyline c owns points offsets[c]:offsets[c+1]
+    r: radius, either a scalar or a |P| array (per point radius)
+    numSides: number of vertices on each ring
+    cyclic: treat every polyline as a closed loop
+    caps: close the two ends of open polylines
+
+    Outputs
+    V: |V|x3 vertex array
+    F: flat array of face corners
+    faceSizes: number of corners of each face
+    faceSegment: index of the segment each face belongs to. Segments are numbered polyline by polyline, polyline c owns (lengths[c]-1) segments (lengths[c] if cyclic)
+    """
+    P = np.asarray(P, dtype = float).reshape(-1, 3)
+    offsets = np.asarray(offsets, dtype = np.int64)
+    lengths = offsets[1:] - offsets[:-1]
+    if np.any(lengths < 2):
+        raise ValueError('Error in "polylineTubes": every polyline needs at least two points')
+    nP = P.shape[0]
+    nC = lengths.shape[0]
+    r = np.broadcast_to(np.asarray(r, dtype = float), (nP,))
+
+    T = polylineTangents(P, offsets, cyclic)
+    R = rotationMinimizingFrames(P, offsets, T, cyclic)
+    W = np.cross(T, R)
+    theta = 2.0 * np.pi * np.arange(numSides) / numSides
+    V = P[:,None,:] + r[:,None,None] * (np.cos(theta)[None,:,None] * R[:,None,:] + np.sin(theta)[None,:,None] * W[:,None,:])
+    V = V.reshape(-1, 3)
+
+    # point ii is followed by point ii+1 unless it is the last point of its polyline
+    segStart = np.arange(nP)
+    segEnd = segStart + 1
+    isLast = np.zeros(nP, dtype = bool)
+    isLast[offsets[1:] - 1] = True
+    if cyclic:
+        segEnd[isLast] = offsets[:-1]
+    else:
+        segStart = segStart[~isLast]
+        segEnd = segEnd[~isLast]
+    F = ringFaces(segStart * numSides, segEnd * numSides, numSides)
+    faceSizes = np.full(F.shape[0], 4)
+    faceSegment = np.repeat(np.arange(segStart.shape[0]), numSides)
+    F = F.ravel()
+    if caps and not cyclic:
+        k = np.arange(numSides)
+        first = offsets[:-1]
+        last = offsets[1:] - 1
+        bottom = first[:,None] * numSides + k[::-1]
+        top = last[:,None] * numSides + k
+        segOffsets = offsets[:-1] - np.arange(nC)
+        F = np.concatenate((F, bottom.ravel(), top.ravel()))
+        faceSizes = np.concatenate((faceSizes, np.full(2 * nC, numSides)))
+        faceSegment = np.concatenate((faceSegment, segOffsets, segOffsets + lengths - 2))
+    return V, F, faceSizes, faceSegment
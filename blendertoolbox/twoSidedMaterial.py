@@ -0,0 +1,56 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bpy
+from . materialCache import internMaterial
+
+def twoSidedMaterial(name = "TwoSidedRibbon", front_color = (0, 0.2, 1, 1), back_color = (0.8, 0.1, 0.1, 1)):
+    """
+    this function returns a diffuse material with different colors on the front and back faces (e.g. for VR stroke ribbons). It is built once per session for each name and pair of colors (see internMaterial)
+
+    Inputs
+    name: name of the material
+    front_color: RGBA color of the front faces
+    back_color: RGBA color of the back faces
+
+    Outputs
+    mat: the bpy material (not assigned to any object)
+    """
+    def build():
+        mat = bpy.data.materials.new(name)
+        mat.use_nodes = True
+        nodes = mat.node_tree.nodes
+        links = mat.node_tree.links
+
+        # Clear existing nodes
+        for node in list(nodes):
+            nodes.remove(node)
+
+        # Add new nodes
+        output = nodes.new(type='ShaderNodeOutputMaterial')
+        mix_shader = nodes.new(type='ShaderNodeMixShader')
+        front_bsdf = nodes.new(type='ShaderNodeBsdfDiffuse')
+        back_bsdf = nodes.new(type='ShaderNodeBsdfDiffuse')
+        geometry = nodes.new(type='ShaderNodeNewGeometry')
+
+        # Set colors
+        front_bsdf.inputs['Color'].default_value = back_color
+        back_bsdf.inputs['Color'].default_value = front_color
+
+        # Connect nodes
+        links.new(geometry.outputs['Backfacing'], mix_shader.inputs['Fac'])
+        links.new(front_bsdf.outputs['BSDF'], mix_shader.inputs[1])
+        links.new(back_bsdf.outputs['BSDF'], mix_shader.inputs[2])
+        links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
+        return mat
+    return internMaterial(('twoSidedMaterial', name, tuple(front_color), tuple(back_color)), build)
@@ -0,0 +1,124 @@
+# Copyright 2020 Hsueh-Ti Derek Liu
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+from . numpyMesh import numpyMesh
+from . meshArrays import vertexArray, faceArray
+
+def weldVertices(V, corners, faceSizes, tol = None):
+    """
+    this function welds vertices closer than a tolerance, remaps the faces and drops the faces that become degenerate or duplicated. Vertices are quantized to a grid of size tol and all vertices of a grid cell are replaced by the first one (so two vertices closer than tol but on both sides of a cell boundary may stay apart).
+
+    Inputs
+    V: |V|x3 array of vertex locations
+    corners: flat array of face corner vertex indices
+    faceSizes: |F| array of the number of corners of each face
+    tol: (optional) weld distance, default 1e-6 of the bounding box diagonal. 0 only welds exact duplicates
+
+    Outputs
+    V: |V'|x3 array of the remaining vertices (unused vertices are removed)
+    corners: flat array of the remaining face corners
+    faceSizes: |F'| array of the remaining face sizes
+    stats: dict with the number of "merged" vertices, "degenerate" faces, "duplicate" faces and "unused" vertices that were removed
+    """
+    V = np.asarray(V, dtype = float).reshape(-1, 3)
+    corners = np.asarray(corners, dtype = np.int64).ravel()
+    faceSizes = np.asarray(faceSizes, dtype = np.int64).ravel()
+    stats = {'merged': 0, 'degenerate': 0, 'duplicate': 0, 'unused': 0}
+    if V.shape[0] == 0:
+        return V, corners, faceSizes, stats
+    lo = V.min(axis = 0)
+    diag = np.linalg.norm(V.max(axis = 0) - lo)
+    if tol is None:
+        tol = 1e-6 * diag
+
+    # weld: one representative (the first vertex) per grid cell
+    if tol > 0:
+        cell = np.floor((V - lo) / tol).astype(np.int64)
+        _, first, inverse = np.unique(cell, axis = 0, return_index = True, return_inverse = True)
+    else:
+        _, first, inverse = np.unique(V, axis = 0, return_index = True, return_inverse = True)
+    # keep the original vertex order
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+    stats['merged'] = V.shape[0] - first.shape[0]
+    V = V[first[order]]
+    corners = rank[inverse.reshape(-1)][corners]
+
+    # collapse consecutive repeated corners of every face (cyclically)
+    face = np.repeat(np.arange(faceSizes.shape[0]), faceSizes)
+    start = np.cumsum(faceSizes) - faceSizes
+    position = np.arange(corners.shape[0]) - start[face]
+    nextCorner = corners[start[face] + (position + 1) % faceSizes[face]]
+    keep = corners != nextCorner
+    corners, face = corners[keep], face[keep]
+    faceSizes = np.bincount(face, minlength = faceSizes.shape[0])
+
+    # degenerate faces: less than three distinct corners or (numerically) zero area
+    maxSize = max(faceSizes.max(initial = 0), 1)
+    start = np.cumsum(faceSizes) - faceSizes
+    position = np.arange(corners.shape[0]) - start[face]
+    padded = np.full((faceSizes.shape[0], maxSize), -1, dtype = np.int64)
+    padded[face, position] = corners
+    padded.sort(axis = 1)
+    distinct = np.sum((padded[:,1:] != padded[:,:-1]) & (padded[:,1:] >= 0), axis = 1) + (padded[:,-1] >= 0)
+    P = V[corners]
+    Pnext = V[corners[start[face] + (position + 1) % np.maximum(faceSizes[face], 1)]]
+    vectorArea = np.zeros((faceSizes.shape[0], 3))
+    np.add.at(vectorArea, face, np.cross(P, Pnext))
+    area = 0.5 * np.linalg.norm(vectorArea, axis = 1)
+    valid = (distinct >= 3) & (area > 1e-12 * diag * diag)
+    stats['degenerate'] = int(np.sum(~valid))
+
+    # duplicate faces: the same set of corners, whatever their order and orientation
+    _, firstFace = np.unique(padded, axis = 0, return_index = True)
+    unique = np.zeros(faceSizes.shape[0], dtype = bool)
+    unique[firstFace] = True
+    # copies of a degenerate face are only counted as degenerate
+    stats['duplicate'] = int(np.sum(valid & ~unique))
+    valid &= unique
+    corners = corners[valid[face]]
+    faceSizes = faceSizes[valid]
+
+    # drop the vertices that are not used by any face anymore
+    if corners.shape[0] > 0:
+        used = np.zeros(V.shape[0], dtype = bool)
+        used[corners] = True
+        remap = np.cumsum(used) - 1
+        stats['unused'] = int(V.shape[0] - used.sum())
+        V = V[used]
+        corners = remap[corners]
+    return V, corners, faceSizes, stats
+
+def weldMesh(mesh_obj, tol = None, verbose = True):
+    """
+    this function welds the duplicated vertices of a mesh object and removes its degenerate and duplicate faces in place (see weldVertices). The mesh is only rewritten if something was removed; face corner data such as uv maps is not kept in that case
+
+    Inputs
+    mesh_obj: bpy.object of the mesh
+    tol: (optional) weld distance in local coordinates, default 1e-6 of the bounding box diagonal
+    verbose: print how much was removed
+
+    Outputs
+    stats: dict with the number of removed vertices and faces (see weldVertices)
+    """
+    V = vertexArray(mesh_obj)
+    corners, faceSizes = faceArray(mesh_obj)
+    nV, nF = V.shape[0], faceSizes.shape[0]
+    V, corners, faceSizes, stats = weldVertices(V, corners, faceSizes, tol)
+    if V.shape[0] < nV or faceSizes.shape[0] < nF:
+        numpyMesh(V, corners, faceSizes = faceSizes, mesh = mesh_obj.data)
+    if verbose:
+        print('weldMesh %s: %d -> %d vertices (%d merged, %d unused), %d -> %d faces (%d degenerate, %d duplicate)' % (mesh_obj.name, nV, V.shape[0], stats['merged'], stats['unused'], nF, faceSizes.shape[0], stats['degenerate'], stats['duplicate']))
+    return stats
@@ -27,15 +27,10 @@ meshColor = bt.colorObj((1,1,1,1), 0.5, 1.0, 1.0, 0.0, 0.0)
 bt.setMat_plastic(mesh, meshColor)
 
 ## read vector fields 
-P = np.loadtxt("../meshes/fat_dragon_source_locations.txt") # Nx3 array of vector source locations
-P_vec = np.loadtxt("../meshes/fat_dragon_vectors.txt") # Nx3 array of vector directions
+# Nx3 arrays of vector source locations and directions, subsampled with blue noise (otherwise it will be too slow)
+P, P_vec = bt.loadVectorField("../meshes/fat_dragon_source_locations.txt", "../meshes/fat_dragon_vectors.txt", count = 1500)
 per_vector_scales = np.random.rand(P.shape[0]) # random scaling per vector
 
-# subsample vectors, otherwise it will be too slow
-P = P[::10, :]
-P_vec = P_vec[::10, :]
-per_vector_scales = per_vector_scales[::10]
-
 ## set arrow material
 thickness = 0.01 # this can be found in the geometry node graph
 length = 4.0 # this can be found in the geometry node graph
@@ -1,5 +1,7 @@
 import bpy
 import os
+import re
+import blendertoolbox as bt
 from math import radians
 import math
 
@@ -41,6 +43,11 @@ blend_files_with_rotations = [
 blend_files_with_rotations=[((114, 26, 0), "/Users/anandhu/Documents/proxy/SIGRAPH-ASIA/VRSculpt-Rendering/renders/20250429094726/20250429094726_scene.blend")]
 # === Rendering parameters ===
 imgRes_x, imgRes_y = 5000, 5000
+# draft renders (grid thumbnails) use decimated meshes at the thumbnail size, final renders the originals
+draft = False
+if draft:
+    imgRes_x, imgRes_y = 300, 300
+    draftFaces = 20000
 
 for rotation_euler_deg, blend_file_path in blend_files_with_rotations:
     print(f"\n📂 Processing: {os.path.basename(blend_file_path)}")
@@ -52,9 +59,14 @@ for rotation_euler_deg, blend_file_path in blend_files_with_rotations:
     rotation_euler = tuple(radians(v) for v in rotation_euler_deg)
 
     # Apply rotation to all mesh objects
+    decimated = set()
     for obj in bpy.data.objects:
         if obj.type == 'MESH':
             obj.rotation_euler = rotation_euler
+            if draft and obj.data.name not in decimated and len(obj.data.polygons) > draftFaces:
+                # cached next to the blend file per mesh datablock, until the blend file changes
+                bt.decimateMesh(obj, draftFaces, sourcePath=blend_file_path, variant="." + re.sub(r"[^\w.-]", "_", obj.data.name))
+                decimated.add(obj.data.name)
 
     bpy.context.view_layer.update()
 
@@ -65,7 +77,8 @@ for rotation_euler_deg, blend_file_path in blend_files_with_rotations:
 
     # Output directory next to the blend file
     base_dir = os.path.dirname(blend_file_path)
-    output_dir = os.path.join(base_dir, "renders_rotated")
+    # drafts go to their own folder so they never overwrite the final renders
+    output_dir = os.path.join(base_dir, "renders_rotated_draft" if draft else "renders_rotated")
     os.makedirs(output_dir, exist_ok=True)
 
     # Render from each camera
@@ -28,33 +28,7 @@ def clear_scene():
 
 
 def create_two_sided_material(name="TwoSidedRibbon", front_color=(0.8, 0.1, 0.1, 1), back_color=(0.8, 0.1, 0.1, 1)):
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    links = mat.node_tree.links
-
-    # Clear existing nodes
-    for node in nodes:
-        nodes.remove(node)
-
-    # Add new nodes
-    output = nodes.new(type='ShaderNodeOutputMaterial')
-    mix_shader = nodes.new(type='ShaderNodeMixShader')
-    front_bsdf = nodes.new(type='ShaderNodeBsdfDiffuse')
-    back_bsdf = nodes.new(type='ShaderNodeBsdfDiffuse')
-    geometry = nodes.new(type='ShaderNodeNewGeometry')
-
-    # Set colors
-    front_bsdf.inputs['Color'].default_value = back_color
-    back_bsdf.inputs['Color'].default_value = front_color
-
-    # Connect nodes
-    links.new(geometry.outputs['Backfacing'], mix_shader.inputs['Fac'])
-    links.new(front_bsdf.outputs['BSDF'], mix_shader.inputs[1])
-    links.new(back_bsdf.outputs['BSDF'], mix_shader.inputs[2])
-    links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
-
-    return mat
+    return bt.twoSidedMaterial(name, front_color, back_color)
 
 # === Parameters ===
 
@@ -96,7 +70,7 @@ for i, path in enumerate(mesh_paths):
     translation = np.array([x_offset, -ref_y_center, 0])
     
 
-    mesh = bt.readMesh(path, translation, rotation, (1, 1, 1))
+    mesh = bt.readMesh(path, translation, rotation, (1, 1, 1), shading='smooth')
 
     # Generate a distinct color using HSV and convert to RGB
     hue = (i / len(mesh_paths)) % 1.0  # Ensure hue is in [0,1)
@@ -104,7 +78,6 @@ for i, path in enumerate(mesh_paths):
     meshColor = bt.colorObj((r, g, b, 1), 0.5, 1.0, 1.0, 0.0, 2.0)
     meshColor = bt.colorObj((1.0, 0.55, 0.0, 1), 0.5, 1.0, 1.0, 0.0, 2.0)
     bt.setMat_balloon(mesh, meshColor, 0)
-    bpy.ops.object.shade_smooth()
     # Add two-sided material
 
     mat = create_two_sided_material()
@@ -43,6 +43,9 @@ def clear_scene():
 
 root_folder = "/Users/anandhu/Documents/proxy/SIGRAPH-ASIA/BlenderToolbox/dataset/flowrep"
 imgRes_x, imgRes_y = 1000, 1000
+# draft renders (previews) use cached decimated meshes, final renders the originals
+draft = False
+draftFaces = 20000 if draft else None
 
 # === Loop over all subfolders ===
 for subfolder in sorted(os.listdir(root_folder)):
@@ -54,7 +57,7 @@ for subfolder in sorted(os.listdir(root_folder)):
 
     # === Start a New Blender Scene ===
     clear_scene()
-    bt.blenderInit(imgRes_x, imgRes_y, numSamples=100, exposure=1.5)
+    bt.blenderInit(imgRes_x, imgRes_y, numSamples=100, exposure=1.5, draftFaces=draftFaces)
 
     # === Collect Mesh Files ===
     mesh_paths = []
@@ -99,8 +102,12 @@ for subfolder in sorted(os.listdir(root_folder)):
             rotated = rotate(translated, rotation)
             p1List = np.array([rotated[line[0]] for line in lines])
             p2List = np.array([rotated[line[1]] for line in lines])
-            colorList = np.tile([0.1, 0.1, 0.1, 1], (len(p1List), 1))
-            bt.drawLines(p1List, p2List, 0.01 * ref_width, colorList)
+            # chain and simplify the segments for the camera that renders them (same placement as below)
+            cam = bt.setCamera((x_offset, 0, 2 * ref_width), (x_offset, 0, 0), focalLength=45)
+            P, offsets = bt.simplifyLines(p1List, p2List, cam)
+            bpy.data.objects.remove(cam, do_unlink=True)
+            colorList = np.tile([0.1, 0.1, 0.1, 1], (len(offsets) - 1, 1))
+            bt.drawPolylines(P, offsets, 0.01 * ref_width, colorList)
             all_meshes.append(None)
 
         elif mtype == 'spheres':
@@ -110,19 +117,21 @@ for subfolder in sorted(os.listdir(root_folder)):
             translated = translate(centers, translation)
             rotated = rotate(translated, rotation)
             ptColor = bt.colorObj([1.0, 0.55, 0.0, 1.0], 0.5, 1.0, 1.0, 0.0, 0.0)
-            for center, radius in zip(rotated, radii):
-                bt.drawSphere(radius, ptColor, center)
+            # tessellation level per sphere from its size in the camera that renders it (same placement as below)
+            cam = bt.setCamera((x_offset, 0, 2 * ref_width), (x_offset, 0, 0), focalLength=45)
+            bt.drawSpheres(rotated, radii, ptColor, cam=cam)
+            bpy.data.objects.remove(cam, do_unlink=True)
             all_meshes.append(None)
 
         else:
-            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1))
+            # marching cubes results come with duplicated vertices and zero area faces
+            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1), weld=(mtype == 'marching'), shading='smooth')
             meshColor = bt.colorObj((1.0, 0.55, 0.0, 1), 0.5, 1.0, 1.0, 0.0, 2.0)
             subColor = bt.colorObj((1.0, 0.55, 0.0, 1), 0.5, 2.0, 1.0, 0.0, 1.0)
             # bt.setMat_plastic(mesh, meshColor)
             meshC = bt.colorObj(bt.derekBlue, 0.5, 1.0, 1.0, 0.0, 0.0)
             subC = bt.colorObj(bt.derekBlue, 0.5, 2.0, 1.0, 0.0, 1.0)
             bt.setMat_ceramic(mesh, meshColor, subC)
-            bpy.ops.object.shade_smooth()
             all_meshes.append(mesh)
 
     # === Lighting ===
@@ -131,7 +140,7 @@ for subfolder in sorted(os.listdir(root_folder)):
     bt.shadowThreshold(alphaThreshold=0.025, interpolationMode='CARDINAL')
 
     # === Render with Camera per Object ===
-    output_dir = os.path.join(folder_path, 'renders')
+    output_dir = os.path.join(folder_path, 'renders_draft' if draft else 'renders')
     os.makedirs(output_dir, exist_ok=True)
 
     for i, mesh in enumerate(all_meshes):
@@ -72,33 +72,7 @@ def read_lines_from_obj_grouped(file_path):
     return np.array(vertices), lines
 
 def create_two_sided_material(name="TwoSidedRibbon", front_color=(0, 0.2, 1, 1), back_color=(0.8, 0.1, 0.1, 1)):
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    links = mat.node_tree.links
-
-    # Clear existing nodes
-    for node in nodes:
-        nodes.remove(node)
-
-    # Add new nodes
-    output = nodes.new(type='ShaderNodeOutputMaterial')
-    mix_shader = nodes.new(type='ShaderNodeMixShader')
-    front_bsdf = nodes.new(type='ShaderNodeBsdfDiffuse')
-    back_bsdf = nodes.new(type='ShaderNodeBsdfDiffuse')
-    geometry = nodes.new(type='ShaderNodeNewGeometry')
-
-    # Set colors
-    front_bsdf.inputs['Color'].default_value = back_color
-    back_bsdf.inputs['Color'].default_value = front_color
-
-    # Connect nodes
-    links.new(geometry.outputs['Backfacing'], mix_shader.inputs['Fac'])
-    links.new(front_bsdf.outputs['BSDF'], mix_shader.inputs[1])
-    links.new(back_bsdf.outputs['BSDF'], mix_shader.inputs[2])
-    links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
-
-    return mat
+    return bt.twoSidedMaterial(name, front_color, back_color)
 
 
 # === Parameters ===
@@ -194,13 +168,12 @@ for group_key, file_list in mesh_groups.items():
 
 
         elif mtype == 'ribbon':
-            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1))
+            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1), shading='smooth')
             edgeThickness = 0.001
             edgeColor = bt.colorObj((0,0,0,1), 0.5, 1.0, 1.0, 0.0, 0.0)
             meshRGBA = (0, 0.7, 1, 1)
             AOStrength = 1.0
             bt.setMat_edge(mesh, edgeThickness, edgeColor, meshRGBA, AOStrength)
-            bpy.ops.object.shade_smooth()
 
             # Add two-sided material
             mat = create_two_sided_material()
@@ -211,10 +184,9 @@ for group_key, file_list in mesh_groups.items():
 
             all_meshes.append(mesh)
         elif mtype == 'spheres':
-            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1))
+            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1), shading='smooth')
             meshColor = bt.colorObj((0.1, 0.1, 0.8, 1), 0.5, 1.0, 1.0, 0.0, 2.0)
             bt.setMat_balloon(mesh, meshColor, 1)
-            bpy.ops.object.shade_smooth()
             all_meshes.append(mesh)
 
         elif mtype == 'ballmerge' or mtype == 'vipss' or mtype == 'poisson':
@@ -225,10 +197,9 @@ for group_key, file_list in mesh_groups.items():
             all_meshes.append(mesh)
 
         elif mtype == 'marching':
-            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1))
+            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1), shading='smooth')
             meshColor = bt.colorObj((0.0, 0.5, 0.8, 1), 0.5, 1.0, 1.0, 0.0, 2.0)
             bt.setMat_balloon(mesh, meshColor, 1)
-            bpy.ops.object.shade_smooth()
             all_meshes.append(mesh)
 
             wireframe_mesh = mesh.copy()
@@ -260,10 +231,9 @@ for group_key, file_list in mesh_groups.items():
             wireframe_mesh.data.materials.append(wire_mat)
 
         elif mtype == 'uniform':
-            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1))
+            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1), shading='smooth')
             meshColor = bt.colorObj((0.8, 0.5, 0.5, 1), 0.5, 1.0, 1.0, 0.0, 2.0)
             bt.setMat_balloon(mesh, meshColor, 1)
-            bpy.ops.object.shade_smooth()
             all_meshes.append(mesh)
 
             wireframe_mesh = mesh.copy()
@@ -305,13 +275,12 @@ for group_key, file_list in mesh_groups.items():
                 print(f"Missing final or ribbon mesh for group {group_key}")
                 continue
 
-            mesh = bt.readMesh(ribbon_mesh_path, translation, rotation, (1, 1, 1))
+            mesh = bt.readMesh(ribbon_mesh_path, translation, rotation, (1, 1, 1), shading='smooth')
             edgeThickness = 0.001
             edgeColor = bt.colorObj((0,0,0,1), 0.5, 1.0, 1.0, 0.0, 0.0)
             meshRGBA = (0, 0.7, 1, 1)
             AOStrength = 1.0
             bt.setMat_edge(mesh, edgeThickness, edgeColor, meshRGBA, AOStrength)
-            bpy.ops.object.shade_smooth()
 
             # Add two-sided material
             mat = create_two_sided_material()
@@ -328,17 +297,15 @@ for group_key, file_list in mesh_groups.items():
             if final_mesh_path:
                 final_translation = translation.copy()
                 final_rotation = rotation
-                extra_final_obj = bt.readMesh(final_mesh_path, final_translation, rotation, (1, 1, 1))
+                extra_final_obj = bt.readMesh(final_mesh_path, final_translation, rotation, (1, 1, 1), shading='smooth')
                 extra_final_color = bt.colorObj((1.0, 0.55, 0.0, 1), 0.5, 1.0, 1.0, 0.0, 2.0)
                 bt.setMat_balloon(extra_final_obj, extra_final_color, 1)
-                bpy.ops.object.shade_smooth()
 
 
         else:
-            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1))
+            mesh = bt.readMesh(path, translation, rotation, (1, 1, 1), shading='smooth')
             meshColor = bt.colorObj((1.0, 0.55, 0.0, 1), 0.5, 1.0, 1.0, 0.0, 2.0)
             bt.setMat_balloon(mesh, meshColor, 1)
-            bpy.ops.object.shade_smooth()
             all_meshes.append(mesh)
 
     # === Lighting ===